@@ -1,9 +1,11 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { View, Text, StyleSheet, FlatList, TouchableOpacity, RefreshControl } from 'react-native';
 import { Calendar, MapPin, Users, Clock, CheckCircle, Circle } from 'lucide-react-native';
 import Animated, { FadeInDown } from 'react-native-reanimated';
 import { useAuth } from '../../lib/auth-context';
 import { supabase } from '../../lib/supabase';
+import { toggleRow } from '../../lib/optimistic';
+import { queryKey, useCachedQuery } from '../../lib/query-cache';
 import { colors, typographyColors } from '../../lib/colors';
 
 interface Event {
@@ -37,95 +39,71 @@ const eventTypeColors: Record<string, string> = {
 
 export default function EventsScreen() {
   const { user } = useAuth();
-  const [events, setEvents] = useState<Event[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [refreshing, setRefreshing] = useState(false);
   const [filter, setFilter] = useState<'upcoming' | 'past'>('upcoming');
 
-  useEffect(() => {
-    fetchEvents();
-  }, [filter]);
+  const fetchEvents = async (): Promise<Event[]> => {
+    const now = new Date().toISOString();
 
-  const fetchEvents = async () => {
-    try {
-      const now = new Date().toISOString();
+    let query = supabase
+      .from('events')
+      .select('*');
 
-      let query = supabase
-        .from('events')
-        .select('*');
-
-      if (filter === 'upcoming') {
-        query = query.gte('start_time', now);
-      } else {
-        query = query.lt('start_time', now);
-      }
-
-      const { data, error } = await query.order('start_time', { ascending: filter === 'upcoming' }).limit(50);
-
-      if (error) throw error;
+    if (filter === 'upcoming') {
+      query = query.gte('start_time', now);
+    } else {
+      query = query.lt('start_time', now);
+    }
 
-      const eventsWithParticipants = await Promise.all(
-        (data || []).map(async (event) => {
-          const { count } = await supabase
-            .from('event_participants')
-            .select('*', { count: 'exact', head: true })
-            .eq('event_id', event.id)
-            .eq('status', 'going');
+    const { data, error } = await query.order('start_time', { ascending: filter === 'upcoming' }).limit(50);
 
-          const { data: participantData } = await supabase
-            .from('event_participants')
-            .select('id')
-            .eq('event_id', event.id)
-            .eq('user_id', user?.id)
-            .eq('status', 'going')
-            .maybeSingle();
+    if (error) throw error;
 
-          return {
-            ...event,
-            participants_count: count || 0,
-            is_participating: !!participantData,
-          };
-        })
-      );
+    // participants_count kolonu tetikleyiciyle güncel tutulur; katılım durumu tek sorguda alınır
+    const ids = (data || []).map(event => event.id);
+    let joined = new Set<string>();
+    if (user && ids.length > 0) {
+      const { data: participantData, error: participantError } = await supabase
+        .from('event_participants')
+        .select('event_id')
+        .in('event_id', ids)
+        .eq('user_id', user.id)
+        .eq('status', 'going');
 
-      setEvents(eventsWithParticipants);
-    } catch (error) {
-      console.error('Error fetching events:', error);
-    } finally {
-      setLoading(false);
-      setRefreshing(false);
+      if (participantError) throw participantError;
+      joined = new Set((participantData || []).map(row => row.event_id));
     }
-  };
 
-  const handleRefresh = () => {
-    setRefreshing(true);
-    fetchEvents();
+    return (data || []).map(event => ({
+      ...event,
+      is_participating: joined.has(event.id),
+    }));
   };
 
-  const handleJoinEvent = async (eventId: string, isParticipating: boolean) => {
-    if (!user) return;
+  // Her filtre ayrı önbellek kaydıdır; sekmeye dönünce ya da filtre değişince son veri hemen gösterilir
+  const { data: events = [], refreshing, refresh: handleRefresh, setData: setEvents } = useCachedQuery(
+    queryKey('events', { filter, viewer: user?.id }),
+    ['events', 'event_participants'],
+    fetchEvents
+  );
 
-    try {
-      if (isParticipating) {
-        await supabase
-          .from('event_participants')
-          .delete()
-          .eq('event_id', eventId)
-          .eq('user_id', user.id);
-      } else {
-        await supabase
-          .from('event_participants')
-          .insert({
-            event_id: eventId,
-            user_id: user.id,
-            status: 'going',
-          });
-      }
+  const handleJoinEvent = (eventId: string, isParticipating: boolean) => {
+    if (!user) return;
 
-      fetchEvents();
-    } catch (error) {
-      console.error('Error toggling participation:', error);
-    }
+    // Var olan satır (ör. 'pending') da 'going' olarak güncellenir
+    toggleRow(
+      { table: 'event_participants', match: { event_id: eventId, user_id: user.id }, values: { status: 'going' } },
+      isParticipating,
+      joined => setEvents(current => current.map(event =>
+        event.id === eventId && !!event.is_participating !== joined
+          ? {
+              ...event,
+              is_participating: joined,
+              participants_count: Math.max((event.participants_count || 0) + (joined ? 1 : -1), 0),
+            }
+          : event
+      )),
+      error => console.error('Error toggling participation:', error)
+    );
   };
 
   const formatDate = (dateString: string) => {
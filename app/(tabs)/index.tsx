@@ -1,9 +1,11 @@
-import { useState, useEffect } from 'react';
-import { View, Text, StyleSheet, FlatList, TouchableOpacity, RefreshControl, Image, Alert, Platform } from 'react-native';
+import { useState, useEffect, useRef } from 'react';
+import { View, Text, StyleSheet, FlatList, TouchableOpacity, RefreshControl, Image, Alert, Platform, ActivityIndicator } from 'react-native';
 import { Heart, MessageCircle as MessageCircleIcon, Bookmark, Send, Share, Search, Bell, MoreHorizontal, Edit, Trash2 } from 'lucide-react-native';
 import Animated, { FadeInDown } from 'react-native-reanimated';
 import { useAuth } from '../../lib/auth-context';
 import { supabase } from '../../lib/supabase';
+import { toggleRow } from '../../lib/optimistic';
+import { queryKey, useCachedQuery } from '../../lib/query-cache';
 import { colors, typographyColors } from '../../lib/colors';
 import CreatePostModal from '../../components/CreatePostModal';
 import CommentsModal from '../../components/CommentsModal';
@@ -27,12 +29,16 @@ interface Post {
   is_saved?: boolean;
 }
 
+// Akış sayfa sayfa yüklenir; sonraki sayfa son gönderinin (created_at, id) imlecinden başlar
+const PAGE_SIZE = 20;
+
 export default function HomeScreen() {
   const { user } = useAuth();
   const router = useRouter();
-  const [posts, setPosts] = useState<Post[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [refreshing, setRefreshing] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Son sayfa geldiğinde listedeki gönderi sayısı; önbellek yenilenip liste değişince tekrar denenir
+  const [endReachedAt, setEndReachedAt] = useState<number | null>(null);
+  const loadingPage = useRef(false);
   const [createModalVisible, setCreateModalVisible] = useState(false);
   const [commentsModalVisible, setCommentsModalVisible] = useState(false);
   const [selectedPostId, setSelectedPostId] = useState<string | null>(null);
@@ -53,140 +59,110 @@ export default function HomeScreen() {
     }
   }, [showPostMenu]);
 
-  const fetchPosts = async () => {
-    try {
-      const { data, error } = await supabase
-        .from('posts')
-        .select(`
-          *,
-          profiles (username, avatar_url)
-        `)
-        .is('deleted_at', null)
-        .order('created_at', { ascending: false })
-        .limit(50);
-
-      if (error) throw error;
-
-      const postsWithCounts = await Promise.all(
-        (data || []).map(async (post) => {
-          const { count: likesCount } = await supabase
-            .from('likes')
-            .select('*', { count: 'exact', head: true })
-            .eq('post_id', post.id);
-
-          const { count: commentsCount } = await supabase
-            .from('comments')
-            .select('*', { count: 'exact', head: true })
-            .eq('post_id', post.id)
-            .is('deleted_at', null);
-
-          let likeData = null;
-          let saveData = null;
-
-          // Sadece kullanıcı giriş yapmışsa like ve save durumlarını kontrol et
-          if (user?.id) {
-            const { data: like } = await supabase
-              .from('likes')
-              .select('id')
-              .eq('post_id', post.id)
-              .eq('user_id', user.id)
-              .maybeSingle();
+  // after verilmezse ilk sayfa, verilirse o gönderiden sonraki sayfa gelir
+  const fetchPage = async (after?: Post): Promise<Post[]> => {
+    // Gönderiler; yazar, beğeni/yorum sayıları ve kullanıcının beğeni/kayıt durumu tek istekte gelir
+    const { data, error } = await supabase.rpc('get_feed', {
+      p_viewer: user?.id ?? null,
+      p_cursor_created_at: after?.created_at ?? null,
+      p_cursor_id: after?.id ?? null,
+      p_limit: PAGE_SIZE,
+    });
+
+    if (error) throw error;
+    return data || [];
+  };
 
-            const { data: save } = await supabase
-              .from('post_saves')
-              .select('id')
-              .eq('post_id', post.id)
-              .eq('user_id', user.id)
-              .maybeSingle();
+  // Yenilemede kaydırarak yüklenmiş sayfalar da yeniden yüklenir; liste ilk sayfaya dönmez
+  const fetchLoadedPages = async (): Promise<Post[]> => {
+    let loaded: Post[] = [];
+    do {
+      const page = await fetchPage(loaded[loaded.length - 1]);
+      loaded = [...loaded, ...page];
+      if (page.length < PAGE_SIZE) break;
+    } while (loaded.length < posts.length);
+    return loaded;
+  };
 
-            likeData = like;
-            saveData = save;
-          }
+  // İlk sayfa paylaşılan önbellekten gelir; kaydırdıkça yüklenen sayfalar aynı kayda eklenir.
+  // Beğeni ve kaydetmeler toggleRow ile listeye zaten işlendiğinden likes ve post_saves
+  // yazmaları akışı bayatlatmaz.
+  const {
+    data: posts = [],
+    loading,
+    refreshing,
+    refresh: fetchPosts,
+    setData: setPosts,
+  } = useCachedQuery(
+    queryKey('get_feed', { viewer: user?.id }),
+    ['posts', 'comments', 'profiles'],
+    fetchLoadedPages
+  );
+  const hasMore = posts.length >= PAGE_SIZE && endReachedAt !== posts.length;
 
-          return {
-            ...post,
-            likes_count: likesCount || 0,
-            comments_count: commentsCount || 0,
-            is_liked: !!likeData,
-            is_saved: !!saveData,
-          };
-        })
-      );
+  const handleRefresh = () => {
+    setEndReachedAt(null);
+    fetchPosts();
+  };
 
-      setPosts(postsWithCounts);
+  const handleLoadMore = async () => {
+    // onEndReached kaydırma sırasında art arda tetiklenebilir; aynı anda tek sayfa yüklenir
+    if (loadingPage.current || loading || refreshing || !hasMore) return;
+    loadingPage.current = true;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(posts[posts.length - 1]);
+      setPosts(current => {
+        const seen = new Set(current.map(post => post.id));
+        const next = [...current, ...page.filter(post => !seen.has(post.id))];
+        if (page.length < PAGE_SIZE) setEndReachedAt(next.length);
+        return next;
+      });
     } catch (error) {
       console.error('Error fetching posts:', error);
     } finally {
-      setLoading(false);
-      setRefreshing(false);
+      loadingPage.current = false;
+      setLoadingMore(false);
     }
   };
 
-  useEffect(() => {
-    fetchPosts();
-  }, []);
-
-  const handleRefresh = () => {
-    setRefreshing(true);
-    fetchPosts();
-  };
-
-  const handleLike = async (postId: string, isLiked: boolean) => {
+  const handleLike = (postId: string, isLiked: boolean) => {
     if (!user?.id) {
       Alert.alert('Hata', 'Beğenmek için giriş yapmalısınız');
       return;
     }
-    try {
-      if (isLiked) {
-        const { error } = await supabase
-          .from('likes')
-          .delete()
-          .eq('post_id', postId)
-          .eq('user_id', user.id);
-        if (error) throw error;
-      } else {
-        const { error } = await supabase
-          .from('likes')
-          .insert({
-            post_id: postId,
-            user_id: user.id,
-          });
-        if (error) throw error;
+    // Kalp ve sayı hemen değişir; hızlı dokunuşlardan yalnızca son durum sunucuya gider
+    toggleRow(
+      { table: 'likes', match: { post_id: postId, user_id: user.id } },
+      isLiked,
+      liked => setPosts(current => current.map(post =>
+        post.id === postId && !!post.is_liked !== liked
+          ? { ...post, is_liked: liked, likes_count: Math.max((post.likes_count || 0) + (liked ? 1 : -1), 0) }
+          : post
+      )),
+      error => {
+        console.error('Error toggling like:', error);
+        Alert.alert('Hata', 'Beğeni işlemi başarısız oldu');
       }
-      await fetchPosts();
-    } catch (error) {
-      console.error('Error toggling like:', error);
-      Alert.alert('Hata', 'Beğeni işlemi başarısız oldu');
-    }
+    );
   };
 
-  const handleSave = async (postId: string, isSaved: boolean) => {
+  const handleSave = (postId: string, isSaved: boolean) => {
     if (!user?.id) {
       Alert.alert('Hata', 'Kaydetmek için giriş yapmalısınız');
       return;
     }
-    try {
-      if (isSaved) {
-        const { error } = await supabase
-          .from('post_saves')
-          .delete()
-          .eq('post_id', postId)
-          .eq('user_id', user.id);
-        if (error) throw error;
-      } else {
-        const { error } = await supabase
-          .from('post_saves')
-          .insert({
-            post_id: postId,
-            user_id: user.id,
-          });
-        if (error) throw error;
+    toggleRow(
+      { table: 'post_saves', match: { post_id: postId, user_id: user.id } },
+      isSaved,
+      saved => setPosts(current => current.map(post =>
+        post.id === postId ? { ...post, is_saved: saved } : post
+      )),
+      error => {
+        console.error('Error toggling save:', error);
+        Alert.alert('Hata', 'Kaydetme işlemi başarısız oldu');
       }
-      await fetchPosts();
-    } catch (error) {
-      console.error('Error toggling save:', error);
-      Alert.alert('Hata', 'Kaydetme işlemi başarısız oldu');
-    }
+    );
   };
 
   const handleComment = (postId: string) => {
@@ -345,6 +321,7 @@ export default function HomeScreen() {
           <TouchableOpacity
             style={styles.actionButton}
             onPress={() => handleComment(item.id)}
+            testID="post-comment-button"
           >
             <MessageCircleIcon color={typographyColors.secondary} size={20} />
             <Text style={styles.actionCount}>{item.comments_count || 0}</Text>
@@ -397,6 +374,11 @@ export default function HomeScreen() {
         }
         contentContainerStyle={styles.listContent}
         style={styles.list}
+        onEndReached={handleLoadMore}
+        onEndReachedThreshold={0.5}
+        ListFooterComponent={
+          loadingMore ? <ActivityIndicator style={styles.listFooter} color={colors.primary[600]} /> : null
+        }
         ListEmptyComponent={
           <View style={styles.emptyContainer}>
             <Text style={styles.emptyText}>Henüz gönderi yok</Text>
@@ -513,6 +495,9 @@ const styles = StyleSheet.create({
     paddingVertical: 16,
     paddingBottom: 100,
   },
+  listFooter: {
+    paddingVertical: 16,
+  },
   postCard: {
     backgroundColor: 'transparent',
     marginHorizontal: 0,
@@ -1,10 +1,11 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { View, Text, StyleSheet, FlatList, TouchableOpacity, RefreshControl, Image, ScrollView, Alert, Platform } from 'react-native';
 import { useRouter } from 'expo-router';
 import { Plus, Search, Heart, MapPin, Tag, Bell, ShoppingCart, Settings, Edit } from 'lucide-react-native';
 import Animated, { FadeInDown } from 'react-native-reanimated';
 import { useAuth } from '../../lib/auth-context';
 import { supabase } from '../../lib/supabase';
+import { queryKey, useCachedQuery } from '../../lib/query-cache';
 import { colors, typographyColors } from '../../lib/colors';
 import CreateMarketplaceItemModal from '../../components/CreateMarketplaceItemModal';
 
@@ -52,48 +53,36 @@ const conditionColors: Record<string, string> = {
 export default function MarketplaceScreen() {
   const { user } = useAuth();
   const router = useRouter();
-  const [items, setItems] = useState<MarketplaceItem[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [refreshing, setRefreshing] = useState(false);
   const [selectedCategory, setSelectedCategory] = useState<string>('');
   const [createModalVisible, setCreateModalVisible] = useState(false);
   const [editItem, setEditItem] = useState<MarketplaceItem | null>(null);
 
-  useEffect(() => {
-    fetchItems();
-  }, [selectedCategory]);
+  const fetchItems = async (): Promise<MarketplaceItem[]> => {
+    let query = supabase
+      .from('marketplace_items')
+      .select(`
+        *,
+        profiles!marketplace_items_seller_id_fkey(username)
+      `)
+      .eq('status', 'active')
+      .order('created_at', { ascending: false });
 
-  const fetchItems = async () => {
-    try {
-      let query = supabase
-        .from('marketplace_items')
-        .select(`
-          *,
-          profiles!marketplace_items_seller_id_fkey(username)
-        `)
-        .eq('status', 'active')
-        .order('created_at', { ascending: false });
-
-      if (selectedCategory) {
-        query = query.eq('category', selectedCategory);
-      }
+    if (selectedCategory) {
+      query = query.eq('category', selectedCategory);
+    }
 
-      const { data, error } = await query.limit(50);
+    const { data, error } = await query.limit(50);
 
-      if (error) throw error;
-      setItems(data || []);
-    } catch (error) {
-      console.error('Error fetching items:', error);
-    } finally {
-      setLoading(false);
-      setRefreshing(false);
-    }
+    if (error) throw error;
+    return data || [];
   };
 
-  const handleRefresh = () => {
-    setRefreshing(true);
-    fetchItems();
-  };
+  // Her kategori ayrı önbellek kaydıdır; daha önce açılmış kategoriye dönünce liste hemen gösterilir
+  const { data: items = [], refreshing, refresh: handleRefresh } = useCachedQuery(
+    queryKey('marketplace_items', { category: selectedCategory }),
+    ['marketplace_items', 'profiles'],
+    fetchItems
+  );
 
   const handleEditItem = (item: MarketplaceItem, event?: any) => {
     if (event) {
@@ -288,7 +277,7 @@ export default function MarketplaceScreen() {
           setEditItem(null);
         }}
         onItemCreated={() => {
-          fetchItems();
+          handleRefresh();
           setEditItem(null);
         }}
         userId={user?.id || ''}
@@ -1,7 +1,8 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { View, Text, StyleSheet, FlatList, TouchableOpacity, RefreshControl, Image, Platform } from 'react-native';
 import { useAuth } from '@/lib/auth-context';
 import { supabase } from '@/lib/supabase';
+import { queryKey, useCachedQuery } from '@/lib/query-cache';
 import { colors, typographyColors } from '@/lib/colors';
 import { MessageCircle, Users, Search, MoreVertical, Edit } from 'lucide-react-native';
 
@@ -16,87 +17,71 @@ interface Conversation {
 
 export default function MessagesScreen() {
   const { user } = useAuth();
-  const [conversations, setConversations] = useState<Conversation[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [refreshing, setRefreshing] = useState(false);
   const [activeTab, setActiveTab] = useState<'dm' | 'groups'>('dm');
 
-  const fetchConversations = async () => {
-    if (!user?.id) {
-      setConversations([]);
-      setLoading(false);
-      return;
-    }
+  const fetchConversations = async (): Promise<Conversation[]> => {
+    if (!user?.id) return [];
 
-    try {
-      if (activeTab === 'dm') {
-        const { data: sentMessages } = await supabase
-          .from('direct_messages')
-          .select('*, recipient:profiles!direct_messages_recipient_id_fkey(username)')
-          .eq('sender_id', user.id)
-          .not('deleted_by', 'cs', `{${user.id}}`)
-          .order('created_at', { ascending: false });
+    if (activeTab === 'dm') {
+      const { data: sentMessages } = await supabase
+        .from('direct_messages')
+        .select('*, recipient:profiles!direct_messages_recipient_id_fkey(username)')
+        .eq('sender_id', user.id)
+        .not('deleted_by', 'cs', `{${user.id}}`)
+        .order('created_at', { ascending: false });
 
-        const { data: receivedMessages } = await supabase
-          .from('direct_messages')
-          .select('*, sender:profiles!direct_messages_sender_id_fkey(username)')
-          .eq('recipient_id', user.id)
-          .not('deleted_by', 'cs', `{${user.id}}`)
-          .order('created_at', { ascending: false });
+      const { data: receivedMessages } = await supabase
+        .from('direct_messages')
+        .select('*, sender:profiles!direct_messages_sender_id_fkey(username)')
+        .eq('recipient_id', user.id)
+        .not('deleted_by', 'cs', `{${user.id}}`)
+        .order('created_at', { ascending: false });
 
-        const allMessages = [...(sentMessages || []), ...(receivedMessages || [])];
-        const uniqueConversations = new Map<string, Conversation>();
+      const allMessages = [...(sentMessages || []), ...(receivedMessages || [])];
+      const uniqueConversations = new Map<string, Conversation>();
 
-        allMessages.forEach((msg: any) => {
-          const otherUserId = msg.sender_id === user.id ? msg.recipient_id : msg.sender_id;
-          const otherUsername = msg.sender_id === user.id ? msg.recipient?.username : msg.sender?.username;
+      allMessages.forEach((msg: any) => {
+        const otherUserId = msg.sender_id === user.id ? msg.recipient_id : msg.sender_id;
+        const otherUsername = msg.sender_id === user.id ? msg.recipient?.username : msg.sender?.username;
 
-          if (!uniqueConversations.has(otherUserId)) {
-            uniqueConversations.set(otherUserId, {
-              id: otherUserId,
-              type: 'dm',
-              name: otherUsername || 'Unknown',
-              last_message: msg.content,
-              last_message_time: msg.created_at,
-              unread_count: 0,
-            });
-          }
-        });
+        if (!uniqueConversations.has(otherUserId)) {
+          uniqueConversations.set(otherUserId, {
+            id: otherUserId,
+            type: 'dm',
+            name: otherUsername || 'Unknown',
+            last_message: msg.content,
+            last_message_time: msg.created_at,
+            unread_count: 0,
+          });
+        }
+      });
 
-        setConversations(Array.from(uniqueConversations.values()));
-      } else {
-        const { data: groupMemberships } = await supabase
-          .from('group_members')
-          .select('*, group:group_chats(*)')
-          .eq('user_id', user.id);
+      return Array.from(uniqueConversations.values());
+    } else {
+      const { data: groupMemberships } = await supabase
+        .from('group_members')
+        .select('*, group:group_chats(*)')
+        .eq('user_id', user.id);
 
-        const groupConversations = (groupMemberships || []).map((membership: any) => ({
-          id: membership.group.id,
-          type: 'group' as const,
-          name: membership.group.name,
-          last_message: 'Grup sohbeti',
-          last_message_time: membership.group.created_at,
-          unread_count: 0,
-        }));
+      const groupConversations = (groupMemberships || []).map((membership: any) => ({
+        id: membership.group.id,
+        type: 'group' as const,
+        name: membership.group.name,
+        last_message: 'Grup sohbeti',
+        last_message_time: membership.group.created_at,
+        unread_count: 0,
+      }));
 
-        setConversations(groupConversations);
-      }
-    } catch (error) {
-      console.error('Error fetching conversations:', error);
-    } finally {
-      setLoading(false);
-      setRefreshing(false);
+      return groupConversations;
     }
   };
 
-  useEffect(() => {
-    fetchConversations();
-  }, [activeTab]);
-
-  const handleRefresh = () => {
-    setRefreshing(true);
-    fetchConversations();
-  };
+  // DM ve grup listeleri ayrı önbellek kayıtlarıdır; sekmeler arasında geçişte yeniden yüklenmez
+  const { data: conversations = [], refreshing, refresh: handleRefresh } = useCachedQuery(
+    queryKey('conversations', { tab: activeTab, user: user?.id }),
+    ['direct_messages', 'group_members', 'group_chats', 'profiles'],
+    fetchConversations
+  );
 
   const renderConversation = ({ item }: { item: Conversation }) => {
     const isUnread = (item.unread_count || 0) > 0;
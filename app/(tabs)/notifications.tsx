@@ -1,8 +1,9 @@
-import { useState, useEffect } from 'react';
+import { useEffect } from 'react';
 import { View, Text, StyleSheet, FlatList, TouchableOpacity, RefreshControl, Platform } from 'react-native';
 import { Bell, Heart, MessageCircle, UserPlus, Calendar, ShoppingBag, AlertCircle } from 'lucide-react-native';
 import { useAuth } from '../../lib/auth-context';
 import { supabase } from '../../lib/supabase';
+import { queryKey, useCachedQuery } from '../../lib/query-cache';
 import { colors, typographyColors } from '../../lib/colors';
 
 interface Notification {
@@ -18,37 +19,32 @@ interface Notification {
 
 export default function NotificationsScreen() {
   const { user } = useAuth();
-  const [notifications, setNotifications] = useState<Notification[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [refreshing, setRefreshing] = useState(false);
-  const [unreadCount, setUnreadCount] = useState(0);
 
-  const fetchNotifications = async () => {
-    try {
-      const { data, error } = await supabase
-        .from('notifications')
-        .select('*')
-        .eq('user_id', user?.id)
-        .order('created_at', { ascending: false })
-        .limit(50);
+  const fetchNotifications = async (): Promise<Notification[]> => {
+    const { data, error } = await supabase
+      .from('notifications')
+      .select('*')
+      .eq('user_id', user?.id)
+      .order('created_at', { ascending: false })
+      .limit(50);
 
-      if (error) throw error;
-
-      setNotifications(data || []);
-
-      const unread = (data || []).filter(n => !n.is_read).length;
-      setUnreadCount(unread);
-    } catch (error) {
-      console.error('Error fetching notifications:', error);
-    } finally {
-      setLoading(false);
-      setRefreshing(false);
-    }
+    if (error) throw error;
+    return data || [];
   };
 
-  useEffect(() => {
-    fetchNotifications();
+  const {
+    data: notifications = [],
+    refreshing,
+    refresh: handleRefresh,
+    revalidate,
+    setData: setNotifications,
+  } = useCachedQuery(queryKey('notifications', { user: user?.id }), ['notifications'], fetchNotifications, {
+    enabled: !!user,
+  });
+  const unreadCount = notifications.filter(n => !n.is_read).length;
 
+  useEffect(() => {
+    // Yeni bildirimler başka kullanıcıların işlemleriyle gelir; önbellek sessizce yenilenir
     const subscription = supabase
       .channel('notifications_changes')
       .on(
@@ -60,7 +56,7 @@ export default function NotificationsScreen() {
           filter: `user_id=eq.${user?.id}`,
         },
         () => {
-          fetchNotifications();
+          revalidate();
         }
       )
       .subscribe();
@@ -70,19 +66,15 @@ export default function NotificationsScreen() {
     };
   }, [user?.id]);
 
-  const handleRefresh = () => {
-    setRefreshing(true);
-    fetchNotifications();
-  };
-
   const markAsRead = async (notificationId: string) => {
     try {
-      await supabase
+      const { error } = await supabase
         .from('notifications')
         .update({ is_read: true })
         .eq('id', notificationId);
 
-      fetchNotifications();
+      if (error) throw error;
+      setNotifications(current => current.map(n => (n.id === notificationId ? { ...n, is_read: true } : n)));
     } catch (error) {
       console.error('Error marking as read:', error);
     }
@@ -90,13 +82,14 @@ export default function NotificationsScreen() {
 
   const markAllAsRead = async () => {
     try {
-      await supabase
+      const { error } = await supabase
         .from('notifications')
         .update({ is_read: true })
         .eq('user_id', user?.id)
         .eq('is_read', false);
 
-      fetchNotifications();
+      if (error) throw error;
+      setNotifications(current => current.map(n => ({ ...n, is_read: true })));
     } catch (error) {
       console.error('Error marking all as read:', error);
     }
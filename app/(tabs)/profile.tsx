@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { View, Text, StyleSheet, ScrollView, TouchableOpacity, TextInput, Modal, FlatList, Image, Alert, Platform } from 'react-native';
 import * as ImagePicker from 'expo-image-picker';
 import { User, Settings, LogOut, Edit, Shield, Award, Target, Users, Heart, Bookmark, TrendingUp, Camera, ArrowLeft } from 'lucide-react-native';
@@ -6,6 +6,7 @@ import { useRouter } from 'expo-router';
 import Animated, { FadeInDown } from 'react-native-reanimated';
 import { useAuth } from '../../lib/auth-context';
 import { supabase } from '../../lib/supabase';
+import { queryKey, useCachedQuery } from '../../lib/query-cache';
 import { colors, typographyColors } from '../../lib/colors';
 import { uploadMedia } from '../../lib/media-upload';
 
@@ -17,6 +18,10 @@ interface UserProfile {
   favorite_equipment?: string;
   role: string;
   avatar_url?: string;
+  posts_count?: number;
+  followers_count?: number;
+  following_count?: number;
+  likes_given_count?: number;
 }
 
 interface UserStats {
@@ -43,91 +48,75 @@ const rankInfo = {
 export default function ProfileScreen() {
   const { user, signOut } = useAuth();
   const router = useRouter();
-  const [profile, setProfile] = useState<UserProfile | null>(null);
-  const [stats, setStats] = useState<UserStats>({ posts_count: 0, followers_count: 0, following_count: 0, likes_received: 0 });
-  const [xpData, setXpData] = useState<UserXP | null>(null);
   const [editModalVisible, setEditModalVisible] = useState(false);
   const [editedProfile, setEditedProfile] = useState<Partial<UserProfile>>({});
   const [saving, setSaving] = useState(false);
   const [activeTab, setActiveTab] = useState<'posts' | 'liked' | 'saved'>('posts');
-  const [userPosts, setUserPosts] = useState<any[]>([]);
   const [uploadingAvatar, setUploadingAvatar] = useState(false);
 
-  useEffect(() => {
-    if (user?.id) {
-      fetchProfile();
-      fetchStats();
-      fetchXP();
-      fetchUserPosts();
-    }
-  }, [user?.id]);
+  const fetchProfile = async (): Promise<UserProfile> => {
+    const { data, error } = await supabase
+      .from('profiles')
+      .select('*')
+      .eq('id', user?.id)
+      .single();
 
-  const fetchProfile = async () => {
-    try {
-      const { data, error } = await supabase
-        .from('profiles')
-        .select('*')
-        .eq('id', user?.id)
-        .single();
+    if (error) throw error;
+    return data;
+  };
 
-      if (error) throw error;
-      setProfile(data);
-      setEditedProfile(data);
-    } catch (error) {
-      console.error('Error fetching profile:', error);
-    }
+  const fetchXP = async (): Promise<UserXP | null> => {
+    const { data, error } = await supabase
+      .from('user_xp')
+      .select('*')
+      .eq('user_id', user?.id)
+      .maybeSingle();
+
+    if (error) throw error;
+    return data;
   };
 
-  const fetchStats = async () => {
-    try {
-      const [postsResult, followersResult, followingResult, likesResult] = await Promise.all([
-        supabase.from('posts').select('id', { count: 'exact', head: true }).eq('user_id', user?.id).is('deleted_at', null),
-        supabase.from('follows').select('id', { count: 'exact', head: true }).eq('following_id', user?.id),
-        supabase.from('follows').select('id', { count: 'exact', head: true }).eq('follower_id', user?.id),
-        supabase.from('likes').select('id', { count: 'exact', head: true }).eq('user_id', user?.id),
-      ]);
-
-      setStats({
-        posts_count: postsResult.count || 0,
-        followers_count: followersResult.count || 0,
-        following_count: followingResult.count || 0,
-        likes_received: likesResult.count || 0,
-      });
-    } catch (error) {
-      console.error('Error fetching stats:', error);
-    }
+  const fetchUserPosts = async (): Promise<any[]> => {
+    const { data, error } = await supabase
+      .from('posts')
+      .select('*')
+      .eq('user_id', user?.id)
+      .is('deleted_at', null)
+      .order('created_at', { ascending: false })
+      .limit(20);
+
+    if (error) throw error;
+    return data || [];
   };
 
-  const fetchXP = async () => {
-    try {
-      const { data, error } = await supabase
-        .from('user_xp')
-        .select('*')
-        .eq('user_id', user?.id)
-        .maybeSingle();
+  const enabled = !!user?.id;
+  const { data: profile = null, setData: setProfile } = useCachedQuery(
+    queryKey('profiles', { id: user?.id }),
+    ['profiles'],
+    fetchProfile,
+    { enabled }
+  );
+  const { data: xpData = null } = useCachedQuery(queryKey('user_xp', { user: user?.id }), ['user_xp'], fetchXP, {
+    enabled,
+  });
+  const { data: userPosts = [] } = useCachedQuery(
+    queryKey('posts', { user: user?.id }),
+    ['posts'],
+    fetchUserPosts,
+    { enabled }
+  );
 
-      if (error) throw error;
-      setXpData(data);
-    } catch (error) {
-      console.error('Error fetching XP:', error);
-    }
+  // Sayaç kolonları tetikleyicilerle güncel tutulur
+  const stats: UserStats = {
+    posts_count: profile?.posts_count || 0,
+    followers_count: profile?.followers_count || 0,
+    following_count: profile?.following_count || 0,
+    likes_received: profile?.likes_given_count || 0,
   };
 
-  const fetchUserPosts = async () => {
-    try {
-      const { data, error } = await supabase
-        .from('posts')
-        .select('*')
-        .eq('user_id', user?.id)
-        .is('deleted_at', null)
-        .order('created_at', { ascending: false })
-        .limit(20);
-
-      if (error) throw error;
-      setUserPosts(data || []);
-    } catch (error) {
-      console.error('Error fetching user posts:', error);
-    }
+  const openEditModal = () => {
+    setEditedProfile(profile || {});
+    setEditModalVisible(true);
   };
 
   const handleSaveProfile = async () => {
@@ -140,7 +129,7 @@ export default function ProfileScreen() {
 
       if (error) throw error;
 
-      setProfile({ ...profile, ...editedProfile } as UserProfile);
+      setProfile(current => ({ ...current, ...editedProfile }));
       setEditModalVisible(false);
     } catch (error) {
       console.error('Error updating profile:', error);
@@ -179,7 +168,7 @@ export default function ProfileScreen() {
 
         if (error) throw error;
 
-        setProfile({ ...profile, avatar_url: uploadResult.url } as UserProfile);
+        setProfile(current => ({ ...current, avatar_url: uploadResult.url }));
         Alert.alert('Başarılı', 'Profil resmi güncellendi');
       }
     } catch (error) {
@@ -235,7 +224,7 @@ export default function ProfileScreen() {
         <Text style={styles.topBarTitle}>Profil</Text>
         <TouchableOpacity
           style={styles.settingsButton}
-          onPress={() => setEditModalVisible(true)}
+          onPress={openEditModal}
         >
           <Settings color={typographyColors.primary} size={24} />
         </TouchableOpacity>
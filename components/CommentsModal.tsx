@@ -4,6 +4,7 @@ import { X, Send, Heart, MessageCircle } from 'lucide-react-native';
 import Animated, { FadeInDown } from 'react-native-reanimated';
 import { useAuth } from '../lib/auth-context';
 import { supabase } from '../lib/supabase';
+import { toggleRow } from '../lib/optimistic';
 import { colors, typographyColors } from '../lib/colors';
 
 interface CommentsModalProps {
@@ -54,27 +55,24 @@ export default function CommentsModal({ visible, onClose, postId }: CommentsModa
 
       if (error) throw error;
 
-      const commentsWithLikes = await Promise.all(
-        (data || []).map(async (comment) => {
-          const { count: likesCount } = await supabase
-            .from('comment_likes')
-            .select('*', { count: 'exact', head: true })
-            .eq('comment_id', comment.id);
+      // likes_count kolonu tetikleyiciyle güncel tutulur; kullanıcının beğenileri tek sorguda alınır
+      const ids = (data || []).map(comment => comment.id);
+      let liked = new Set<string>();
+      if (user && ids.length > 0) {
+        const { data: likeData, error: likeError } = await supabase
+          .from('comment_likes')
+          .select('comment_id')
+          .in('comment_id', ids)
+          .eq('user_id', user.id);
 
-          const { data: likeData } = await supabase
-            .from('comment_likes')
-            .select('id')
-            .eq('comment_id', comment.id)
-            .eq('user_id', user?.id)
-            .maybeSingle();
+        if (likeError) throw likeError;
+        liked = new Set((likeData || []).map(row => row.comment_id));
+      }
 
-          return {
-            ...comment,
-            likes_count: likesCount || 0,
-            is_liked: !!likeData,
-          };
-        })
-      );
+      const commentsWithLikes = (data || []).map(comment => ({
+        ...comment,
+        is_liked: liked.has(comment.id),
+      }));
 
       const threaded = buildCommentTree(commentsWithLikes);
       setComments(threaded);
@@ -137,26 +135,27 @@ export default function CommentsModal({ visible, onClose, postId }: CommentsModa
     }
   };
 
-  const handleLikeComment = async (commentId: string, isLiked: boolean) => {
-    try {
-      if (isLiked) {
-        await supabase
-          .from('comment_likes')
-          .delete()
-          .eq('comment_id', commentId)
-          .eq('user_id', user?.id);
-      } else {
-        await supabase
-          .from('comment_likes')
-          .insert({
-            comment_id: commentId,
-            user_id: user?.id,
-          });
-      }
-      fetchComments();
-    } catch (error) {
-      console.error('Error liking comment:', error);
-    }
+  const handleLikeComment = (commentId: string, isLiked: boolean) => {
+    if (!user?.id) return;
+    // Yorumlar ağaç halinde tutulur; beğeni yanıtlarda da olabilir
+    const setLiked = (list: Comment[], liked: boolean): Comment[] =>
+      list.map(comment => {
+        if (comment.id === commentId && !!comment.is_liked !== liked) {
+          return {
+            ...comment,
+            is_liked: liked,
+            likes_count: Math.max((comment.likes_count || 0) + (liked ? 1 : -1), 0),
+          };
+        }
+        return comment.replies ? { ...comment, replies: setLiked(comment.replies, liked) } : comment;
+      });
+
+    toggleRow(
+      { table: 'comment_likes', match: { comment_id: commentId, user_id: user.id } },
+      isLiked,
+      liked => setComments(current => setLiked(current, liked)),
+      error => console.error('Error liking comment:', error)
+    );
   };
 
   const formatTime = (dateString: string) => {
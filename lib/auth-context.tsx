@@ -1,6 +1,7 @@
 import React, { createContext, useContext, useEffect, useState } from 'react';
 import { Session } from '@supabase/supabase-js';
 import { supabase } from './supabase';
+import { clearQueryCache } from './query-cache';
 
 interface AuthContextType {
   session: Session | null;
@@ -193,6 +194,7 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
     try {
       const { error } = await supabase.auth.signOut();
       if (error) throw error;
+      clearQueryCache();
       setSession(null);
       setUser(null);
       // Navigation will be handled by RootLayoutNav useEffect
@@ -0,0 +1,107 @@
+import { supabase } from './supabase';
+
+// Beğeni, kaydetme, katılım gibi "var / yok" satırları için iyimser (optimistic) güncelleme.
+// Ekran yerel durumu hemen değiştirir; sunucuya tek bir idempotent istek gider:
+// satır olmalıysa upsert, olmamalıysa delete. Hızlı art arda dokunuşlar birleştirilir
+// ve yalnızca son durum gönderilir. İstek başarısız olursa yerel durum geri alınır.
+
+export interface ToggleTarget {
+  table: string;
+  // Satırı tanımlayan kolonlar; tablonun unique kısıtı da bunlardır (on_conflict)
+  match: Record<string, string>;
+  // Satır eklenirken yazılacak diğer kolonlar. Verilirse var olan satır bu
+  // değerlerle güncellenir (tablonun UPDATE politikası gerekir), verilmezse
+  // var olan satıra dokunulmaz.
+  values?: Record<string, unknown>;
+}
+
+// Dokunuşlar bu süre boyunca birikir, sonra tek istek gider
+const COALESCE_MS = 300;
+
+interface PendingToggle {
+  // Sunucuda olduğu bilinen durum
+  confirmed: boolean;
+  // Kullanıcının en son seçtiği durum
+  desired: boolean;
+  inFlight: boolean;
+  timer: ReturnType<typeof setTimeout> | null;
+  apply: (state: boolean) => void;
+  onError?: (error: unknown) => void;
+}
+
+const pending = new Map<string, PendingToggle>();
+
+function keyOf(target: ToggleTarget): string {
+  const match = Object.keys(target.match)
+    .sort()
+    .map(column => `${column}=${target.match[column]}`);
+  return `${target.table}?${match.join('&')}`;
+}
+
+async function send(target: ToggleTarget, state: boolean) {
+  const { error } = state
+    ? await supabase
+        .from(target.table)
+        .upsert(
+          { ...target.match, ...target.values },
+          { onConflict: Object.keys(target.match).join(','), ignoreDuplicates: !target.values }
+        )
+    : await supabase.from(target.table).delete().match(target.match);
+  if (error) throw error;
+}
+
+async function flush(key: string, target: ToggleTarget) {
+  const entry = pending.get(key);
+  if (!entry) return;
+  entry.timer = null;
+  // Süren istek bitince son durum gönderilir
+  if (entry.inFlight) return;
+  if (entry.desired === entry.confirmed) {
+    pending.delete(key);
+    return;
+  }
+
+  const state = entry.desired;
+  entry.inFlight = true;
+  try {
+    await send(target, state);
+    entry.confirmed = state;
+  } catch (error) {
+    entry.desired = entry.confirmed;
+    entry.apply(entry.confirmed);
+    entry.onError?.(error);
+  } finally {
+    entry.inFlight = false;
+  }
+
+  // İstek sürerken gelen dokunuşların zamanlayıcısı hâlâ bekliyorsa gönderimi o yapar
+  if (entry.timer === null) {
+    flush(key, target);
+  }
+}
+
+/**
+ * `target` satırını, ekranın şu an gösterdiği `current` durumun tersine çevirir.
+ * `apply(state)` yerel durumu `state`e getirmelidir (ör. is_liked ve likes_count);
+ * hemen, hata olursa da sunucudaki durumla bir kez daha çağrılır.
+ */
+export function toggleRow(
+  target: ToggleTarget,
+  current: boolean,
+  apply: (state: boolean) => void,
+  onError?: (error: unknown) => void
+) {
+  const key = keyOf(target);
+  let entry = pending.get(key);
+  if (!entry) {
+    entry = { confirmed: current, desired: current, inFlight: false, timer: null, apply, onError };
+    pending.set(key, entry);
+  }
+  entry.apply = apply;
+  entry.onError = onError;
+  entry.desired = !entry.desired;
+  apply(entry.desired);
+
+  if (entry.timer) clearTimeout(entry.timer);
+  entry.timer = setTimeout(() => flush(key, target), COALESCE_MS);
+}
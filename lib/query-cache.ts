@@ -0,0 +1,207 @@
+import { useCallback, useEffect, useReducer, useRef, useState } from 'react';
+import { useFocusEffect } from 'expo-router';
+
+// Sekmeler arasında paylaşılan sorgu önbelleği.
+// - Kayıtlar sorgunun şekliyle anahtarlanır (tablo + filtreler, bkz. queryKey)
+// - Önbellekte veri varsa hemen gösterilir; bayatsa ekran odaklanınca arka planda yenilenir
+// - Aynı anahtar için süren istek varsa yenisi atılmaz, o beklenir
+// - Bir tabloya yazan her REST isteği (lib/supabase.ts) o tabloyu okuyan kayıtları bayatlatır;
+//   ekranda olan kayıtlar hemen yeniden yüklenir
+// - En fazla MAX_ENTRIES kayıt tutulur; en uzun süredir kullanılmayan ve ekranda olmayan atılır
+
+// Bu süreden eski veri, değişiklik olmasa da yenilenir
+const MAX_AGE_MS = 30_000;
+const MAX_ENTRIES = 100;
+
+interface Entry {
+  // Sorgunun okuduğu tablolar; bunlardan birine yazılınca kayıt bayatlar
+  tables: string[];
+  data?: unknown;
+  error?: unknown;
+  updatedAt: number;
+  stale: boolean;
+  // Her bayatlatmada artar; süren istek, başladığından beri bayatlatılmış mı bilinir
+  version: number;
+  inFlight?: Promise<unknown>;
+  listeners: Set<() => void>;
+  // Kaydı okuyan ekranın en son render'ındaki sorgusu; ekrandayken yeniden yüklemek için
+  fetcher?: () => Promise<unknown>;
+}
+
+// Map ekleme sırasını korur: baştaki kayıt en uzun süredir kullanılmayandır
+const entries = new Map<string, Entry>();
+
+export function queryKey(table: string, shape: Record<string, unknown> = {}): string {
+  const params = Object.keys(shape)
+    .sort()
+    .map(name => `${name}=${JSON.stringify(shape[name] ?? null)}`);
+  return `${table}?${params.join('&')}`;
+}
+
+function touch(key: string, tables: string[]): Entry {
+  let entry = entries.get(key);
+  if (entry) {
+    entries.delete(key);
+  } else {
+    entry = { tables, updatedAt: 0, stale: true, version: 0, listeners: new Set() };
+  }
+  entries.set(key, entry);
+  evict();
+  return entry;
+}
+
+function evict() {
+  if (entries.size <= MAX_ENTRIES) return;
+  for (const [key, entry] of entries) {
+    if (entries.size <= MAX_ENTRIES) break;
+    // Ekrandaki ya da yüklenmekte olan kayıtlar atılmaz
+    if (entry.listeners.size === 0 && !entry.inFlight) {
+      entries.delete(key);
+    }
+  }
+}
+
+function notify(entry: Entry) {
+  entry.listeners.forEach(listener => listener());
+}
+
+function needsRevalidation(entry: Entry): boolean {
+  return entry.stale || Date.now() - entry.updatedAt > MAX_AGE_MS;
+}
+
+function revalidate(entry: Entry, fetcher: () => Promise<unknown>): Promise<unknown> {
+  if (entry.inFlight) return entry.inFlight;
+  const version = entry.version;
+  entry.inFlight = fetcher()
+    .then(data => {
+      entry.data = data;
+      entry.error = undefined;
+      entry.updatedAt = Date.now();
+      // İstek sürerken yazılan bir değişiklik bu veride olmayabilir
+      entry.stale = entry.version !== version;
+      return data;
+    })
+    .catch(error => {
+      entry.error = error;
+      throw error;
+    })
+    .finally(() => {
+      entry.inFlight = undefined;
+      notify(entry);
+      // İstek sürerken bayatlatıldıysa ve hâlâ ekrandaysa yeni veriyle tekrar yüklenir
+      if (entry.version !== version) {
+        reload(entry);
+      }
+    });
+  return entry.inFlight;
+}
+
+// Ekranda olan (dinleyicisi olan) kaydı son sorgusuyla arka planda yeniden yükler
+function reload(entry: Entry) {
+  if (entry.listeners.size === 0 || !entry.fetcher) return;
+  revalidate(entry, entry.fetcher).catch(error => console.error('Error revalidating query:', error));
+}
+
+export function invalidateTables(tables: string[]) {
+  entries.forEach(entry => {
+    if (entry.tables.some(table => tables.includes(table))) {
+      entry.stale = true;
+      entry.version += 1;
+      notify(entry);
+      reload(entry);
+    }
+  });
+}
+
+// Kullanıcı değişince (çıkış) başkasına ait veriler gösterilmesin
+export function clearQueryCache() {
+  entries.forEach((entry, key) => {
+    if (entry.listeners.size === 0) {
+      entries.delete(key);
+      return;
+    }
+    // Ekrandaki kayıtlar abonelerini korur; verileri boşaltılıp yeniden yüklenir
+    entry.data = undefined;
+    entry.error = undefined;
+    entry.stale = true;
+    entry.version += 1;
+    notify(entry);
+    reload(entry);
+  });
+}
+
+export function setQueryData<T>(key: string, updater: (current: T) => T) {
+  const entry = entries.get(key);
+  if (!entry || entry.data === undefined) return;
+  entry.data = updater(entry.data as T);
+  notify(entry);
+}
+
+/**
+ * `fetcher`ın sonucunu `key` altında önbellekten verir. `tables` sorgunun okuduğu
+ * tablolardır. Ekran odaklandığında veri bayatsa arka planda yenilenir; `refresh`
+ * hemen yeniler (çekerek yenileme göstergesiyle), `revalidate` sessizce yeniler
+ * (ör. realtime bildirimi gelince), `setData` iyimser güncellemeleri önbelleğe de yazar.
+ */
+export function useCachedQuery<T>(
+  key: string,
+  tables: string[],
+  fetcher: () => Promise<T>,
+  options: { enabled?: boolean } = {}
+) {
+  const enabled = options.enabled ?? true;
+  const [, rerender] = useReducer((count: number) => count + 1, 0);
+  const [refreshing, setRefreshing] = useState(false);
+  const entry = entries.get(key);
+  // Her render'da güncellenir: yeniden yükleme her zaman ekranın güncel state'iyle yapılır
+  const fetcherRef = useRef(fetcher);
+  fetcherRef.current = fetcher;
+  const latestFetcher = useCallback(() => fetcherRef.current(), []);
+
+  useEffect(() => {
+    if (!enabled) return;
+    const current = touch(key, tables);
+    current.listeners.add(rerender);
+    current.fetcher = latestFetcher;
+    return () => {
+      current.listeners.delete(rerender);
+      evict();
+    };
+  }, [key, enabled]);
+
+  const revalidateNow = () => {
+    revalidate(touch(key, tables), latestFetcher).catch(error => console.error(`Error fetching ${key}:`, error));
+  };
+
+  useFocusEffect(
+    useCallback(() => {
+      if (!enabled) return;
+      if (needsRevalidation(touch(key, tables))) {
+        revalidateNow();
+      }
+    }, [key, enabled])
+  );
+
+  const refresh = async () => {
+    setRefreshing(true);
+    try {
+      await revalidate(touch(key, tables), latestFetcher);
+    } catch (error) {
+      console.error(`Error fetching ${key}:`, error);
+    } finally {
+      setRefreshing(false);
+    }
+  };
+
+  const setData = (updater: (current: T) => T) => setQueryData<T>(key, updater);
+
+  return {
+    data: entry?.data as T | undefined,
+    // İlk yükleme: henüz ne veri ne hata var
+    loading: enabled && entry?.data === undefined && entry?.error === undefined,
+    refreshing,
+    refresh,
+    revalidate: revalidateNow,
+    setData,
+  };
+}
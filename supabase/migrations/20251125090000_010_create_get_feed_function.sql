@@ -0,0 +1,93 @@
+/*
+  # Ana Sayfa Akışı: get_feed RPC
+
+  ## Sorun
+  - Ana sayfa (fetchPosts) 50 gönderiyi yükledikten sonra her gönderi için
+    4 istek daha atıyor: beğeni sayısı, yorum sayısı, kullanıcının beğenisi
+    ve kaydı. Bir akış yüklemesi ~200 HTTP isteği.
+
+  ## Değişiklikler
+  - get_feed(p_viewer, p_cursor, p_limit): gönderileri yazar profili,
+    likes_count, comments_count, is_liked ve is_saved ile tek sorguda döndürür
+  - Sayılar sayfadaki gönderiler için toplu (GROUP BY) hesaplanır
+  - p_cursor verilirse bu zamandan eski gönderiler gelir (sonraki sayfa)
+  - p_limit 1 ile 100 arasına sınırlanır
+
+  ## Güvenlik
+  - SECURITY INVOKER: posts, likes, comments ve post_saves RLS politikaları
+    aynen uygulanır
+  - Tablolar şema adıyla yazılır; fonksiyonda SET search_path olmadığı için
+    Postgres onu çağıran sorguya açabilir (inline) ve planı tek sorgu olarak
+    görünür
+*/
+
+CREATE OR REPLACE FUNCTION get_feed(
+  p_viewer uuid,
+  p_cursor timestamptz DEFAULT NULL,
+  p_limit int DEFAULT 50
+)
+RETURNS TABLE (
+  id uuid,
+  user_id uuid,
+  content text,
+  media_urls jsonb,
+  media_type text,
+  hashtags text[],
+  location text,
+  visibility text,
+  created_at timestamptz,
+  updated_at timestamptz,
+  profiles jsonb,
+  likes_count bigint,
+  comments_count bigint,
+  is_liked boolean,
+  is_saved boolean
+)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+  WITH page AS (
+    SELECT p.*
+    FROM public.posts p
+    WHERE p.deleted_at IS NULL
+      AND (p_cursor IS NULL OR p.created_at < p_cursor)
+    ORDER BY p.created_at DESC
+    LIMIT LEAST(GREATEST(COALESCE(p_limit, 50), 1), 100)
+  ),
+  like_counts AS (
+    SELECT l.post_id, count(*) AS total
+    FROM public.likes l
+    WHERE l.post_id IN (SELECT page.id FROM page)
+    GROUP BY l.post_id
+  ),
+  comment_counts AS (
+    SELECT c.post_id, count(*) AS total
+    FROM public.comments c
+    WHERE c.post_id IN (SELECT page.id FROM page) AND c.deleted_at IS NULL
+    GROUP BY c.post_id
+  )
+  SELECT
+    page.id,
+    page.user_id,
+    page.content,
+    page.media_urls,
+    page.media_type,
+    page.hashtags,
+    page.location,
+    page.visibility,
+    page.created_at,
+    page.updated_at,
+    jsonb_build_object('username', pr.username, 'avatar_url', pr.avatar_url),
+    COALESCE(lc.total, 0),
+    COALESCE(cc.total, 0),
+    EXISTS (SELECT 1 FROM public.likes l WHERE l.post_id = page.id AND l.user_id = p_viewer),
+    EXISTS (SELECT 1 FROM public.post_saves s WHERE s.post_id = page.id AND s.user_id = p_viewer)
+  FROM page
+  LEFT JOIN public.profiles pr ON pr.id = page.user_id
+  LEFT JOIN like_counts lc ON lc.post_id = page.id
+  LEFT JOIN comment_counts cc ON cc.post_id = page.id
+  ORDER BY page.created_at DESC;
+$$;
+
+GRANT EXECUTE ON FUNCTION get_feed(uuid, timestamptz, int) TO anon, authenticated;
@@ -0,0 +1,490 @@
+/*
+  # Sayaç Kolonları ve Tetikleyiciler
+
+  ## Sorun
+  - Ekranlar sayıları her açılışta COUNT ile hesaplıyor: gönderi başına
+    beğeni ve yorum, yorum başına comment_likes, etkinlik başına katılımcı,
+    profilde gönderi, takipçi, takip ve beğeni sayısı. Her sayı ayrı bir
+    HTTP isteği ve bir index taraması.
+
+  ## Değişiklikler
+  - posts: likes_count, comments_count, saves_count
+  - comments: likes_count
+  - events: participants_count (status = 'going')
+  - profiles: posts_count, followers_count, following_count, likes_given_count
+  - likes, comments, comment_likes, post_saves, follows, event_participants
+    ve posts üzerinde INSERT/DELETE (ve deleted_at / status değişikliği)
+    tetikleyicileri sayaçları günceller
+  - comment_likes tablosu hiçbir migration'da oluşturulmamıştı; burada
+    (IF NOT EXISTS) oluşturulur
+  - get_feed sayıları artık kolonlardan okur
+  - reconcile_counters(): sayaçları gerçek sayılarla karşılaştırıp kaymaları
+    düzeltir; pg_cron varsa her gece 04:17'de çalışır
+
+  ## Eşzamanlılık
+  - Tetikleyiciler "x = x + 1" şeklinde tek UPDATE yapar: oku-yaz yoktur,
+    eşzamanlı beğeniler satır kilidinde sıraya girer, hiçbir artış kaybolmaz
+  - follows tetikleyicisi iki profili tek UPDATE ile günceller; karşılıklı
+    takipler aynı sırada kilitlenir ve kilitlenme (deadlock) oluşmaz
+  - reconcile_counters kaymış satırı önce kilitler, sonra yeniden sayar;
+    kilit beklerken işlenen bir tetikleyici artışını ezmez
+  - reconcile_counters(true) toplu moddur: her sayaç tek bir set tabanlı
+    UPDATE ile (GROUP BY sayımıyla) doldurulur. Satır satır yeniden sayma,
+    kaynak anahtarı index'siz olduğunda (comments.post_id, posts.user_id,
+    likes.user_id, follows.following_id) her satır için bir sıralı tarama
+    demektir; bu yüzden ilk doldurma ve toplu yüklemeler bu modu kullanır.
+    Eşzamanlı yazma beklenmeyen durumlar içindir; gece işi kilitli yolu
+    kullanır
+
+  ## Güvenlik
+  - Tetikleyici ve uzlaştırma fonksiyonları SECURITY DEFINER ve sabit
+    search_path ile çalışır: kullanıcı başkasının gönderisini güncelleyemese
+    de beğenisi sayacı artırır
+  - protect_counters: istemci rolleri sayaç kolonlarını UPDATE ile
+    değiştiremez (kolonlar sessizce eski değerinde kalır)
+  - reconcile_counters ve reconcile_counter istemcilere kapalıdır
+*/
+
+-- ========================================
+-- 1. COMMENT_LIKES
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS comment_likes (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  comment_id uuid REFERENCES comments(id) ON DELETE CASCADE NOT NULL,
+  user_id uuid REFERENCES profiles(id) ON DELETE CASCADE NOT NULL,
+  created_at timestamptz DEFAULT now(),
+  UNIQUE(comment_id, user_id)
+);
+
+ALTER TABLE comment_likes ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Anyone can view comment likes" ON comment_likes;
+CREATE POLICY "Anyone can view comment likes"
+  ON comment_likes FOR SELECT
+  TO authenticated
+  USING (true);
+
+DROP POLICY IF EXISTS "Users can like comments" ON comment_likes;
+CREATE POLICY "Users can like comments"
+  ON comment_likes FOR INSERT
+  TO authenticated
+  WITH CHECK ((select auth.uid()) = user_id);
+
+DROP POLICY IF EXISTS "Users can unlike comments" ON comment_likes;
+CREATE POLICY "Users can unlike comments"
+  ON comment_likes FOR DELETE
+  TO authenticated
+  USING ((select auth.uid()) = user_id);
+
+CREATE INDEX IF NOT EXISTS idx_comment_likes_user_id ON comment_likes(user_id);
+
+-- ========================================
+-- 2. SAYAÇ KOLONLARI
+-- ========================================
+
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS likes_count int NOT NULL DEFAULT 0;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS comments_count int NOT NULL DEFAULT 0;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS saves_count int NOT NULL DEFAULT 0;
+ALTER TABLE comments ADD COLUMN IF NOT EXISTS likes_count int NOT NULL DEFAULT 0;
+ALTER TABLE events ADD COLUMN IF NOT EXISTS participants_count int NOT NULL DEFAULT 0;
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS posts_count int NOT NULL DEFAULT 0;
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS followers_count int NOT NULL DEFAULT 0;
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS following_count int NOT NULL DEFAULT 0;
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS likes_given_count int NOT NULL DEFAULT 0;
+
+-- İstemciler sayaçları yazamaz: profil ve gönderi UPDATE politikaları satırın
+-- tamamına izin verdiği için, anon/authenticated rolünden gelen UPDATE'lerde
+-- sayaç kolonları (TG_ARGV) eski değerinde tutulur.  Aşağıdaki tetikleyiciler
+-- SECURITY DEFINER olduğundan kendi güncellemeleri bu korumaya takılmaz.
+CREATE OR REPLACE FUNCTION protect_counters()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  IF current_user IN ('anon', 'authenticated') THEN
+    NEW := jsonb_populate_record(
+      NEW,
+      (SELECT jsonb_object_agg(key, value) FROM jsonb_each(to_jsonb(OLD)) WHERE key = ANY (TG_ARGV))
+    );
+  END IF;
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS posts_protect_counters ON posts;
+CREATE TRIGGER posts_protect_counters
+  BEFORE UPDATE ON posts
+  FOR EACH ROW EXECUTE FUNCTION protect_counters('likes_count', 'comments_count', 'saves_count');
+
+DROP TRIGGER IF EXISTS comments_protect_counters ON comments;
+CREATE TRIGGER comments_protect_counters
+  BEFORE UPDATE ON comments
+  FOR EACH ROW EXECUTE FUNCTION protect_counters('likes_count');
+
+DROP TRIGGER IF EXISTS events_protect_counters ON events;
+CREATE TRIGGER events_protect_counters
+  BEFORE UPDATE ON events
+  FOR EACH ROW EXECUTE FUNCTION protect_counters('participants_count');
+
+DROP TRIGGER IF EXISTS profiles_protect_counters ON profiles;
+CREATE TRIGGER profiles_protect_counters
+  BEFORE UPDATE ON profiles
+  FOR EACH ROW
+  EXECUTE FUNCTION protect_counters('posts_count', 'followers_count', 'following_count', 'likes_given_count');
+
+-- ========================================
+-- 3. TETİKLEYİCİLER
+-- ========================================
+
+CREATE OR REPLACE FUNCTION count_likes()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    UPDATE posts SET likes_count = likes_count + 1 WHERE id = NEW.post_id;
+    UPDATE profiles SET likes_given_count = likes_given_count + 1 WHERE id = NEW.user_id;
+  ELSE
+    UPDATE posts SET likes_count = likes_count - 1 WHERE id = OLD.post_id;
+    UPDATE profiles SET likes_given_count = likes_given_count - 1 WHERE id = OLD.user_id;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS likes_counters ON likes;
+CREATE TRIGGER likes_counters
+  AFTER INSERT OR DELETE ON likes
+  FOR EACH ROW EXECUTE FUNCTION count_likes();
+
+CREATE OR REPLACE FUNCTION count_post_saves()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    UPDATE posts SET saves_count = saves_count + 1 WHERE id = NEW.post_id;
+  ELSE
+    UPDATE posts SET saves_count = saves_count - 1 WHERE id = OLD.post_id;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS post_saves_counters ON post_saves;
+CREATE TRIGGER post_saves_counters
+  AFTER INSERT OR DELETE ON post_saves
+  FOR EACH ROW EXECUTE FUNCTION count_post_saves();
+
+CREATE OR REPLACE FUNCTION count_comment_likes()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    UPDATE comments SET likes_count = likes_count + 1 WHERE id = NEW.comment_id;
+  ELSE
+    UPDATE comments SET likes_count = likes_count - 1 WHERE id = OLD.comment_id;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS comment_likes_counters ON comment_likes;
+CREATE TRIGGER comment_likes_counters
+  AFTER INSERT OR DELETE ON comment_likes
+  FOR EACH ROW EXECUTE FUNCTION count_comment_likes();
+
+-- Silinmiş (deleted_at dolu) yorumlar ve gönderiler sayılmaz.
+CREATE OR REPLACE FUNCTION count_comments()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  IF TG_OP IN ('DELETE', 'UPDATE') AND OLD.deleted_at IS NULL THEN
+    UPDATE posts SET comments_count = comments_count - 1 WHERE id = OLD.post_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+    UPDATE posts SET comments_count = comments_count + 1 WHERE id = NEW.post_id;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS comments_counters ON comments;
+CREATE TRIGGER comments_counters
+  AFTER INSERT OR DELETE ON comments
+  FOR EACH ROW EXECUTE FUNCTION count_comments();
+
+DROP TRIGGER IF EXISTS comments_counters_soft_delete ON comments;
+CREATE TRIGGER comments_counters_soft_delete
+  AFTER UPDATE OF deleted_at ON comments
+  FOR EACH ROW
+  WHEN ((OLD.deleted_at IS NULL) <> (NEW.deleted_at IS NULL))
+  EXECUTE FUNCTION count_comments();
+
+CREATE OR REPLACE FUNCTION count_posts()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  IF TG_OP IN ('DELETE', 'UPDATE') AND OLD.deleted_at IS NULL THEN
+    UPDATE profiles SET posts_count = posts_count - 1 WHERE id = OLD.user_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+    UPDATE profiles SET posts_count = posts_count + 1 WHERE id = NEW.user_id;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS posts_counters ON posts;
+CREATE TRIGGER posts_counters
+  AFTER INSERT OR DELETE ON posts
+  FOR EACH ROW EXECUTE FUNCTION count_posts();
+
+DROP TRIGGER IF EXISTS posts_counters_soft_delete ON posts;
+CREATE TRIGGER posts_counters_soft_delete
+  AFTER UPDATE OF deleted_at ON posts
+  FOR EACH ROW
+  WHEN ((OLD.deleted_at IS NULL) <> (NEW.deleted_at IS NULL))
+  EXECUTE FUNCTION count_posts();
+
+-- İki profil tek UPDATE ile: satırlar id index'i sırasıyla kilitlenir.
+CREATE OR REPLACE FUNCTION count_follows()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_row follows;
+  v_delta int;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    v_row := NEW;
+    v_delta := 1;
+  ELSE
+    v_row := OLD;
+    v_delta := -1;
+  END IF;
+  UPDATE profiles
+  SET following_count = following_count + CASE WHEN id = v_row.follower_id THEN v_delta ELSE 0 END,
+      followers_count = followers_count + CASE WHEN id = v_row.following_id THEN v_delta ELSE 0 END
+  WHERE id IN (v_row.follower_id, v_row.following_id);
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS follows_counters ON follows;
+CREATE TRIGGER follows_counters
+  AFTER INSERT OR DELETE ON follows
+  FOR EACH ROW EXECUTE FUNCTION count_follows();
+
+-- Yalnızca status = 'going' olan katılımcılar sayılır.
+CREATE OR REPLACE FUNCTION count_event_participants()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  IF TG_OP IN ('DELETE', 'UPDATE') AND OLD.status = 'going' THEN
+    UPDATE events SET participants_count = participants_count - 1 WHERE id = OLD.event_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'going' THEN
+    UPDATE events SET participants_count = participants_count + 1 WHERE id = NEW.event_id;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS event_participants_counters ON event_participants;
+CREATE TRIGGER event_participants_counters
+  AFTER INSERT OR DELETE ON event_participants
+  FOR EACH ROW EXECUTE FUNCTION count_event_participants();
+
+DROP TRIGGER IF EXISTS event_participants_counters_status ON event_participants;
+CREATE TRIGGER event_participants_counters_status
+  AFTER UPDATE OF status ON event_participants
+  FOR EACH ROW
+  WHEN (OLD.status IS DISTINCT FROM NEW.status)
+  EXECUTE FUNCTION count_event_participants();
+
+-- ========================================
+-- 4. UZLAŞTIRMA (RECONCILIATION)
+-- ========================================
+
+-- p_target.p_counter'ı, p_source'ta p_key = p_target.id olan ve p_filter'a
+-- uyan satırların sayısıyla karşılaştırır; farklı olanları düzeltir ve
+-- düzeltilen satır sayısını döndürür.  Farklar önce toplu bulunur, sonra
+-- her satır kilitlenip yeni bir snapshot ile yeniden sayılır (READ
+-- COMMITTED): kilidi tutan tetikleyicinin artışı yeni sayıda görünür.
+-- p_bulk ile farklar tek bir UPDATE ... FROM (GROUP BY) ile düzeltilir:
+-- ilk doldurma gibi hemen her satırın kaydığı, eşzamanlı yazmanın olmadığı
+-- durumlar için.
+CREATE OR REPLACE FUNCTION reconcile_counter(
+  p_target text,
+  p_counter text,
+  p_source text,
+  p_key text,
+  p_filter text DEFAULT 'true',
+  p_bulk boolean DEFAULT false
+)
+RETURNS bigint
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_id uuid;
+  v_fixed bigint := 0;
+  v_rows bigint;
+BEGIN
+  IF p_bulk THEN
+    EXECUTE format(
+      'UPDATE %1$I t SET %5$I = d.total
+       FROM (
+         SELECT t2.id, COALESCE(actual.total, 0) AS total
+         FROM %1$I t2
+         LEFT JOIN (SELECT s.%3$I AS id, count(*) AS total FROM %2$I s WHERE %4$s GROUP BY s.%3$I) actual
+           ON actual.id = t2.id
+       ) d
+       WHERE t.id = d.id AND t.%5$I <> d.total',
+      p_target, p_source, p_key, p_filter, p_counter
+    );
+    GET DIAGNOSTICS v_fixed = ROW_COUNT;
+    RETURN v_fixed;
+  END IF;
+
+  FOR v_id IN EXECUTE format(
+    'SELECT t.id FROM %1$I t
+     LEFT JOIN (SELECT s.%3$I AS id, count(*) AS total FROM %2$I s WHERE %4$s GROUP BY s.%3$I) actual
+       ON actual.id = t.id
+     WHERE t.%5$I <> COALESCE(actual.total, 0)',
+    p_target, p_source, p_key, p_filter, p_counter
+  )
+  LOOP
+    EXECUTE format('SELECT 1 FROM %I WHERE id = $1 FOR UPDATE', p_target) USING v_id;
+    EXECUTE format(
+      'UPDATE %1$I t SET %2$I = c.total
+       FROM (SELECT count(*) AS total FROM %3$I s WHERE s.%4$I = $1 AND (%5$s)) c
+       WHERE t.id = $1 AND t.%2$I <> c.total',
+      p_target, p_counter, p_source, p_key, p_filter
+    ) USING v_id;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    v_fixed := v_fixed + v_rows;
+  END LOOP;
+  RETURN v_fixed;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION reconcile_counters(p_bulk boolean DEFAULT false)
+RETURNS TABLE (counter text, fixed bigint)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  RETURN QUERY VALUES
+    ('posts.likes_count',
+      reconcile_counter('posts', 'likes_count', 'likes', 'post_id', 'true', p_bulk)),
+    ('posts.comments_count',
+      reconcile_counter('posts', 'comments_count', 'comments', 'post_id', 's.deleted_at IS NULL', p_bulk)),
+    ('posts.saves_count',
+      reconcile_counter('posts', 'saves_count', 'post_saves', 'post_id', 'true', p_bulk)),
+    ('comments.likes_count',
+      reconcile_counter('comments', 'likes_count', 'comment_likes', 'comment_id', 'true', p_bulk)),
+    ('events.participants_count',
+      reconcile_counter(
+        'events', 'participants_count', 'event_participants', 'event_id', 's.status = ''going''', p_bulk
+      )),
+    ('profiles.posts_count',
+      reconcile_counter('profiles', 'posts_count', 'posts', 'user_id', 's.deleted_at IS NULL', p_bulk)),
+    ('profiles.followers_count',
+      reconcile_counter('profiles', 'followers_count', 'follows', 'following_id', 'true', p_bulk)),
+    ('profiles.following_count',
+      reconcile_counter('profiles', 'following_count', 'follows', 'follower_id', 'true', p_bulk)),
+    ('profiles.likes_given_count',
+      reconcile_counter('profiles', 'likes_given_count', 'likes', 'user_id', 'true', p_bulk));
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION reconcile_counter(text, text, text, text, text, boolean) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION reconcile_counters(boolean) FROM PUBLIC, anon, authenticated;
+
+-- Mevcut satırlar için ilk doldurma (toplu mod)
+SELECT * FROM reconcile_counters(true);
+
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+    PERFORM cron.schedule('reconcile-counters', '17 4 * * *', 'SELECT * FROM public.reconcile_counters()');
+  END IF;
+END $$;
+
+-- ========================================
+-- 5. GET_FEED SAYILARI KOLONLARDAN OKUR
+-- ========================================
+
+CREATE OR REPLACE FUNCTION get_feed(
+  p_viewer uuid,
+  p_cursor timestamptz DEFAULT NULL,
+  p_limit int DEFAULT 50
+)
+RETURNS TABLE (
+  id uuid,
+  user_id uuid,
+  content text,
+  media_urls jsonb,
+  media_type text,
+  hashtags text[],
+  location text,
+  visibility text,
+  created_at timestamptz,
+  updated_at timestamptz,
+  profiles jsonb,
+  likes_count bigint,
+  comments_count bigint,
+  is_liked boolean,
+  is_saved boolean
+)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+  SELECT
+    p.id,
+    p.user_id,
+    p.content,
+    p.media_urls,
+    p.media_type,
+    p.hashtags,
+    p.location,
+    p.visibility,
+    p.created_at,
+    p.updated_at,
+    jsonb_build_object('username', pr.username, 'avatar_url', pr.avatar_url),
+    p.likes_count::bigint,
+    p.comments_count::bigint,
+    EXISTS (SELECT 1 FROM public.likes l WHERE l.post_id = p.id AND l.user_id = p_viewer),
+    EXISTS (SELECT 1 FROM public.post_saves s WHERE s.post_id = p.id AND s.user_id = p_viewer)
+  FROM public.posts p
+  LEFT JOIN public.profiles pr ON pr.id = p.user_id
+  WHERE p.deleted_at IS NULL
+    AND (p_cursor IS NULL OR p.created_at < p_cursor)
+  ORDER BY p.created_at DESC
+  LIMIT LEAST(GREATEST(COALESCE(p_limit, 50), 1), 100);
+$$;
@@ -0,0 +1,86 @@
+/*
+  # Ana Sayfa Akışı: (created_at, id) İmleciyle Sayfalama
+
+  ## Sorun
+  - Ana sayfa en yeni 50 gönderiyle sınırlı; daha eskiler yüklenemiyor ve her
+    yenileme 50 gönderinin hepsini yeniden indiriyor
+  - get_feed'in p_cursor'ı yalnızca created_at idi: aynı anda oluşturulmuş
+    gönderiler sayfa sınırında atlanabilir ya da tekrar gelebilirdi
+
+  ## Değişiklikler
+  - get_feed(p_viewer, p_cursor_created_at, p_cursor_id, p_limit): bir önceki
+    sayfanın son gönderisinin (created_at, id) değerinden sonrakileri getirir;
+    ilk sayfa için imleç NULL bırakılır
+  - Sıralama (created_at DESC, id DESC): her gönderi tek bir yerde durur
+  - p_limit varsayılanı 20, üst sınırı 100
+  - idx_posts_feed: (created_at DESC, id DESC) WHERE deleted_at IS NULL
+    kısmi index'i. İmleç koşulu bir satır karşılaştırması olduğundan index'te
+    doğrudan imlecin yerinden başlanır: OFFSET taraması yok, 100. sayfa ilk
+    sayfa kadar ucuz
+
+  ## Notlar
+  - NULL imleç 'infinity' ve en büyük uuid'e çevrilir; "p_cursor IS NULL OR"
+    koşulu index aralığını bozacağı için kullanılmaz
+*/
+
+DROP FUNCTION IF EXISTS get_feed(uuid, timestamptz, int);
+
+CREATE INDEX IF NOT EXISTS idx_posts_feed
+  ON posts (created_at DESC, id DESC)
+  WHERE deleted_at IS NULL;
+
+CREATE OR REPLACE FUNCTION get_feed(
+  p_viewer uuid,
+  p_cursor_created_at timestamptz DEFAULT NULL,
+  p_cursor_id uuid DEFAULT NULL,
+  p_limit int DEFAULT 20
+)
+RETURNS TABLE (
+  id uuid,
+  user_id uuid,
+  content text,
+  media_urls jsonb,
+  media_type text,
+  hashtags text[],
+  location text,
+  visibility text,
+  created_at timestamptz,
+  updated_at timestamptz,
+  profiles jsonb,
+  likes_count bigint,
+  comments_count bigint,
+  is_liked boolean,
+  is_saved boolean
+)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+  SELECT
+    p.id,
+    p.user_id,
+    p.content,
+    p.media_urls,
+    p.media_type,
+    p.hashtags,
+    p.location,
+    p.visibility,
+    p.created_at,
+    p.updated_at,
+    jsonb_build_object('username', pr.username, 'avatar_url', pr.avatar_url),
+    p.likes_count::bigint,
+    p.comments_count::bigint,
+    EXISTS (SELECT 1 FROM public.likes l WHERE l.post_id = p.id AND l.user_id = p_viewer),
+    EXISTS (SELECT 1 FROM public.post_saves s WHERE s.post_id = p.id AND s.user_id = p_viewer)
+  FROM public.posts p
+  LEFT JOIN public.profiles pr ON pr.id = p.user_id
+  WHERE p.deleted_at IS NULL
+    AND (p.created_at, p.id) < (
+      COALESCE(p_cursor_created_at, 'infinity'::timestamptz),
+      COALESCE(p_cursor_id, 'ffffffff-ffff-ffff-ffff-ffffffffffff'::uuid)
+    )
+  ORDER BY p.created_at DESC, p.id DESC
+  LIMIT LEAST(GREATEST(COALESCE(p_limit, 20), 1), 100);
+$$;
+
+GRANT EXECUTE ON FUNCTION get_feed(uuid, timestamptz, uuid, int) TO anon, authenticated;
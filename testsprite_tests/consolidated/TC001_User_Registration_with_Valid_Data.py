@@ -0,0 +1,39 @@
+"""TC001 User Registration with Valid Data.
+
+Generated by ``python -m testsprite_tests.harness.consolidate`` from
+testsprite_frontend_test_plan.json and these TC files; do not edit:
+
+* ``TC001_User_Registration_with_Valid_Data`` (default)
+"""
+
+import asyncio
+from playwright import async_api
+
+from testsprite_tests.harness.steps import Step, run_steps
+
+PLAN_ID = 'TC001'
+DEFAULT = 'TC001_User_Registration_with_Valid_Data'
+# Cleared by the harness when the test starts from the saved session, so it is only
+# set when every variant logs in first.
+LOGIN = False
+VARIANTS = {
+    'TC001_User_Registration_with_Valid_Data': (
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/button', label='Click the button to go to the registration page.'),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input', value='mehdimirzafarukparmaksiz@gmail.com', label='Fill the registration form with valid email, username, full name, and password.'),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input[2]', value='mehdimirzafarukparmaksiz', label='Fill the registration form with valid email, username, full name, and password.'),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input[3]', value='Mehdi Mirzafaruk Parmaksiz', label='Fill the registration form with valid email, username, full name, and password.'),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input[4]', value='92Mirza1', label='Fill the registration form with valid email, username, full name, and password.'),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/div', label="Click the 'Kayıt Ol' button to submit the registration form."),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input[2]', value='mehdimirzafarukparmaksiz1', label='Try to submit the registration form again to confirm behavior or try a different username/email to rule out duplicates.'),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/div', label='Try to submit the registration form again to confirm behavior or try a different username/email to rule out duplicates.'),
+        Step('expect', target='text=Registration Successful! Welcome aboard', value='Test case failed: The registration did not complete successfully, and the user was not prompted to verify email or redirected to login as expected.', label='Assertions to verify final state', timeout=30000),
+    ),
+}
+
+
+async def run_test(variant=None):
+    for name in VARIANTS if variant is None else (variant,):
+        await run_steps(async_api, VARIANTS[name], login=LOGIN, clock=globals().get("_step_clock"))
+
+
+asyncio.run(run_test())
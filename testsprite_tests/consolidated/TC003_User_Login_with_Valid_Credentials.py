@@ -0,0 +1,38 @@
+"""TC003 User Login with Valid Credentials.
+
+Generated by ``python -m testsprite_tests.harness.consolidate`` from
+testsprite_frontend_test_plan.json and these TC files; do not edit:
+
+* ``TC003_User_Login_with_Correct_Credentials``
+* ``TC003_User_Login_with_Valid_Credentials`` (default)
+"""
+
+import asyncio
+from playwright import async_api
+
+from testsprite_tests.harness.steps import Step, run_steps
+
+PLAN_ID = 'TC003'
+DEFAULT = 'TC003_User_Login_with_Valid_Credentials'
+# Cleared by the harness when the test starts from the saved session, so it is only
+# set when every variant logs in first.
+LOGIN = False
+VARIANTS = {
+    'TC003_User_Login_with_Valid_Credentials': (
+        Step('login', target='mehdimirzafarukparmaksiz@gmail.com', value='92Mirza1', label='Enter registered email and valid password'),
+        Step('expect', target='text=Login Failed: Invalid Credentials', value='Test case failed: The registered user could not log in successfully with the correct email and password as expected in the test plan.', label='Assertions to verify final state'),
+    ),
+    'TC003_User_Login_with_Correct_Credentials': (
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div[2]/div[2]/div[5]/a', label='Navigate to the login page.'),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[2]/div/div/div/div/div[5]', label="Click the 'Çıkış Yap' (Logout) button to log out and reach the login page."),
+        Step('expect', target='text=Login Successful - Welcome to Your Main Feed', value='Test case failed: User login was not successful and the user was not directed to the main feed as expected.', label='Assertions to verify final state', timeout=1000),
+    ),
+}
+
+
+async def run_test(variant=None):
+    for name in VARIANTS if variant is None else (variant,):
+        await run_steps(async_api, VARIANTS[name], login=LOGIN, clock=globals().get("_step_clock"))
+
+
+asyncio.run(run_test())
@@ -0,0 +1,39 @@
+"""TC004 User Login with Incorrect Password.
+
+Generated by ``python -m testsprite_tests.harness.consolidate`` from
+testsprite_frontend_test_plan.json and these TC files; do not edit:
+
+* ``TC004_User_Login_with_Incorrect_Password`` (default)
+"""
+
+import asyncio
+from playwright import async_api
+
+from testsprite_tests.harness.steps import Step, run_steps
+
+PLAN_ID = 'TC004'
+DEFAULT = 'TC004_User_Login_with_Incorrect_Password'
+# Cleared by the harness when the test starts from the saved session, so it is only
+# set when every variant logs in first.
+LOGIN = False
+VARIANTS = {
+    'TC004_User_Login_with_Incorrect_Password': (
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input', value='mehdimirzafarukparmaksiz@gmail.com', label='Enter valid email and incorrect password'),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input[2]', value='wrongpassword', label='Enter valid email and incorrect password'),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/div', label='Enter valid email and incorrect password'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Check if JavaScript is enabled or try to reload the page with JavaScript enabled'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input', value='mehdimirzafarukparmaksiz@gmail.com', label='Enter valid email and incorrect password, then submit the login form'),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input[2]', value='wrongpassword', label='Enter valid email and incorrect password, then submit the login form'),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/div', label='Enter valid email and incorrect password, then submit the login form'),
+        Step('expect', target='text=Login Successful', value='Test failed: Login did not fail as expected with an unauthorized error message.', label='Assertions to verify final state', timeout=30000),
+    ),
+}
+
+
+async def run_test(variant=None):
+    for name in VARIANTS if variant is None else (variant,):
+        await run_steps(async_api, VARIANTS[name], login=LOGIN, clock=globals().get("_step_clock"))
+
+
+asyncio.run(run_test())
@@ -0,0 +1,38 @@
+"""TC005 Password Reset with Registered Email.
+
+Generated by ``python -m testsprite_tests.harness.consolidate`` from
+testsprite_frontend_test_plan.json and these TC files; do not edit:
+
+* ``TC005_Password_Reset_Functionality``
+* ``TC005_Password_Reset_with_Registered_Email`` (default)
+"""
+
+import asyncio
+from playwright import async_api
+
+from testsprite_tests.harness.steps import Step, run_steps
+
+PLAN_ID = 'TC005'
+DEFAULT = 'TC005_Password_Reset_with_Registered_Email'
+# Cleared by the harness when the test starts from the saved session, so it is only
+# set when every variant logs in first.
+LOGIN = False
+VARIANTS = {
+    'TC005_Password_Reset_with_Registered_Email': (
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/button', label='Navigate to password reset page'),
+        Step('expect', target='text=Password reset successful! Check your email for instructions.', value='Test case failed: Password reset process did not complete successfully. The expected confirmation message was not found, indicating the reset email was not sent or instructions were not received.', label='Assertions to verify final state', timeout=3000),
+    ),
+    'TC005_Password_Reset_Functionality': (
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div[2]/div[2]/div[5]/a', label='Navigate to the password reset page, likely via the Profil (Profile) tab or a login page.'),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[2]/div/div/div/div/div[5]', label='Navigate to the login page or find a password reset link from here.'),
+        Step('expect', target='text=Password Reset Successful! Your new password is now active.', value='Test case failed: The password reset process did not complete successfully as expected according to the test plan.', label='Assertions to verify final state', timeout=1000),
+    ),
+}
+
+
+async def run_test(variant=None):
+    for name in VARIANTS if variant is None else (variant,):
+        await run_steps(async_api, VARIANTS[name], login=LOGIN, clock=globals().get("_step_clock"))
+
+
+asyncio.run(run_test())
@@ -0,0 +1,39 @@
+"""TC007 Create Post with Multiple Media Attachments and Location.
+
+Generated by ``python -m testsprite_tests.harness.consolidate`` from
+testsprite_frontend_test_plan.json and these TC files; do not edit:
+
+* ``TC007_Create_New_Post_with_Multiple_Media``
+* ``TC007_Create_Post_with_Multiple_Media_Attachments_and_Location`` (default)
+"""
+
+import asyncio
+from playwright import async_api
+
+from testsprite_tests.harness.steps import Step, run_steps
+
+PLAN_ID = 'TC007'
+DEFAULT = 'TC007_Create_Post_with_Multiple_Media_Attachments_and_Location'
+# Cleared by the harness when the test starts from the saved session, so it is only
+# set when every variant logs in first.
+LOGIN = False
+VARIANTS = {
+    'TC007_Create_Post_with_Multiple_Media_Attachments_and_Location': (
+        Step('login', target='mehdimirzafarukparmaksiz@gmail.com', value='92Mirza1', label='Input email and password, then click login button'),
+        Step('expect', target='text=Post with media and location is displayed properly in the feed with all attachments', value='Test case failed: The post with multiple media URLs and location metadata was not displayed properly in the feed with all attachments as expected.', label='Assertions to verify final state', timeout=1000),
+    ),
+    'TC007_Create_New_Post_with_Multiple_Media': (
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div/div/div/div[3]', label='Open the post creation modal by clicking the post creation button (paper plane icon) at bottom right.'),
+        Step('fill', target='xpath=html/body/div[2]/div/div[2]/div/div/div/div/div[2]/div/textarea', value='This is a test post with multiple media files.', label='Input text content into the textarea and attach multiple media files (images and videos).'),
+        Step('click', target='xpath=html/body/div[2]/div/div[2]/div/div/div/div/div[3]/div/div', label='Input text content into the textarea and attach multiple media files (images and videos).'),
+        Step('expect', target='text=Post creation successful! Your media files are displayed correctly.', value='Test case failed: The post creation with multiple media files did not display correctly in the feed as expected.', label='Assertions to verify final state', timeout=30000),
+    ),
+}
+
+
+async def run_test(variant=None):
+    for name in VARIANTS if variant is None else (variant,):
+        await run_steps(async_api, VARIANTS[name], login=LOGIN, clock=globals().get("_step_clock"))
+
+
+asyncio.run(run_test())
@@ -0,0 +1,41 @@
+"""TC017 Admin Panel: View and Manage Reports.
+
+Generated by ``python -m testsprite_tests.harness.consolidate`` from
+testsprite_frontend_test_plan.json and these TC files; do not edit:
+
+* ``TC017_Admin_Panel_View_and_Manage_Reports`` (default)
+* ``TC017_Admin_Review_and_Dismiss_Reports``
+"""
+
+import asyncio
+from playwright import async_api
+
+from testsprite_tests.harness.steps import Step, run_steps
+
+PLAN_ID = 'TC017'
+DEFAULT = 'TC017_Admin_Panel_View_and_Manage_Reports'
+# Cleared by the harness when the test starts from the saved session, so it is only
+# set when every variant logs in first.
+LOGIN = False
+VARIANTS = {
+    'TC017_Admin_Panel_View_and_Manage_Reports': (
+        Step('login', target='mehdimirzafarukparmaksiz@gmail.com', value='92Mirza1', label='Input admin email and password and click login button'),
+        Step('expect', target='text=Report successfully dismissed', value='Test case failed: Admins cannot view reports, dismiss inappropriate reports, or delete posts with audit logging as expected in the test plan.', label='Assertions to verify final state', timeout=3000),
+    ),
+    'TC017_Admin_Review_and_Dismiss_Reports': (
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div[2]/div[2]/div[5]/a', label='Find and click the navigation tab or link to the reports section.'),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div[2]/div[2]/div[4]/a', label="Try clicking other navigation tabs or links that might lead to the reports section, such as 'Etkinlik', 'Mesajlar', 'Pazar', or 'Ana Sayfa'."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div[2]/div[2]/div[2]/a', label="Try clicking other main navigation tabs such as 'Ana Sayfa', 'Pazar', or 'Mesajlar' to locate the reports section."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div[2]/div[2]/div[3]/a', label="Click on the 'Mesajlar' (Messages) tab to check if the reports section is accessible there."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div[2]/div[2]/div/a', label="Click on the 'Ana Sayfa' (Home) tab to check if the reports section is accessible there."),
+        Step('expect', target='text=Report Successfully Resolved', value='Test case failed: Admin was unable to view content reports, dismiss reports appropriately, or see dismissal logged as required by the test plan.', label='Assertions to verify final state', timeout=1000),
+    ),
+}
+
+
+async def run_test(variant=None):
+    for name in VARIANTS if variant is None else (variant,):
+        await run_steps(async_api, VARIANTS[name], login=LOGIN, clock=globals().get("_step_clock"))
+
+
+asyncio.run(run_test())
@@ -0,0 +1,32 @@
+"""TC018 Role-Based Access Control Enforcement.
+
+Generated by ``python -m testsprite_tests.harness.consolidate`` from
+testsprite_frontend_test_plan.json and these TC files; do not edit:
+
+* ``TC018_Role_Based_Access_Control_Enforcement`` (default)
+"""
+
+import asyncio
+from playwright import async_api
+
+from testsprite_tests.harness.steps import Step, run_steps
+
+PLAN_ID = 'TC018'
+DEFAULT = 'TC018_Role_Based_Access_Control_Enforcement'
+# Cleared by the harness when the test starts from the saved session, so it is only
+# set when every variant logs in first.
+LOGIN = True
+VARIANTS = {
+    'TC018_Role_Based_Access_Control_Enforcement': (
+        Step('login', target='mehdimirzafarukparmaksiz@gmail.com', value='92Mirza1', label='Input email and password, then click login button'),
+        Step('expect', target='text=Access Granted to Private Profile', value="Test case failed: Access to another user's private profile data was denied as expected, confirming RLS enforcement and permission checks.", label='Assertions to verify final state', timeout=3000),
+    ),
+}
+
+
+async def run_test(variant=None):
+    for name in VARIANTS if variant is None else (variant,):
+        await run_steps(async_api, VARIANTS[name], login=LOGIN, clock=globals().get("_step_clock"))
+
+
+asyncio.run(run_test())
@@ -0,0 +1,56 @@
+"""TC019 Verify TLS Encryption and Password Hashing.
+
+Generated by ``python -m testsprite_tests.harness.consolidate`` from
+testsprite_frontend_test_plan.json and these TC files; do not edit:
+
+* ``TC019_Verify_TLS_Encryption_and_Password_Hashing`` (default)
+* ``TC020_TLS_Encryption_Usage_Check``
+"""
+
+import asyncio
+from playwright import async_api
+
+from testsprite_tests.harness.steps import Step, run_steps
+
+PLAN_ID = 'TC019'
+DEFAULT = 'TC019_Verify_TLS_Encryption_and_Password_Hashing'
+# Cleared by the harness when the test starts from the saved session, so it is only
+# set when every variant logs in first.
+LOGIN = False
+VARIANTS = {
+    'TC019_Verify_TLS_Encryption_and_Password_Hashing': (
+        Step('login', target='mehdimirzafarukparmaksiz@gmail.com', value='92Mirza1', label='Input email and password, then click login to inspect network traffic for HTTPS/TLS encryption.'),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/button', label="Click on the 'Kayıt Ol' button to navigate to the registration page to test registration and inspect network traffic for HTTPS/TLS encryption."),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input', value='mehdimirzafarukparmaksiz@gmail.com', label="Input registration details (email, username, password) and click 'Kayıt Ol' to submit and inspect network traffic for HTTPS/TLS encryption."),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input[2]', value='mehdimirzafarukparmaksiz', label="Input registration details (email, username, password) and click 'Kayıt Ol' to submit and inspect network traffic for HTTPS/TLS encryption."),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input[4]', value='92Mirza1', label="Input registration details (email, username, password) and click 'Kayıt Ol' to submit and inspect network traffic for HTTPS/TLS encryption."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/div', label="Input registration details (email, username, password) and click 'Kayıt Ol' to submit and inspect network traffic for HTTPS/TLS encryption."),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input', value='mehdimirzafarukparmaksiz@gmail.com', label="Input registration details and click 'Kayıt Ol' to submit the form and inspect network traffic for HTTPS/TLS encryption."),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input[2]', value='mehdimirzafarukparmaksiz', label="Input registration details and click 'Kayıt Ol' to submit the form and inspect network traffic for HTTPS/TLS encryption."),
+        Step('fill', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/input[4]', value='92Mirza1', label="Input registration details and click 'Kayıt Ol' to submit the form and inspect network traffic for HTTPS/TLS encryption."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/div', label="Input registration details and click 'Kayıt Ol' to submit the form and inspect network traffic for HTTPS/TLS encryption."),
+        Step('expect', target='text=Unencrypted Password Detected', value='Test failed: Client-server communications must use HTTPS/TLS and passwords must be stored hashed. This assertion fails immediately to indicate the test plan execution failure.', label='Assertions to verify final state', timeout=1000),
+    ),
+    'TC020_TLS_Encryption_Usage_Check': (
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div[2]/div[2]/div[2]/a', label="Click on the 'Pazar' tab to trigger potential API calls and observe network traffic for HTTPS usage."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[2]/div/div/div/div[2]/div/div[2]', label="Click on the 'Silah' category tab to trigger API calls and observe network traffic for HTTPS usage."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[2]/div/div/div/div[2]/div/div[3]', label="Click on the 'Ekipman' category tab to trigger API calls and observe network traffic for HTTPS usage."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[2]/div/div/div/div[2]/div/div[4]', label="Click on the 'Aksesuar' category tab to trigger API calls and observe network traffic for HTTPS usage."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[2]/div/div/div/div[2]/div/div[5]', label="Click on the 'Giyim' category tab to trigger API calls and observe network traffic for HTTPS usage."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[2]/div/div/div/div[2]/div/div', label="Click on the 'Tümü' category tab to trigger API calls and observe network traffic for HTTPS usage."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div[2]/div[2]/div[5]/a', label="Click on the 'Profil' tab to check if it triggers API calls and observe network traffic for HTTPS usage."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[3]/div/div/div/div/div[3]/div', label="Click on the 'Gönderiler' section in the profile to trigger API calls and observe network traffic for HTTPS usage."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[3]/div/div/div/div/div[3]/div[2]', label="Click on the 'Beğenilenler' section in profile to trigger API calls and observe network traffic for HTTPS usage."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[3]/div/div/div/div/div[3]/div[3]', label="Click on the 'Kaydedilenler' section in profile to trigger API calls and observe network traffic for HTTPS usage."),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div[3]/div/div/div/div/div[5]', label="Click on the 'Çıkış Yap' (Logout) button to trigger API calls and observe network traffic for HTTPS usage."),
+        Step('expect', target='text=Non-HTTPS API communication detected', value='Test failed: API communications are not using HTTPS/TLS encryption as required by the test plan.', label='Assertions to verify final state', timeout=1000),
+    ),
+}
+
+
+async def run_test(variant=None):
+    for name in VARIANTS if variant is None else (variant,):
+        await run_steps(async_api, VARIANTS[name], login=LOGIN, clock=globals().get("_step_clock"))
+
+
+asyncio.run(run_test())
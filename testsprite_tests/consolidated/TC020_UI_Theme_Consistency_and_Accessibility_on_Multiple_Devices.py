@@ -0,0 +1,72 @@
+"""TC020 UI Theme Consistency and Accessibility on Multiple Devices.
+
+Generated by ``python -m testsprite_tests.harness.consolidate`` from
+testsprite_frontend_test_plan.json and these TC files; do not edit:
+
+* ``TC020_UI_Theme_Consistency_and_Accessibility_on_Multiple_Devices`` (default)
+* ``TC022_Theme_Consistency_Across_Devices``
+"""
+
+import asyncio
+from playwright import async_api
+
+from testsprite_tests.harness.steps import Step, run_steps
+
+PLAN_ID = 'TC020'
+DEFAULT = 'TC020_UI_Theme_Consistency_and_Accessibility_on_Multiple_Devices'
+# Cleared by the harness when the test starts from the saved session, so it is only
+# set when every variant logs in first.
+LOGIN = False
+VARIANTS = {
+    'TC020_UI_Theme_Consistency_and_Accessibility_on_Multiple_Devices': (
+        Step('scroll', label='Test the theme on a smaller screen size (mobile) to verify consistency and accessibility.'),
+        Step('goto', target='http://localhost:8081', label='Test the theme on a smaller screen size (mobile) to verify consistency and accessibility.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/button', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('click', target='xpath=html/body/div/div/div/div[2]/div/div/div/div/div/div[2]/button', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('goto', target='http://localhost:8081/auth/login', label='Simulate or switch to a smaller screen size (mobile) to verify theme consistency and accessibility on smaller devices.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('expect', target='text=Theme Consistency Verified', value='Test plan failed: The red-black military style theme with high contrast is not consistent and accessible across devices and screen sizes as required.', label='Assertions to verify final state', timeout=1000),
+    ),
+    'TC022_Theme_Consistency_Across_Devices': (
+        Step('goto', target='http://localhost:8081/', label='Simulate a phone screen size and verify the theme consistency and UI element appearance.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('goto', target='http://localhost:8081/', label='Simulate a tablet screen size and verify the theme consistency and UI element appearance.'),
+        Step('pause', value='3', label='asyncio.sleep(3)'),
+        Step('expect', target='text=Airsoft Vibe', label='Assertions to verify final state', timeout=30000),
+        Step('expect', target='text=Henüz gönderi yok', label='Assertions to verify final state', timeout=30000),
+        Step('expect', target='text=Ana Sayfa', label='Assertions to verify final state', timeout=30000),
+        Step('expect', target='text=Pazar', label='Assertions to verify final state', timeout=30000),
+        Step('expect', target='text=Mesajlar', label='Assertions to verify final state', timeout=30000),
+        Step('expect', target='text=Etkinlik', label='Assertions to verify final state', timeout=30000),
+        Step('expect', target='text=Profil', label='Assertions to verify final state', timeout=30000),
+    ),
+}
+
+
+async def run_test(variant=None):
+    for name in VARIANTS if variant is None else (variant,):
+        await run_steps(async_api, VARIANTS[name], login=LOGIN, clock=globals().get("_step_clock"))
+
+
+asyncio.run(run_test())
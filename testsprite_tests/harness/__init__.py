@@ -0,0 +1,7 @@
+"""Execution harness for the generated TestSprite Playwright tests.
+
+The TC files stay exactly as TestSprite generates them; the harness loads
+them through :mod:`.adapter` and runs their ``run_test`` bodies against a
+shared browser from :mod:`.pool`.  Run it with
+``python -m testsprite_tests.harness`` from the repository root.
+"""
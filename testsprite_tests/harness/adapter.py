@@ -0,0 +1,76 @@
+"""Load the generated TC files without executing them on import.
+
+Every generated file ends with a module level ``asyncio.run(run_test())``,
+so a plain ``import`` would start the test (and its own browser).  The
+adapter parses the source, drops that call, optionally rewrites the tree with
+``transforms`` and compiles what is left.  ``run_test`` itself is executed
+unchanged; only the ``async_api`` global it resolves at call time is swapped
+for whatever the caller provides (see :mod:`.pool`).
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import CodeType
+from typing import Any, Callable
+
+Transform = Callable[[ast.Module], ast.Module]
+
+_TEST_ID = re.compile(r"^(TC\d+)_(.+)$")
+
+
+@dataclass
+class TestCase:
+    path: Path
+    test_id: str
+    title: str
+    code: CodeType
+    namespace: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def name(self) -> str:
+        return self.path.stem
+
+    def bind(self, **globals_: Any) -> Callable[[], Any]:
+        """Execute the module body and return ``run_test`` with ``globals_`` patched in."""
+        self.namespace = {"__name__": f"testsprite.{self.name}", "__file__": str(self.path)}
+        exec(self.code, self.namespace)
+        self.namespace.update(globals_)
+        return self.namespace["run_test"]
+
+
+def _is_entrypoint(node: ast.stmt) -> bool:
+    """Match the trailing ``asyncio.run(run_test())`` statement."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def parse_test(path: Path) -> ast.Module:
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    tree.body = [node for node in tree.body if not _is_entrypoint(node)]
+    return tree
+
+
+def load_test(path: Path, transforms: tuple[Transform, ...] = ()) -> TestCase:
+    tree = parse_test(path)
+    for transform in transforms:
+        tree = transform(tree)
+    ast.fix_missing_locations(tree)
+    match = _TEST_ID.match(path.stem)
+    test_id, title = (match.group(1), match.group(2)) if match else (path.stem, path.stem)
+    return TestCase(
+        path=path,
+        test_id=test_id,
+        title=title.replace("_", " "),
+        code=compile(tree, str(path), "exec"),
+    )
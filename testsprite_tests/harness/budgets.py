@@ -0,0 +1,203 @@
+"""Per-screen request budgets: catch N+1 query patterns before they ship.
+
+``fetchPosts`` in ``app/(tabs)/index.tsx`` used to issue four follow-up
+queries per post (like count, comment count, liked?, saved?), so one feed
+load of 50 posts cost ~201 round trips until ``get_feed`` returned them in
+one.  ``events.tsx`` and ``CommentsModal.tsx`` read their counts from
+columns since migration ``011`` and look up whether the viewer joined or
+liked the listed rows with one ``.in()`` filter.  This suite opens each screen listed in
+``request_budgets.json`` from the shared logged-in session, counts the
+requests it sends to the Supabase REST API, and fails the screen when the
+total or the number of requests with the same *shape* exceeds its budget.
+
+A shape is the method, table and query with filter values blanked out::
+
+    HEAD /rest/v1/likes?post_id=eq.?&select=*
+
+so the fifty ``likes`` count queries of the feed collapse into one line of
+the report instead of fifty.  Usage (from the repository root)::
+
+    python -m testsprite_tests.harness.budgets [SCREEN ...] [--standin] [--headed]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+from playwright import async_api
+
+from .config import REQUEST_BUDGETS_PATH, HarnessConfig, load_config
+from .pool import BrowserPool
+from .session import AuthSession
+from .standin import StandIn
+from .waits import StepWaits
+
+REST_PATH = "/rest/v1/"
+# Query parameters whose value is part of the shape rather than data.
+SHAPE_PARAMS = {"select", "order", "columns", "on_conflict"}
+# Long enough to cover the gap between a list query and its per-row follow-ups.
+QUIET_MS = 750
+# Shapes listed under a screen that went over budget.
+REPORT_SHAPES = 5
+
+
+@dataclass(frozen=True)
+class ScreenBudget:
+    screen: str
+    path: str
+    max_requests: int
+    max_per_shape: int
+    # ``data-testid`` (React Native ``testID``) to click after the screen loads;
+    # only the requests that click causes are counted.
+    open: str = ""
+
+
+@lru_cache(maxsize=None)
+def load_budgets(path: Path = REQUEST_BUDGETS_PATH) -> tuple[ScreenBudget, ...]:
+    return tuple(ScreenBudget(**item) for item in json.loads(path.read_text(encoding="utf-8")))
+
+
+def query_shape(method: str, url: str) -> str:
+    """``url`` with filter values replaced by ``?`` so repeated queries compare equal.
+
+    PostgREST filters read ``column=operator.value`` (``post_id=eq.<uuid>``);
+    the operator stays, the value goes (except for ``is``, whose argument is
+    one of a few keywords).  ``or=(...)``/``and=(...)`` groups and
+    ``limit``/``offset`` are blanked whole.
+    """
+    parts = urlsplit(url)
+    params = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        if key not in SHAPE_PARAMS:
+            operator, dot, _ = value.partition(".")
+            if operator == "is":
+                pass  # ``is.null`` vs ``is.true`` changes the query, not just its argument
+            elif dot and operator.isalpha() and key not in ("or", "and"):
+                value = f"{operator}.?"
+            else:
+                value = "?"
+        params.append(f"{key}={value}")
+    query = "&".join(sorted(params))
+    return f"{method} {parts.path}" + (f"?{query}" if query else "")
+
+
+@dataclass
+class ScreenResult:
+    budget: ScreenBudget
+    shapes: Counter[str] = field(default_factory=Counter)
+    error: str = ""
+
+    @property
+    def requests(self) -> int:
+        return sum(self.shapes.values())
+
+    @property
+    def repeated(self) -> list[tuple[str, int]]:
+        """Shapes sent more often than ``max_per_shape``, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > self.budget.max_per_shape]
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and self.requests <= self.budget.max_requests and not self.repeated
+
+
+def format_screen(result: ScreenResult) -> str:
+    budget = result.budget
+    status = "ok" if result.ok else "OVER" if not result.error else "ERROR"
+    line = f"{status:<5} {result.requests:4d}/{budget.max_requests:<4d} requests  {budget.screen}"
+    if result.error:
+        return f"{line}: {result.error}"
+    if result.ok:
+        return line
+    shapes = (result.repeated or result.shapes.most_common())[:REPORT_SHAPES]
+    return "\n".join([line] + [f"      {count:4d}x {shape}" for shape, count in shapes])
+
+
+async def measure(
+    pool: BrowserPool, config: HarnessConfig, budget: ScreenBudget, storage_state: Path
+) -> ScreenResult:
+    """Load ``budget.path`` in a fresh logged-in context and count its REST requests."""
+    result = ScreenResult(budget)
+    origin = urlsplit(config.supabase_url)
+    waits = StepWaits(supabase_origin=config.supabase_url, quiet_ms=QUIET_MS, timeout_ms=30_000)
+    counting = not budget.open
+
+    def on_request(request: async_api.Request) -> None:
+        url = urlsplit(request.url)
+        if counting and url.netloc == origin.netloc and url.path.startswith(REST_PATH):
+            result.shapes[query_shape(request.method, request.url)] += 1
+
+    context = await pool.new_context(storage_state=str(storage_state))
+    try:
+        page = await context.new_page()
+        waits.attach(page)
+        page.on("request", on_request)
+        await page.goto(config.base_url.rstrip("/") + budget.path, wait_until="domcontentloaded")
+        await waits.settle(page)
+        if budget.open:
+            counting = True
+            await page.get_by_test_id(budget.open).first.click(timeout=waits.timeout_ms)
+            await waits.settle(page)
+    except async_api.Error as exc:
+        result.error = str(exc).splitlines()[0]
+    finally:
+        await context.close()
+    return result
+
+
+async def run_budgets(
+    budgets: list[ScreenBudget], headless: bool = True, standin: bool = False
+) -> list[ScreenResult]:
+    config = load_config()
+    backend = {}
+    stand_in = None
+    if standin:
+        stand_in = StandIn(config)
+        backend = {"grant": stand_in.password_grant, "backend": "standin"}
+    auth = AuthSession(config, mode="api" if config.supabase_anon_key or standin else "ui", **backend)
+    results = []
+    async with BrowserPool(headless=headless) as pool:
+        if stand_in is not None:
+            pool.context_hooks.append(stand_in.attach)
+        storage_state = await auth.storage_state(pool)
+        for budget in budgets:
+            result = await measure(pool, config, budget, storage_state)
+            print(format_screen(result), flush=True)
+            results.append(result)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m testsprite_tests.harness.budgets", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("screens", nargs="*", help="only measure these screens (default: all)")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument(
+        "--standin",
+        action="store_true",
+        help="answer Supabase requests from the seeded in-memory stand-in instead of the network "
+        "(constraints are enforced, row-level security is not)",
+    )
+    args = parser.parse_args(argv)
+    budgets = [b for b in load_budgets() if not args.screens or b.screen in args.screens]
+    if not budgets:
+        print(f"no screen matched; known: {', '.join(b.screen for b in load_budgets())}", file=sys.stderr)
+        return 2
+    results = asyncio.run(run_budgets(budgets, headless=not args.headed, standin=args.standin))
+    over = [r for r in results if not r.ok]
+    print()
+    print(f"{len(results) - len(over)}/{len(results)} screens within their request budget")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Command line entry point.
+
+Usage (from the repository root)::
+
+    python -m testsprite_tests.harness [PATTERN ...] [--workers N] [--headed]
+
+``PATTERN`` filters by file name (``TC008`` or ``TC01*``).  The summary
+compares the browser launches this run paid for with the launches the
+per-file model (one ``chromium.launch`` per TC file) would have needed, and
+the time the steps really waited with the generated fixed sleeps.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+
+from .config import discover_tests
+from .consolidate import discover_consolidated, skipped_variants
+from .har import MODES
+from .impact import changed_files, select_tests
+from .runner import RunOptions, RunReport, format_result, run_suite
+from .shard import run_sharded
+from .store import ResultStore
+from .timing import format_step_table
+
+
+def print_summary(report: RunReport) -> None:
+    total = len(report.results)
+    print()
+    print(f"{total - len(report.failed)}/{total} passed in {report.wall_seconds:.1f}s")
+    print(
+        f"browser launches: {report.launches} (per-file model: {total}), "
+        f"launching took {report.launch_seconds:.2f}s, "
+        f"saved ~{report.launch_seconds_saved:.1f}s"
+    )
+    busy = sum(r.duration for r in report.results)
+    if report.launches > 1:
+        print(f"test time {busy:.1f}s across {report.launches} workers, wall {report.wall_seconds:.1f}s")
+    budget = sum(r.sleep_budget for r in report.results)
+    if budget:
+        waited = sum(r.waited for r in report.results)
+        print(f"step waits: {waited:.1f}s instead of {budget:.0f}s of fixed sleeps, saved {budget - waited:.1f}s")
+    if report.backend_requests:
+        print(
+            f"Supabase stand-in answered {report.backend_requests} requests "
+            f"in {report.backend_seconds * 1000:.0f}ms total"
+        )
+    broken = {flow.name: flow for flow in report.flows if not flow.ok}
+    for flow in broken.values():
+        print(f"prerequisite flow '{flow.name}' failed: {flow.error}")
+    if report.blocked:
+        print(f"{len(report.blocked)} tests blocked without running")
+    for result in report.failed:
+        if result not in report.blocked:
+            print(f"\n{result.name}: {result.error}")
+
+
+def print_step_table(report: RunReport, record: bool) -> None:
+    """p50/p95 per step over the recorded history (just this run with ``--no-record``)."""
+    current: dict[str, list[float]] = {}
+    for result in report.results:
+        for step, seconds in result.steps:
+            current.setdefault(step, []).append(seconds)
+    if not current:
+        return
+    history = current
+    if record:
+        with ResultStore() as store:
+            history = store.step_history()
+    print()
+    print(format_step_table(history, current))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m testsprite_tests.harness", description=__doc__.split("\n\n")[0])
+    parser.add_argument("patterns", nargs="*", help="only run TC files whose name matches")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--fixed-waits", action="store_true", help="keep the generated 3 s sleeps before each step")
+    parser.add_argument(
+        "--auth",
+        choices=("api", "ui", "off"),
+        default="api",
+        help="how to create the shared logged-in session (default: seed it through the Supabase API)",
+    )
+    parser.add_argument(
+        "--no-deps",
+        action="store_true",
+        help="skip the prerequisite flow checks and run every test to completion",
+    )
+    parser.add_argument("--no-record", action="store_true", help="do not append results to the result store")
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="only run the tests whose features the changes since git REF touch (see harness.impact)",
+    )
+    parser.add_argument(
+        "--consolidated",
+        action="store_true",
+        help="run the per-plan tests from consolidated/ instead of every TC variant",
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="time every '# -> ...' step and print p50/p95 per step across recorded runs",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="record a Playwright trace per test and keep it under tmp/traces/ when the test fails",
+    )
+    parser.add_argument(
+        "--reset-db",
+        action="store_true",
+        help="reset the data of the database of SUPABASE_DB_URL from a template, in place, before the run and "
+        "after each data-mutating test (see harness.pg)",
+    )
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument(
+        "--standin",
+        action="store_true",
+        help="answer Supabase requests from the seeded in-memory stand-in instead of the network "
+        "(constraints are enforced, row-level security is not)",
+    )
+    backend.add_argument(
+        "--har",
+        choices=MODES,
+        help="record Supabase traffic per test to tmp/har/ and replay it on later runs "
+        "(re-recorded automatically when supabase/migrations changes)",
+    )
+    parser.add_argument(
+        "-n",
+        "--workers",
+        type=int,
+        default=1,
+        help=f"worker processes, each with its own browser (this machine has {os.cpu_count()} cores)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    paths = discover_consolidated(args.patterns) if args.consolidated else discover_tests(args.patterns)
+    if args.consolidated:
+        print(f"consolidated suite: {len(skipped_variants())} TC variants with identical steps are not run", flush=True)
+    if args.changed_since:
+        total = len(paths)
+        paths, selection = select_tests(paths, changed_files(args.changed_since))
+        print(f"changes since {args.changed_since}: {selection.describe()}; {len(paths)}/{total} tests selected")
+        if not paths:
+            return 0
+    if not paths:
+        print("no TC files matched", file=sys.stderr)
+        return 2
+    if args.reset_db and args.workers > 1:
+        # A reset would pull the data out from under the other workers' tests.
+        print("--reset-db needs a single worker", file=sys.stderr)
+        return 2
+    options = RunOptions(
+        headless=not args.headed,
+        fixed_waits=args.fixed_waits,
+        auth_mode=args.auth,
+        deps=not args.no_deps,
+        record=not args.no_record,
+        standin=args.standin,
+        har=args.har,
+        timing=args.timing,
+        trace=args.trace,
+        reset_db=args.reset_db,
+    )
+    if args.workers > 1:
+        report = run_sharded(paths, args.workers, options)
+        for result in report.results:
+            print(format_result(result))
+    else:
+        report = asyncio.run(run_suite(paths, options))
+    print_summary(report)
+    if args.timing:
+        print_step_table(report, options.record)
+    return 1 if report.failed else 0
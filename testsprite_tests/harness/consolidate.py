@@ -0,0 +1,370 @@
+"""Fold the overlapping TC variants into one test per plan ID.
+
+``testsprite_tests`` holds two generations of generated files whose IDs
+drift apart: ``TC003_..._Correct_Credentials`` and ``TC003_..._Valid_...``
+are the same flow, and so are ``TC013_List_Upcoming_and_Past_Events`` and
+``TC014_List_Upcoming_and_Past_Events``.  Each file launches its own
+browser and logs in on its own, so every duplicated flow is paid twice.
+
+The generator matches every file to the entry of
+``testsprite_frontend_test_plan.json`` whose title it shares the most words
+with, extracts its steps into :class:`.steps.Step` records and writes one
+module per plan ID to ``consolidated/``.  Variants whose steps are
+identical are run once; variants that differ (``TC003_..._Correct_...``
+also logs out, for one) are all kept, and ``run_test()`` runs each of them
+in turn, the one whose title matches the plan (``DEFAULT``) first.
+``run_test(variant=...)`` runs a single one.  Files that match no plan
+entry stay as they are.  ``manifest.json`` records the mapping, and the
+generator estimates how much runtime the dropped duplicates took in
+earlier runs.
+
+Usage (from the repository root)::
+
+    python -m testsprite_tests.harness.consolidate      # (re)generate
+    python -m testsprite_tests.harness --consolidated   # run the result
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .config import CONSOLIDATED_DIR, TESTS_DIR, HarnessConfig, discover_tests, load_config
+from .durations import estimate, load_durations
+from .plan import PlanEntry, load_plan
+from .steps import CLICK, EXPECT, FILL, GOTO, LOGIN, PAUSE, SCROLL, Step
+from .timing import TimeSteps
+
+MANIFEST_PATH = CONSOLIDATED_DIR / "manifest.json"
+# Minimum title overlap (Jaccard over words) for a file to count as a plan entry's variant.
+MATCH_THRESHOLD = 0.25
+_STOPWORDS = {"a", "an", "and", "the", "to", "with", "of", "on", "in", "from"}
+
+
+def title_words(title: str) -> set[str]:
+    return set(re.findall(r"[a-z]+", title.lower())) - _STOPWORDS
+
+
+def similarity(a: str, b: str) -> float:
+    left, right = title_words(a), title_words(b)
+    return len(left & right) / len(left | right) if left | right else 0.0
+
+
+def match_plan(path: Path, plan: dict[str, PlanEntry]) -> tuple[PlanEntry, float] | None:
+    """The plan entry ``path`` is a variant of; ties go to the file's own ID."""
+    test_id, _, title = path.stem.partition("_")
+    scored = [(similarity(title, entry.title), entry.id == test_id, entry) for entry in plan.values()]
+    score, _, entry = max(scored, key=lambda item: item[:2])
+    return (entry, score) if score >= MATCH_THRESHOLD else None
+
+
+# -- step extraction ----------------------------------------------------------
+
+
+def _call(node: ast.AST) -> ast.Call | None:
+    if isinstance(node, ast.Expr) and isinstance(node.value, ast.Await) and isinstance(node.value.value, ast.Call):
+        return node.value.value
+    return None
+
+
+def _method(call: ast.Call) -> str:
+    return call.func.attr if isinstance(call.func, ast.Attribute) else ""
+
+
+def _receiver(call: ast.Call) -> str:
+    return ast.unparse(call.func.value) if isinstance(call.func, ast.Attribute) else ""
+
+
+def _constant(node: ast.AST | None) -> str:
+    return str(node.value) if isinstance(node, ast.Constant) else ""
+
+
+def _keyword(call: ast.Call, name: str, default: int) -> int:
+    for keyword in call.keywords:
+        if keyword.arg == name and isinstance(keyword.value, ast.Constant):
+            return int(keyword.value.value)
+    return default
+
+
+def _locator(node: ast.AST) -> str:
+    """``'xpath=...'`` from ``frame.locator('xpath=...').nth(0)`` (or ``.first``)."""
+    nth = 0
+    if isinstance(node, ast.Call) and _method(node) == "nth":
+        nth = int(_constant(node.args[0]) or 0)
+        node = node.func.value
+    elif isinstance(node, ast.Attribute) and node.attr == "first":
+        node = node.value
+    if isinstance(node, ast.Call) and _method(node) == "locator" and node.args:
+        target = _constant(node.args[0])
+        return f"{target} >> nth={nth}" if nth else target
+    return ""
+
+
+@dataclass
+class StepExtractor:
+    """Turns one generated TC file into :class:`Step` records."""
+
+    path: Path
+    config: HarnessConfig = field(default_factory=load_config)
+
+    def extract(self) -> tuple[Step, ...]:
+        source = self.path.read_text(encoding="utf-8")
+        self.comments = TimeSteps(source)
+        self.steps: list[Step] = []
+        self.label = ""
+        self.elem = ""
+        self.opened = False
+        tree = ast.parse(source)
+        run_test = next(n for n in tree.body if isinstance(n, ast.AsyncFunctionDef) and n.name == "run_test")
+        body = next(n for n in run_test.body if isinstance(n, ast.Try)).body
+        # The trailing ``await asyncio.sleep(5)`` only delays the clean-up.
+        if body and _call(body[-1]) and _receiver(_call(body[-1])) == "asyncio":
+            body = body[:-1]
+        self._statements(body)
+        return self._collapse_login(tuple(self.steps))
+
+    def _statements(self, body: list[ast.stmt], message: str = "") -> None:
+        for node in body:
+            labels = self.comments.comments_before(node.lineno)
+            if labels:
+                self.label = labels[-1]
+            if isinstance(node, ast.Try):
+                # ``except AssertionError: raise AssertionError('Test case failed: ...')``
+                raised = [n.exc for h in node.handlers for n in ast.walk(h) if isinstance(n, ast.Raise)]
+                text = raised[0].args[0] if raised and isinstance(raised[0], ast.Call) and raised[0].args else None
+                self._statements(node.body, _constant(text))
+            elif isinstance(node, ast.Assign) and ast.unparse(node.targets[0]) == "elem":
+                self.elem = _locator(node.value)
+            elif (call := _call(node)) is not None:
+                self._action(call, message)
+
+    def _action(self, call: ast.Call, message: str) -> None:
+        method, receiver = _method(call), _receiver(call)
+        if receiver == "elem" and method == "fill":
+            self._add(Step(FILL, self.elem, _constant(call.args[0])))
+        elif receiver == "elem" and method == "click":
+            self._add(Step(CLICK, self.elem, timeout=_keyword(call, "timeout", 5000)))
+        elif receiver == "page" and method == "goto":
+            if self.opened:
+                self._add(Step(GOTO, _constant(call.args[0])))
+            self.opened = True  # the first goto opens the app; run_steps does that itself
+        elif receiver == "page.mouse" and method == "wheel":
+            self._add(Step(SCROLL))
+        elif receiver == "asyncio" and method == "sleep":
+            seconds = _constant(call.args[0])
+            self._add(Step(PAUSE, value=seconds), label=f"asyncio.sleep({seconds})")
+        elif method == "to_be_visible" and isinstance(call.func.value, ast.Call):
+            target = _locator(call.func.value.args[0])
+            self._add(Step(EXPECT, target, message, timeout=_keyword(call, "timeout", 5000)))
+
+    def _add(self, step: Step, label: str = "") -> None:
+        self.steps.append(step._replace(label=label or self.label))
+
+    def _collapse_login(self, steps: tuple[Step, ...]) -> tuple[Step, ...]:
+        """Leading fill-email/fill-password/click becomes one ``login`` step."""
+        if len(steps) < 3:
+            return steps
+        email, password, submit = steps[:3]
+        if (
+            (email.kind, password.kind, submit.kind) == (FILL, FILL, CLICK)
+            and email.value == self.config.login_user
+            and password.value == self.config.login_password
+        ):
+            return (Step(LOGIN, email.value, password.value, email.label),) + steps[3:]
+        return steps
+
+
+# -- generation ---------------------------------------------------------------
+
+
+@dataclass
+class PlanTest:
+    entry: PlanEntry
+    # file stem -> (title similarity, steps)
+    variants: dict[str, tuple[float, tuple[Step, ...]]] = field(default_factory=dict)
+
+    @property
+    def default(self) -> str:
+        own = self.entry.id
+        return max(self.variants, key=lambda stem: (self.variants[stem][0], stem.startswith(own + "_")))
+
+    @property
+    def module_name(self) -> str:
+        return f"{self.entry.id}_{re.sub(r'[^A-Za-z0-9]+', '_', self.entry.title).strip('_')}"
+
+    def duplicates(self) -> list[str]:
+        """Variants whose steps repeat another variant's; they are not run."""
+        kept = self.distinct()
+        return sorted(stem for stem in self.variants if stem not in kept)
+
+    def distinct(self) -> dict[str, tuple[Step, ...]]:
+        """Variants with different steps, default first; identical ones are dropped."""
+        seen: dict[tuple[Step, ...], str] = {}
+        for stem in [self.default, *sorted(set(self.variants) - {self.default})]:
+            seen.setdefault(self.variants[stem][1], stem)
+        return {stem: steps for steps, stem in seen.items()}
+
+    def render(self) -> str:
+        variants = self.distinct()
+        duplicates = self.duplicates()
+        listed = "\n".join(
+            f"* ``{stem}``"
+            + (" (default)" if stem == self.default else " (same steps, not run)" if stem in duplicates else "")
+            for stem in sorted(self.variants)
+        )
+        lines = [
+            f'"""{self.entry.id} {self.entry.title}.',
+            "",
+            "Generated by ``python -m testsprite_tests.harness.consolidate`` from",
+            "testsprite_frontend_test_plan.json and these TC files; do not edit:",
+            "",
+            listed,
+            '"""',
+            "",
+            "import asyncio",
+            "from playwright import async_api",
+            "",
+            "from testsprite_tests.harness.steps import Step, run_steps",
+            "",
+            f"PLAN_ID = {self.entry.id!r}",
+            f"DEFAULT = {self.default!r}",
+            "# Cleared by the harness when the test starts from the saved session, so it is only",
+            "# set when every variant logs in first.",
+            f"LOGIN = {all(steps and steps[0].kind == LOGIN for steps in variants.values())}",
+            "VARIANTS = {",
+        ]
+        for stem, steps in variants.items():
+            lines.append(f"    {stem!r}: (")
+            lines += [f"        {_render_step(step)}," for step in steps]
+            lines.append("    ),")
+        lines += [
+            "}",
+            "",
+            "",
+            "async def run_test(variant=None):",
+            "    for name in VARIANTS if variant is None else (variant,):",
+            '        await run_steps(async_api, VARIANTS[name], login=LOGIN, clock=globals().get("_step_clock"))',
+            "",
+            "",
+            "asyncio.run(run_test())",
+            "",
+        ]
+        return "\n".join(lines)
+
+
+def _render_step(step: Step) -> str:
+    args = [repr(step.kind)]
+    for name, default in zip(Step._fields[1:], Step._field_defaults.values()):
+        value = getattr(step, name)
+        if value != default:
+            args.append(f"{name}={value!r}")
+    return f"Step({', '.join(args)})"
+
+
+@dataclass
+class Consolidation:
+    tests: dict[str, PlanTest]
+    standalone: list[Path]
+
+    def skipped(self) -> list[str]:
+        return [stem for test in self.tests.values() for stem in test.duplicates()]
+
+    def manifest(self) -> dict:
+        return {
+            "plans": {
+                plan_id: {
+                    "module": test.module_name,
+                    "default": test.default,
+                    "variants": sorted(test.variants),
+                    "distinct": list(test.distinct()),
+                }
+                for plan_id, test in self.tests.items()
+            },
+            "standalone": [path.stem for path in self.standalone],
+        }
+
+
+def consolidate(paths: list[Path] | None = None, plan: dict[str, PlanEntry] | None = None) -> Consolidation:
+    plan = load_plan() if plan is None else plan
+    config = load_config()
+    tests: dict[str, PlanTest] = {}
+    standalone = []
+    for path in discover_tests() if paths is None else paths:
+        match = match_plan(path, plan)
+        if match is None:
+            standalone.append(path)
+            continue
+        entry, score = match
+        test = tests.setdefault(entry.id, PlanTest(entry))
+        test.variants[path.stem] = (score, StepExtractor(path, config).extract())
+    return Consolidation(dict(sorted(tests.items())), standalone)
+
+
+def write(result: Consolidation, directory: Path = CONSOLIDATED_DIR) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("TC*.py"):
+        stale.unlink()
+    for test in result.tests.values():
+        (directory / f"{test.module_name}.py").write_text(test.render(), encoding="utf-8")
+    (directory / MANIFEST_PATH.name).write_text(json.dumps(result.manifest(), indent=2) + "\n", encoding="utf-8")
+
+
+def discover_consolidated(patterns: list[str] | None = None) -> list[Path]:
+    """The generated per-plan modules plus the TC files no plan entry covers."""
+    manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    files = sorted(CONSOLIDATED_DIR.glob("TC*.py")) + [TESTS_DIR / f"{stem}.py" for stem in manifest["standalone"]]
+    files.sort(key=lambda path: path.stem)
+    if not patterns:
+        return files
+    return [f for f in files if any(f.match(p) or p in f.stem for p in patterns)]
+
+
+def skipped_variants() -> list[str]:
+    """The TC variants the consolidated suite does not run: duplicates of another variant's steps."""
+    manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    return [stem for entry in manifest["plans"].values() for stem in entry["variants"] if stem not in entry["distinct"]]
+
+
+def format_report(result: Consolidation, durations: dict[str, float]) -> str:
+    originals = [TESTS_DIR / f"{stem}.py" for test in result.tests.values() for stem in test.variants]
+    seconds = {path.stem: value for path, value in estimate(originals + result.standalone, durations).items()}
+    lines = []
+    for test in result.tests.values():
+        skipped = test.duplicates()
+        line = f"{test.entry.id}  {len(test.variants)} file(s) -> {test.module_name}"
+        if len(test.variants) - len(skipped) > 1:
+            line += f"  (runs {len(test.variants) - len(skipped)} distinct variants)"
+        if skipped:
+            line += f"  (drops identical {', '.join(skipped)}: est. ~{sum(seconds[s] for s in skipped):.0f}s)"
+        lines.append(line)
+    total = sum(seconds.values())
+    removed = sum(seconds[stem] for stem in result.skipped())
+    files = sum(len(test.variants) for test in result.tests.values()) + len(result.standalone)
+    lines += [
+        "",
+        f"{files} TC files -> {len(result.tests)} plan tests + {len(result.standalone)} files without a plan entry",
+        f"estimated to remove ~{removed:.0f}s of ~{total:.0f}s per run ({removed / max(total, 1e-9):.0%})",
+        "(an estimate from earlier runs' durations; files never timed count as the mean)",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m testsprite_tests.harness.consolidate", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report without writing consolidated/")
+    args = parser.parse_args(argv)
+    result = consolidate()
+    if not args.dry_run:
+        write(result)
+    print(format_report(result, load_durations()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+"""Prerequisite flows and fail-fast blocking of the tests that depend on them.
+
+A broken login used to take down every test behind it, each one only after
+burning its whole timeout budget.  Tests now declare the flows they rely on,
+derived from their steps in ``testsprite_frontend_test_plan.json``:
+
+* ``app`` — the Expo web bundle at ``base_url`` renders at all;
+* ``registration`` — the sign-up form can be reached ("Hesabın yok mu? Kayıt Ol");
+* ``login`` — the configured user can sign in (this also produces the shared
+  session from :mod:`.session`).
+
+:class:`FlowGate` runs each needed flow once, before any test, with short
+timeouts; a test whose flow failed is reported as ``BLOCKED`` immediately.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from playwright import async_api
+
+from .config import HarnessConfig
+from .plan import PlanEntry, load_plan
+from .pool import BrowserPool
+from .session import AuthSession
+
+APP = "app"
+REGISTRATION = "registration"
+LOGIN = "login"
+
+# Flow -> flows it builds on; checked in this order.
+FLOWS = {APP: (), REGISTRATION: (APP,), LOGIN: (APP,)}
+
+SMOKE_TIMEOUT_MS = 15_000
+
+
+def prerequisites(entry: PlanEntry | None) -> tuple[str, ...]:
+    """Flows a plan entry relies on.  Tests without a plan entry only need the app."""
+    if entry is None:
+        return (APP,)
+    if entry.mentions("registration", "register"):
+        return (APP, REGISTRATION)
+    if entry.exercises_login:
+        return (APP,)
+    return (APP, LOGIN)
+
+
+def prerequisites_for(path: Path) -> tuple[str, ...]:
+    return prerequisites(load_plan().get(path.stem.split("_", 1)[0]))
+
+
+@dataclass
+class FlowResult:
+    name: str
+    ok: bool
+    seconds: float
+    error: str = ""
+
+
+@dataclass
+class FlowGate:
+    pool: BrowserPool
+    config: HarnessConfig
+    auth: AuthSession
+    results: dict[str, FlowResult] = field(default_factory=dict)
+
+    async def check(self, flows: set[str]) -> None:
+        """Run every flow in ``flows`` (and what they build on) that has not run yet."""
+        for name in FLOWS:
+            if name in flows or any(name in FLOWS[f] for f in flows):
+                await self._run(name)
+
+    def blocker(self, path: Path) -> FlowResult | None:
+        """The first failed flow ``path`` depends on, if any."""
+        for name in prerequisites_for(path):
+            result = self.results.get(name)
+            if result is not None and not result.ok:
+                return result
+        return None
+
+    async def _run(self, name: str) -> None:
+        if name in self.results:
+            return
+        failed = next((self.results[d] for d in FLOWS[name] if not self.results[d].ok), None)
+        if failed is not None:
+            self.results[name] = FlowResult(name, False, 0.0, f"needs {failed.name}")
+            return
+        started = time.perf_counter()
+        try:
+            await getattr(self, f"_check_{name}")()
+        except Exception as exc:
+            error = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+            self.results[name] = FlowResult(name, False, time.perf_counter() - started, error)
+        else:
+            self.results[name] = FlowResult(name, True, time.perf_counter() - started)
+
+    async def _open(self, **context_options) -> tuple[async_api.BrowserContext, async_api.Page]:
+        context = await self.pool.new_context(**context_options)
+        page = await context.new_page()
+        await page.goto(self.config.base_url, wait_until="domcontentloaded", timeout=SMOKE_TIMEOUT_MS)
+        return context, page
+
+    async def _check_app(self) -> None:
+        context, page = await self._open()
+        try:
+            # The login form's e-mail field; "Airsoft Vibe" in app.json is only the <title>.
+            await page.get_by_placeholder("E-posta").first.wait_for(timeout=SMOKE_TIMEOUT_MS)
+        finally:
+            await context.close()
+
+    async def _check_registration(self) -> None:
+        context, page = await self._open()
+        try:
+            await page.get_by_text("Hesabın yok mu? Kayıt Ol").click(timeout=SMOKE_TIMEOUT_MS)
+            await page.get_by_placeholder("Kullanıcı Adı").first.wait_for(timeout=SMOKE_TIMEOUT_MS)
+        finally:
+            await context.close()
+
+    async def _check_login(self) -> None:
+        storage_state = await self.auth.storage_state(self.pool)
+        context, page = await self._open(storage_state=str(storage_state))
+        try:
+            # Signed in: the tab bar replaces the login form.
+            await page.get_by_text("Profil").first.wait_for(timeout=SMOKE_TIMEOUT_MS)
+        finally:
+            await context.close()
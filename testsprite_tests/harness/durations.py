@@ -0,0 +1,56 @@
+"""Per-test durations from previous runs, used to order and balance work."""
+
+from __future__ import annotations
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+
+from .config import RESULTS_PATH
+
+
+def normalize(name: str) -> str:
+    """``"TC016-Messaging: List ..."`` and ``"TC016_Messaging_List_..."`` map to the same key."""
+    return re.sub(r"[^a-z0-9]+", "", name.lower())
+
+
+def _timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def record_duration(record: dict) -> float | None:
+    """Seconds a ``test_results.json`` record took (``modified - created``)."""
+    if not (record.get("created") and record.get("modified")):
+        return None
+    seconds = (_timestamp(record["modified"]) - _timestamp(record["created"])).total_seconds()
+    return max(seconds, 0.0)
+
+
+def load_durations(path: Path = RESULTS_PATH) -> dict[str, float]:
+    """Latest known duration per test, keyed by :func:`normalize`.
+
+    ``test_results.json`` provides the baseline; newer runs recorded in the
+    result store (:mod:`.store`) override it.
+    """
+    from .store import STORE_PATH, ResultStore
+
+    durations = {}
+    try:
+        records = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        records = []
+    for record in records:
+        seconds = record_duration(record)
+        if seconds is not None:
+            durations[normalize(record["title"])] = seconds
+    if STORE_PATH.exists():
+        with ResultStore(STORE_PATH) as store:
+            durations.update(store.latest_durations())
+    return durations
+
+
+def estimate(paths: list[Path], durations: dict[str, float]) -> dict[Path, float]:
+    """Expected duration per file; files without history get the mean of the known ones."""
+    default = sum(durations.values()) / len(durations) if durations else 60.0
+    return {path: durations.get(normalize(path.stem), default) for path in paths}
@@ -0,0 +1,122 @@
+"""Record each test's Supabase traffic to a HAR file and replay it on later runs.
+
+Recording and replay both go through Playwright's ``context.route_from_har``
+restricted to the app's Supabase origin, so the TC files are unchanged and
+the Expo bundle itself is still served live.  Archives live under
+``tmp/har/<fingerprint>/`` where the fingerprint hashes every file in
+``supabase/migrations``: a schema or demo data change starts a fresh
+directory and the tests re-record on their next run.
+
+Modes:
+
+* ``auto`` — replay a test's archive if one exists for the current
+  migrations, otherwise record it; requests missing from an archive fall
+  through to the network;
+* ``record`` — always re-record (overwrite);
+* ``replay`` — replay only, and abort requests that were never recorded,
+  for fully offline runs.
+
+An archive recorded by a failing test is discarded so it is never replayed.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from playwright import async_api
+
+from .config import MIGRATIONS_DIR, TMP_DIR, migrations_fingerprint
+from .pool import ContextHook
+
+HAR_DIR = TMP_DIR / "har"
+MODES = ("auto", "record", "replay")
+
+
+@dataclass
+class HarArchive:
+    supabase_origin: str
+    mode: str = "auto"
+    fingerprint: str = field(default_factory=migrations_fingerprint)
+    recorded: list[str] = field(default_factory=list)
+    replayed: list[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.mode not in MODES:
+            raise ValueError(f"unknown HAR mode {self.mode!r}; expected one of {', '.join(MODES)}")
+
+    @property
+    def directory(self) -> Path:
+        return HAR_DIR / self.fingerprint
+
+    def paths(self, name: str) -> list[Path]:
+        """Archives of ``name``: one per browser context, in creation order."""
+        return sorted(self.directory.glob(f"{name}.har")) + sorted(
+            self.directory.glob(f"{name}.*.har"), key=lambda p: int(p.suffixes[-2][1:])
+        )
+
+    def recording(self, name: str) -> bool:
+        return self.mode == "record" or (self.mode == "auto" and not (self.directory / f"{name}.har").exists())
+
+    def hook(self, name: str) -> ContextHook:
+        """Context hook routing the Supabase origin of every context ``name`` opens."""
+        record = self.recording(name)
+        if record:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._write_manifest()
+            for stale in self.paths(name):
+                stale.unlink()
+        contexts = 0
+
+        async def route(context: async_api.BrowserContext) -> None:
+            nonlocal contexts
+            path = self.directory / (f"{name}.har" if contexts == 0 else f"{name}.{contexts}.har")
+            contexts += 1
+            pattern = f"{self.supabase_origin.rstrip('/')}/**"
+            if not record and not path.exists():
+                if self.mode == "replay":
+                    await context.route(pattern, lambda route: route.abort())
+                return
+            await context.route_from_har(
+                path,
+                url=pattern,
+                not_found="abort" if self.mode == "replay" else "fallback",
+                update=record,
+                update_content="embed",
+                update_mode="minimal",
+            )
+
+        (self.recorded if record else self.replayed).append(name)
+        return route
+
+    def finish(self, name: str, ok: bool) -> None:
+        """Call after the contexts of ``name`` are closed (which writes the archives)."""
+        if name in self.recorded and not ok:
+            for path in self.paths(name):
+                path.unlink()
+            self.recorded.remove(name)
+
+    def _write_manifest(self) -> None:
+        manifest = self.directory / "manifest.json"
+        if manifest.exists():
+            return
+        manifest.write_text(
+            json.dumps(
+                {
+                    "fingerprint": self.fingerprint,
+                    "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    "supabase_origin": self.supabase_origin,
+                    "migrations": sorted(p.name for p in MIGRATIONS_DIR.glob("*.sql")),
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+    def summary(self) -> str:
+        return (
+            f"HAR {self.mode}: replayed {len(self.replayed)}, recorded {len(self.recorded)} "
+            f"({self.directory.relative_to(TMP_DIR.parent)})"
+        )
@@ -0,0 +1,226 @@
+"""Pick the TC tests a change can affect, from ``tmp/code_summary.json``.
+
+``code_summary.json`` maps each app feature to the files that implement it
+(Authentication -> ``app/auth/login.tsx``, ``lib/auth-context.tsx``, ...).
+A changed file affects the features whose files it is, or which import it
+directly or through other modules: ``components/AdBanner.tsx`` is only
+imported by the feed screen, so it selects the Posts Feed tests, while
+``lib/colors.ts`` reaches every screen and selects them all.  Each test is
+tied to features through the words of its plan entry (or, for the files
+no plan entry covers, its own title); tests tied to no feature (theme,
+access control) run whenever any app source changes.
+
+Some files are not part of any import graph but shape every screen — the
+root layouts, ``package.json``, the Expo/Babel/Metro config, migrations —
+and select the whole suite.  Files outside the app (docs, the harness
+itself) select nothing; an edited TC file selects itself.
+
+Usage (from the repository root)::
+
+    python -m testsprite_tests.harness.impact [--base REF] [FILE ...]
+    python -m testsprite_tests.harness --changed-since REF
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import re
+import subprocess
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from .config import CODE_SUMMARY_PATH, REPO_ROOT, TEST_GLOB, discover_tests
+from .consolidate import match_plan
+from .plan import load_plan
+
+SOURCE_DIRS = ("app/", "components/", "lib/", "hooks/")
+SOURCE_SUFFIXES = (".ts", ".tsx", ".js", ".jsx")
+# Changes that can break any screen without being imported by one.
+WHOLE_SUITE = (
+    "app/_layout.tsx",
+    "app/(tabs)/_layout.tsx",
+    "package.json",
+    "package-lock.json",
+    "app.json",
+    "babel.config.js",
+    "metro.config.js",
+    "tsconfig.json",
+    ".env",
+    "supabase/migrations/*",
+)
+# Words in a test's plan entry that tie it to a feature of code_summary.json
+# (whose descriptions are Turkish, so they cannot be matched directly).
+FEATURE_KEYWORDS = {
+    "Authentication": ("registration", "register", "login", "password", "sign up"),
+    "Posts Feed": ("post", "comment", "like", "feed"),
+    "Profile Management": ("profile", "xp", "rank"),
+    "Events Management": ("event",),
+    "Marketplace": ("marketplace", "listing"),
+    "Messaging": ("message", "messaging", "conversation", "chat"),
+    "Admin Panel": ("admin", "report", "moderation", "moderator"),
+}
+
+_IMPORT = re.compile(r"""(?:\bfrom\s+|\bimport\s*\(\s*|\brequire\s*\(\s*|^\s*import\s+)['"]([^'"]+)['"]""", re.M)
+
+
+@lru_cache(maxsize=None)
+def load_features(path: Path = CODE_SUMMARY_PATH) -> dict[str, tuple[str, ...]]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    return {feature["name"]: tuple(feature.get("files", [])) for feature in raw.get("features", [])}
+
+
+def _resolve(importer: str, spec: str, known: set[str]) -> str | None:
+    """Repository-relative file an import specifier points at, if it is one of ours."""
+    if spec.startswith("@/"):
+        base = spec[2:]
+    elif spec.startswith("lib/"):
+        base = spec
+    elif spec.startswith("."):
+        base = (Path(importer).parent / spec).as_posix()
+        parts: list[str] = []
+        for part in base.split("/"):
+            if part == ".." and parts:
+                parts.pop()
+            elif part not in ("", ".", ".."):
+                parts.append(part)
+        base = "/".join(parts)
+    else:
+        return None  # a package
+    for candidate in [base, *(base + s for s in SOURCE_SUFFIXES), *(f"{base}/index{s}" for s in SOURCE_SUFFIXES)]:
+        if candidate in known:
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=None)
+def importers(root: Path = REPO_ROOT) -> dict[str, frozenset[str]]:
+    """Reverse import graph of the app sources: file -> files importing it."""
+    files = {
+        path.relative_to(root).as_posix()
+        for directory in SOURCE_DIRS
+        for path in (root / directory).rglob("*")
+        if path.suffix in SOURCE_SUFFIXES
+    }
+    graph: dict[str, set[str]] = {}
+    for name in files:
+        for spec in _IMPORT.findall((root / name).read_text(encoding="utf-8", errors="replace")):
+            target = _resolve(name, spec, files)
+            if target is not None:
+                graph.setdefault(target, set()).add(name)
+    return {name: frozenset(users) for name, users in graph.items()}
+
+
+def reached_by(changed: str, graph: dict[str, frozenset[str]]) -> set[str]:
+    """``changed`` and every file that imports it, transitively."""
+    seen, todo = {changed}, [changed]
+    while todo:
+        for user in graph.get(todo.pop(), ()):
+            if user not in seen:
+                seen.add(user)
+                todo.append(user)
+    return seen
+
+
+def test_features(path: Path) -> set[str]:
+    """Features a TC file exercises, from its plan entry (or its title)."""
+    match = match_plan(path, load_plan())
+    if match is not None:
+        entry = match[0]
+        text = f"{entry.title} {entry.description}".lower()
+    else:
+        text = path.stem.partition("_")[2].replace("_", " ").lower()
+    return {
+        feature
+        for feature, keywords in FEATURE_KEYWORDS.items()
+        if any(re.search(rf"\b{re.escape(k)}s?\b", text) for k in keywords)
+    }
+
+
+@dataclass
+class Selection:
+    changed: list[str]
+    features: set[str] = field(default_factory=set)
+    # Files that force the whole suite, and app sources no feature covers.
+    whole_suite: list[str] = field(default_factory=list)
+    unmapped: list[str] = field(default_factory=list)
+    # Stems of TC files (or consolidated modules) that were edited themselves.
+    tests: set[str] = field(default_factory=set)
+
+    @property
+    def touches_app(self) -> bool:
+        return bool(self.features or self.unmapped)
+
+    def selects(self, path: Path) -> bool:
+        if self.whole_suite or path.stem in self.tests:
+            return True
+        features = test_features(path)
+        if not features:
+            return self.touches_app
+        return bool(features & self.features)
+
+    def describe(self) -> str:
+        if self.whole_suite:
+            return f"whole suite: {', '.join(self.whole_suite)} changed"
+        parts = [f"features: {', '.join(sorted(self.features)) or 'none'}"]
+        if self.tests:
+            parts.append(f"edited tests: {', '.join(sorted(self.tests))}")
+        if self.unmapped:
+            parts.append(f"app sources outside every feature: {', '.join(self.unmapped)}")
+        return "; ".join(parts)
+
+
+def select(changed: list[str]) -> Selection:
+    features = load_features()
+    graph = importers()
+    selection = Selection(changed)
+    for name in changed:
+        if any(fnmatch.fnmatch(name, pattern) for pattern in WHOLE_SUITE):
+            selection.whole_suite.append(name)
+        elif name.startswith(SOURCE_DIRS) and name.endswith(SOURCE_SUFFIXES):
+            reached = reached_by(name, graph)
+            hit = {feature for feature, files in features.items() if reached & set(files)}
+            selection.features |= hit
+            if not hit:
+                selection.unmapped.append(name)
+        elif fnmatch.fnmatch(Path(name).name, TEST_GLOB) and name.startswith("testsprite_tests/"):
+            selection.tests.add(Path(name).stem)
+    return selection
+
+
+def changed_files(base: str = "HEAD") -> list[str]:
+    """Files changed between ``base`` and the working tree, plus untracked ones."""
+
+    def git(*args: str) -> list[str]:
+        out = subprocess.run(["git", *args], cwd=REPO_ROOT, check=True, capture_output=True, text=True).stdout
+        return [line for line in out.splitlines() if line]
+
+    return sorted(set(git("diff", "--name-only", base)) | set(git("ls-files", "--others", "--exclude-standard")))
+
+
+def select_tests(paths: list[Path], changed: list[str]) -> tuple[list[Path], Selection]:
+    selection = select(changed)
+    return [path for path in paths if selection.selects(path)], selection
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m testsprite_tests.harness.impact", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("files", nargs="*", help="changed files (default: git diff against --base)")
+    parser.add_argument("--base", default="HEAD", help="git revision to diff the working tree against")
+    args = parser.parse_args(argv)
+    changed = args.files or changed_files(args.base)
+    paths = discover_tests()
+    selected, selection = select_tests(paths, changed)
+    print(f"{len(changed)} changed files; {selection.describe()}")
+    for path in selected:
+        print(f"  {path.stem}  ({', '.join(sorted(test_features(path))) or 'cross-cutting'})")
+    print(f"{len(selected)}/{len(paths)} TC files selected")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,429 @@
+"""Load generator replaying app sessions against a local Supabase.
+
+Each virtual user loops over the session a real user goes through, with
+the requests the screens send today:
+
+1. refresh the account's token if it is about to expire;
+2. load the feed like ``fetchPosts``: one ``get_feed`` call for the 20
+   newest posts with their counts and the viewer's like and save, then
+   scroll to the next page (the ``(created_at, id)`` cursor of the last);
+3. open the comments of a post (``CommentsModal``: the comments, then the
+   viewer's likes among them in one ``in.(...)`` request);
+4. like that post (or unlike it, if it already is);
+5. check notifications;
+6. browse the marketplace, unfiltered and by two categories;
+7. list upcoming events (then the viewer's participation in them, in one
+   request) and join one (or leave it).
+
+with an exponentially distributed think time between steps.  Thousands of
+virtual users share one pooled ``aiohttp`` session.  The endpoint names
+match the queries of :mod:`.pg.queries`, so a slow endpoint here can be
+looked up in the plan and RLS reports.
+
+Virtual user ``i`` uses the account ``load<i % accounts>@airsoftvibe.test``.
+GoTrue limits sign-ins and sign-ups per IP (``sign_in_sign_ups`` in
+``supabase/config.toml``: 30 per 5 minutes), so every account is signed in
+once before the run, missing ones signed up first (the ``008`` trigger
+gives them a profile), and the users of an account share its token.  A
+rate-limited sign-in waits and retries; rate-limited responses are counted
+apart from errors.  Latencies per endpoint, throughput and error rate are
+printed and saved under ``tmp/load/``, and compared with the previous run.
+Usage (from the repository root)::
+
+    python -m testsprite_tests.harness.load [--users 1000] [--duration 120] [--ramp 30] [--think 1.0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import aiohttp
+
+from .config import TMP_DIR, HarnessConfig, load_config
+from .timing import percentile
+
+LOAD_DIR = TMP_DIR / "load"
+PASSWORD = "load-test-123"
+CATEGORIES = ("silah", "ekipman")
+# Posts per feed page, as PAGE_SIZE in app/(tabs)/index.tsx.
+FEED_PAGE = 20
+# A rate-limited sign-in is retried after Retry-After, or this many seconds.
+RATE_LIMIT_WAIT = 60.0
+SIGN_IN_ATTEMPTS = 6
+# Shared tokens are refreshed this many seconds before they expire.
+REFRESH_MARGIN = 60.0
+
+
+def account_email(index: int) -> str:
+    return f"load{index}@airsoftvibe.test"
+
+
+@dataclass
+class Account:
+    """The GoTrue session of one load account, shared by every user signed in as it."""
+
+    email: str
+    user_id: str = ""
+    access_token: str = ""
+    refresh_token: str = ""
+    # time.time() at which access_token expires.
+    expires_at: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+
+@dataclass
+class Endpoint:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    # 429 responses: GoTrue's rate limit, not a failure of the endpoint.
+    rate_limited: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+
+@dataclass
+class Metrics:
+    endpoints: dict[str, Endpoint] = field(default_factory=dict)
+    sessions: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    def record(self, name: str, seconds: float, status: int) -> None:
+        """Time one response; ``status`` 0 is a request that got none."""
+        endpoint = self.endpoints.setdefault(name, Endpoint())
+        endpoint.latencies.append(seconds * 1000)
+        if status == 429:
+            endpoint.rate_limited += 1
+        else:
+            endpoint.errors += not 0 < status < 400
+
+    def summary(self, seconds: float) -> dict[str, Any]:
+        requests = sum(e.requests for e in self.endpoints.values())
+        errors = sum(e.errors for e in self.endpoints.values())
+        return {
+            "seconds": round(seconds, 1),
+            "sessions": self.sessions,
+            "requests": requests,
+            "throughput": round(requests / max(seconds, 1e-9), 1),
+            "error_rate": round(errors / max(requests, 1), 4),
+            "rate_limited": sum(e.rate_limited for e in self.endpoints.values()),
+            "endpoints": {
+                name: {
+                    "requests": e.requests,
+                    "errors": e.errors,
+                    "rate_limited": e.rate_limited,
+                    **{f"p{q}": round(percentile(e.latencies, q), 1) for q in (50, 95, 99)},
+                }
+                for name, e in sorted(self.endpoints.items())
+            },
+        }
+
+
+class Client:
+    """PostgREST/GoTrue calls of one virtual user, timed into :class:`Metrics`."""
+
+    def __init__(self, http: aiohttp.ClientSession, config: HarnessConfig, metrics: Metrics, account: Account):
+        self.http = http
+        self.base = config.supabase_url.rstrip("/")
+        self.anon_key = config.supabase_anon_key
+        self.metrics = metrics
+        self.account = account
+
+    @property
+    def token(self) -> str:
+        return self.account.access_token
+
+    @property
+    def user_id(self) -> str:
+        return self.account.user_id
+
+    async def call(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        params: dict[str, str] | None = None,
+        body: Any = None,
+        prefer: str = "",
+    ) -> tuple[int, Any, dict[str, str]]:
+        headers = {"apikey": self.anon_key, "Authorization": f"Bearer {self.token or self.anon_key}"}
+        if prefer:
+            headers["Prefer"] = prefer
+        started = time.perf_counter()
+        try:
+            async with self.http.request(method, self.base + path, params=params, json=body, headers=headers) as r:
+                raw = await r.read()
+                status, response_headers = r.status, dict(r.headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.metrics.record(name, time.perf_counter() - started, 0)
+            return 0, None, {}
+        self.metrics.record(name, time.perf_counter() - started, status)
+        data = json.loads(raw) if raw and status < 400 else None
+        return status, data, response_headers
+
+    async def rest(self, name: str, table: str, params: dict[str, str]) -> list[dict[str, Any]]:
+        _, data, _ = await self.call(name, "GET", f"/rest/v1/{table}", params)
+        return data or []
+
+    async def grant(self, name: str, grant_type: str, body: dict[str, str]) -> tuple[int, Any, dict[str, str]]:
+        status, data, headers = await self.call(name, "POST", "/auth/v1/token", {"grant_type": grant_type}, body)
+        self.keep(data)
+        return status, data, headers
+
+    def keep(self, data: Any) -> None:
+        if not data or "access_token" not in data:
+            return
+        account = self.account
+        account.access_token, account.refresh_token = data["access_token"], data["refresh_token"]
+        account.user_id = data["user"]["id"]
+        account.expires_at = time.time() + data["expires_in"]
+
+    async def sign_in(self) -> tuple[int, dict[str, str]]:
+        """Password grant for the account, signing it up first if needed; the last status and headers."""
+        credentials = {"email": self.account.email, "password": PASSWORD}
+        status, _, headers = await self.grant("auth.token", "password", credentials)
+        if status == 400:  # not signed up yet
+            status, data, headers = await self.call("auth.signup", "POST", "/auth/v1/signup", None, {
+                **credentials, "data": {"username": self.account.email.split("@")[0]},
+            })
+            # Without e-mail confirmation (config.toml) the sign-up response is the session.
+            self.keep(data)
+            if status < 400 and not self.token:
+                status, _, headers = await self.grant("auth.token", "password", credentials)
+        return status, headers
+
+    async def refresh(self) -> bool:
+        """Refresh the shared token if it expires within REFRESH_MARGIN; False if it could not be."""
+        account = self.account
+        if account.expires_at - time.time() > REFRESH_MARGIN:
+            return True
+        async with account.lock:
+            # Another user of the account may have refreshed it while this one waited.
+            if account.expires_at - time.time() > REFRESH_MARGIN:
+                return True
+            await self.grant("auth.refresh", "refresh_token", {"refresh_token": account.refresh_token})
+        return account.expires_at > time.time()
+
+
+async def sign_in_accounts(
+    http: aiohttp.ClientSession, config: HarnessConfig, metrics: Metrics, count: int,
+    log: Callable[[str], None] = print,
+) -> list[Account]:
+    """Sign ``count`` load accounts in one after another, waiting out rate limits; those that succeeded."""
+    accounts = []
+    for index in range(count):
+        client = Client(http, config, metrics, Account(account_email(index)))
+        for _ in range(SIGN_IN_ATTEMPTS):
+            status, headers = await client.sign_in()
+            if status != 429:
+                break
+            wait = float(headers.get("Retry-After") or RATE_LIMIT_WAIT)
+            log(f"sign-in rate limited at {client.account.email}, retrying in {wait:.0f}s")
+            await asyncio.sleep(wait)
+        if client.token:
+            accounts.append(client.account)
+        else:
+            log(f"could not sign in {client.account.email} (status {status})")
+    return accounts
+
+
+def _in(values: Iterable[Any]) -> str:
+    """PostgREST ``in.(...)`` filter, as ``.in()`` in supabase-js sends it."""
+    return f"in.({','.join(str(value) for value in values)})"
+
+
+async def load_feed(client: Client, after: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+    """One feed page: the first one, or the one after the post ``after``."""
+    args = {"p_viewer": client.user_id, "p_limit": FEED_PAGE}
+    if after:
+        args.update(p_cursor_created_at=after["created_at"], p_cursor_id=after["id"])
+    _, posts, _ = await client.call("feed.next" if after else "feed", "POST", "/rest/v1/rpc/get_feed", None, args)
+    return posts or []
+
+
+async def open_comments(client: Client, post: dict[str, Any]) -> None:
+    comments = await client.rest("comments", "comments", {
+        "select": "*,profiles(username,avatar_url)", "post_id": f"eq.{post['id']}", "deleted_at": "is.null",
+        "order": "created_at.asc",
+    })
+    if comments:
+        await client.rest("comments.liked", "comment_likes", {
+            "select": "comment_id", "comment_id": _in(comment["id"] for comment in comments),
+            "user_id": f"eq.{client.user_id}",
+        })
+
+
+async def toggle_like(client: Client, post: dict[str, Any]) -> None:
+    if post["is_liked"]:
+        await client.call("likes.delete", "DELETE", "/rest/v1/likes", {
+            "post_id": f"eq.{post['id']}", "user_id": f"eq.{client.user_id}",
+        })
+    else:
+        # Users sharing an account may have liked it in the meantime; that is not an error.
+        await client.call("likes.insert", "POST", "/rest/v1/likes", {"on_conflict": "post_id,user_id"}, {
+            "post_id": post["id"], "user_id": client.user_id,
+        }, prefer="resolution=ignore-duplicates")
+
+
+async def browse_events(client: Client, rng: random.Random) -> None:
+    events = await client.rest("events.upcoming", "events", {
+        "select": "*", "start_time": f"gte.{datetime.now().astimezone().isoformat()}", "order": "start_time.asc",
+        "limit": "50",
+    })
+    if events:
+        joined = {row["event_id"] for row in await client.rest("events.joined", "event_participants", {
+            "select": "event_id", "event_id": _in(event["id"] for event in events), "user_id": f"eq.{client.user_id}",
+            "status": "eq.going",
+        })}
+        event = rng.choice(events)
+        if event["id"] in joined:
+            await client.call("events.leave", "DELETE", "/rest/v1/event_participants", {
+                "event_id": f"eq.{event['id']}", "user_id": f"eq.{client.user_id}",
+            })
+        else:
+            row = {"event_id": event["id"], "user_id": client.user_id, "status": "going"}
+            await client.call(
+                "events.join", "POST", "/rest/v1/event_participants", {"on_conflict": "event_id,user_id"}, row,
+                prefer="resolution=ignore-duplicates",
+            )
+
+
+async def run_session(client: Client, rng: random.Random, think: float) -> bool:
+    async def pause() -> None:
+        if think:
+            await asyncio.sleep(rng.expovariate(1 / think))
+
+    if not await client.refresh():
+        return False
+    await pause()
+    posts = await load_feed(client)
+    await pause()
+    if len(posts) == FEED_PAGE:
+        posts += await load_feed(client, posts[-1])
+        await pause()
+    if posts:
+        post = rng.choice(posts)
+        await open_comments(client, post)
+        await pause()
+        await toggle_like(client, post)
+        await pause()
+    await client.rest("notifications", "notifications", {
+        "select": "*", "user_id": f"eq.{client.user_id}", "order": "created_at.desc", "limit": "50",
+    })
+    await pause()
+    listing = {"select": "*,profiles!marketplace_items_seller_id_fkey(username)", "status": "eq.active",
+               "order": "created_at.desc"}
+    await client.rest("marketplace", "marketplace_items", listing)
+    for category in CATEGORIES:
+        await pause()
+        await client.rest("marketplace.category", "marketplace_items", {**listing, "category": f"eq.{category}"})
+    await pause()
+    await browse_events(client, rng)
+    return True
+
+
+async def virtual_user(index: int, client: Client, metrics: Metrics, args: argparse.Namespace) -> None:
+    rng = random.Random(index)
+    await asyncio.sleep(args.ramp * index / max(args.users, 1))
+    deadline = metrics.started + args.ramp + args.duration
+    while time.perf_counter() < deadline:
+        if await run_session(client, rng, args.think):
+            metrics.sessions += 1
+        else:
+            await asyncio.sleep(1)
+
+
+async def run_load(args: argparse.Namespace) -> dict[str, Any]:
+    config = load_config()
+    sign_ins = Metrics()
+    connector = aiohttp.TCPConnector(limit=args.connections)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+        accounts = await sign_in_accounts(http, config, sign_ins, args.accounts)
+        # Sign-ins are reported on their own; the run is timed from here.
+        metrics = Metrics()
+        if accounts:
+            await asyncio.gather(*(
+                virtual_user(i, Client(http, config, metrics, accounts[i % len(accounts)]), metrics, args)
+                for i in range(args.users)
+            ))
+    summary = metrics.summary(time.perf_counter() - metrics.started)
+    summary["sign_ins"] = {
+        "accounts": len(accounts),
+        "failed": args.accounts - len(accounts),
+        **{key: sign_ins.summary(0)[key] for key in ("requests", "rate_limited")},
+        "seconds": round(metrics.started - sign_ins.started, 1),
+    }
+    options = ("users", "accounts", "duration", "ramp", "think", "connections")
+    summary["options"] = {name: getattr(args, name) for name in options}
+    return summary
+
+
+def format_summary(summary: dict[str, Any], previous: dict[str, Any] | None) -> str:
+    lines = [f"{'endpoint':<28} {'requests':>9} {'err%':>6} {'429':>5} {'p50':>8} {'p95':>8} {'p99':>8}"]
+    for name, e in summary["endpoints"].items():
+        line = (f"{name:<28} {e['requests']:9d} {100 * e['errors'] / max(e['requests'], 1):5.1f}% "
+                f"{e['rate_limited']:5d} {e['p50']:6.0f}ms {e['p95']:6.0f}ms {e['p99']:6.0f}ms")
+        before = (previous or {}).get("endpoints", {}).get(name)
+        if before:
+            line += f"  (p95 {e['p95'] - before['p95']:+.0f}ms)"
+        lines.append(line)
+    lines.append(
+        f"{summary['sessions']} sessions, {summary['requests']} requests in {summary['seconds']:.0f}s: "
+        f"{summary['throughput']:.0f} req/s, {100 * summary['error_rate']:.2f}% errors, "
+        f"{summary['rate_limited']} rate limited"
+    )
+    sign_ins = summary["sign_ins"]
+    lines.append(
+        f"sign-ins: {sign_ins['accounts']} accounts in {sign_ins['seconds']:.0f}s, {sign_ins['failed']} failed, "
+        f"{sign_ins['rate_limited']} rate limited"
+    )
+    if previous:
+        lines.append(
+            f"previous run: {previous['throughput']:.0f} req/s, {100 * previous['error_rate']:.2f}% errors "
+            f"({previous['options']['users']} users)"
+        )
+    return "\n".join(lines)
+
+
+def previous_run(directory: Path = LOAD_DIR) -> dict[str, Any] | None:
+    runs = sorted(directory.glob("*.json"))
+    return json.loads(runs[-1].read_text(encoding="utf-8")) if runs else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m testsprite_tests.harness.load", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--users", type=int, default=100, help="concurrent virtual users")
+    parser.add_argument(
+        "--accounts", type=int, default=25,
+        help="distinct accounts the users share (signed in once each; GoTrue allows 30 sign-ins per 5 minutes)",
+    )
+    parser.add_argument("--duration", type=float, default=60, help="seconds to run at full load")
+    parser.add_argument("--ramp", type=float, default=10, help="seconds over which the users start")
+    parser.add_argument("--think", type=float, default=1.0, help="mean think time between steps, in seconds")
+    parser.add_argument("--connections", type=int, default=200, help="size of the shared HTTP connection pool")
+    args = parser.parse_args(argv)
+    previous = previous_run()
+    summary = asyncio.run(run_load(args))
+    print(format_summary(summary, previous))
+    LOAD_DIR.mkdir(parents=True, exist_ok=True)
+    path = LOAD_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(f"saved to {path}")
+    return 1 if summary["error_rate"] > 0.01 or summary["sign_ins"]["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
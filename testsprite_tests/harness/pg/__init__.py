@@ -0,0 +1,35 @@
+"""Database fixtures on a real Postgres server, from template databases.
+
+The data-mutating tests (TC001 registration, TC006 post creation, TC015
+event participation, TC018 admin delete) leave rows behind, so reruns see
+a different database than the first run did.  Instead of replaying the SQL
+before every test, :class:`TemplateDatabase` builds a database once from
+``supabase/migrations`` (plus the ``auth``/``storage`` parts of Supabase
+they assume, :mod:`.bootstrap`), the harness accounts and
+``demo_data_complete.sql``, and marks it as a template.  A copy is then a
+file-level ``CREATE DATABASE ... TEMPLATE``, which takes well under a
+second::
+
+    template = TemplateDatabase(config.database_url)
+    template.build()                  # no-op while the migrations are unchanged
+    with template.cloned("feed") as dsn:
+        ...                           # a private copy, dropped afterwards
+    template.reset_data()             # reset the database the backend serves, in place
+
+``python -m testsprite_tests.harness --reset-db`` resets the data of the
+database named by ``SUPABASE_DB_URL`` before the run and after each
+data-mutating test.  The database is not dropped, so this works on the
+Supabase CLI's ``postgres`` database while PostgREST and GoTrue serve it.
+From the command line (from the repository root)::
+
+    python -m testsprite_tests.harness.pg build [--force]
+    python -m testsprite_tests.harness.pg clone NAME | restore [NAME] | reset [NAME] | drop NAME
+
+:mod:`.synthetic` loads production-sized data into a copy of the template.
+:mod:`.squash` squashes the migrations into ``supabase/baseline.sql``, which
+the template is then built from in one step.
+"""
+
+from .template import MigrationReport, TemplateDatabase
+
+__all__ = ["MigrationReport", "TemplateDatabase"]
@@ -0,0 +1,43 @@
+import argparse
+import sys
+import time
+
+from ..config import load_config
+from .template import TemplateDatabase
+
+parser = argparse.ArgumentParser(prog="python -m testsprite_tests.harness.pg")
+parser.add_argument("--dsn", help="Postgres server to use (default: SUPABASE_DB_URL or the Supabase CLI database)")
+commands = parser.add_subparsers(dest="command", required=True)
+build = commands.add_parser("build", help="build the template database unless it is current")
+build.add_argument("--force", action="store_true", help="rebuild even if it exists")
+commands.add_parser("clone", help="create database NAME from the template").add_argument("name")
+commands.add_parser("restore", help="replace database NAME (default: the DSN's) with a clone").add_argument(
+    "name", nargs="?"
+)
+commands.add_parser("reset", help="replace the rows of database NAME (default: the DSN's) in place").add_argument(
+    "name", nargs="?"
+)
+commands.add_parser("drop", help="drop database NAME").add_argument("name")
+args = parser.parse_args()
+
+template = TemplateDatabase(args.dsn or load_config().database_url)
+started = time.perf_counter()
+if args.command == "build":
+    built = template.build(force=args.force)
+    if not built:
+        print(f"{template.name} is current")
+        sys.exit(0)
+    print(template.report.describe())
+    print(f"built {template.name} in {time.perf_counter() - started:.1f}s")
+    sys.exit(1 if template.report.failed else 0)
+if args.command == "drop":
+    template.drop(args.name)
+    print(f"dropped {args.name}")
+elif args.command == "reset":
+    template.build()
+    template.reset_data(args.name)
+    print(f"reset {args.name or 'the DSN database'}  ({time.perf_counter() - started:.2f}s from {template.name})")
+else:
+    template.build()
+    dsn = template.clone(args.name) if args.command == "clone" else template.restore(args.name)
+    print(f"{dsn}  ({time.perf_counter() - started:.2f}s from {template.name})")
@@ -0,0 +1,341 @@
+"""Index advisor fed by ``pg_stat_statements`` and checked against the query catalogue.
+
+Migration ``022_remove_unused_indexes`` dropped ~40 indexes the Supabase
+linter had not seen used, ``idx_posts_created_at``,
+``idx_direct_messages_recipient`` and ``idx_group_messages_created`` among
+them, although the feed and the message screens filter and sort on those
+columns.  This advisor finds the indexes the real workload wants:
+
+1. the workload is the ``pg_stat_statements`` of the database a load test
+   (:mod:`..load`) ran against: the ``STATEMENTS`` reads with the most
+   total execution time, PostgREST's ``$n`` parameters and all;
+2. each statement is planned with ``EXPLAIN (GENERIC_PLAN)`` on a scaled
+   copy of the database (:func:`.synthetic.scaled_database`), and its
+   sequential scans suggest candidates: the columns compared in their
+   filter, then the sort key above them, partial on ``IS NULL`` filters;
+3. candidates are costed as hypothetical indexes (``hypopg``) and chosen
+   greedily: the one whose plans cut the most estimated time (a
+   statement's total time scaled by its cost ratio) first, again with the
+   chosen ones in place, until the next saves less than ``MIN_SAVING`` of
+   the workload;
+4. each chosen index is then built for real, in a transaction that is
+   rolled back, and the catalogued queries (:mod:`.queries`) on its table
+   timed as ``authenticated`` before and after; an index whose queries do
+   not get ``MIN_MEASURED_GAIN`` faster is left out.  So is an index on
+   a table no catalogued query reads: with nothing to measure it is
+   reported as unverified and not written into the migration.
+
+The result is a migration of ``CREATE INDEX`` statements whose header
+lists the estimated and measured before/after numbers of each index.  It
+is written under ``tmp/indexes/``, or into ``supabase/migrations`` with
+``--write``.  Usage (from the repository root)::
+
+    python -m testsprite_tests.harness.pg.indexes --reset    # then run the load test
+    python -m testsprite_tests.harness.pg.indexes [--scale medium] [--write]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterator
+
+import psycopg
+
+from ..config import MIGRATIONS_DIR, TMP_DIR, load_config
+from .queries import QUERIES, fixtures
+from .rls import USER_ROLE, Session, tables_of
+from .synthetic import SCALES, scaled_database
+from .template import TemplateDatabase
+
+INDEXES_DIR = TMP_DIR / "indexes"
+STATEMENTS = 200
+# The next index has to save this share of the workload's estimated time ...
+MIN_SAVING = 0.01
+# ... and make the catalogued queries on its table this much faster.
+MIN_MEASURED_GAIN = 0.10
+MAX_INDEXES = 10
+
+_EQUALITY = re.compile(r"(?:\b(\w+)\.)?\b(\w+) = ")
+_IS_NULL = re.compile(r"(?:\b(\w+)\.)?\b(\w+) IS NULL\b")
+_SORT_KEY = re.compile(r"^(?:(\w+)\.)?(\w+)( DESC)?$")
+
+
+@dataclass
+class Statement:
+    query: str
+    calls: int
+    total_ms: float
+    # Generic plan on the costing database, its cost and the tables it reads.
+    plan: dict[str, Any] = field(default_factory=dict)
+    cost: float = 0.0
+    tables: set[str] = field(default_factory=set)
+
+
+@dataclass(frozen=True)
+class Candidate:
+    table: str
+    # "created_at DESC", in index order.
+    columns: tuple[str, ...]
+    where: str = ""
+
+    @property
+    def name(self) -> str:
+        name = f"idx_{self.table}_" + "_".join(column.split()[0] for column in self.columns)
+        return name + ("_partial" if self.where else "")
+
+    def definition(self) -> str:
+        where = f" WHERE {self.where}" if self.where else ""
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table} ({', '.join(self.columns)}){where}"
+
+
+@dataclass
+class Advice:
+    candidate: Candidate
+    statements: int
+    # Estimated total time of the statements it changes, without and with it.
+    estimated_before_ms: float
+    estimated_after_ms: float
+    # Catalogued query -> (ms without, ms with), medians of real runs.
+    measured: dict[str, tuple[float, float]] = field(default_factory=dict)
+
+    @property
+    def measured_gain(self) -> float:
+        before = sum(b for b, _ in self.measured.values())
+        after = sum(a for _, a in self.measured.values())
+        return 1 - after / before if before else 0.0
+
+
+def collect(conn: psycopg.Connection, limit: int = STATEMENTS) -> list[Statement]:
+    """The reads of the current database with the most total time since the last reset."""
+    rows = conn.execute(
+        "SELECT s.query, s.calls, s.total_exec_time FROM pg_stat_statements s"
+        " JOIN pg_database d ON d.oid = s.dbid"
+        " WHERE d.datname = current_database() AND s.toplevel AND s.query ~* '^\\s*(select|with)\\M'"
+        " ORDER BY s.total_exec_time DESC LIMIT %s",
+        (limit,),
+    )
+    return [Statement(query, calls, total_ms) for query, calls, total_ms in rows]
+
+
+def _nodes(plan: dict[str, Any], sort_key: list[str] | None = None) -> Iterator[tuple[dict[str, Any], list[str]]]:
+    """Every node of ``plan`` with the sort key of the closest sort above it."""
+    if plan["Node Type"] in ("Sort", "Incremental Sort"):
+        sort_key = plan.get("Sort Key", [])
+    yield plan, sort_key or []
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child, sort_key)
+
+
+def generic_plan(conn: psycopg.Connection, query: str) -> dict[str, Any] | None:
+    # Sent as is: the $n placeholders are the statement's own, not parameters of this call.
+    try:
+        with psycopg.ClientCursor(conn) as cursor:
+            cursor.execute("EXPLAIN (GENERIC_PLAN, FORMAT JSON) " + query)
+            return cursor.fetchone()[0][0]["Plan"]
+    except psycopg.Error:
+        return None
+
+
+def candidates(plan: dict[str, Any]) -> set[Candidate]:
+    found = set()
+    for node, sort_key in _nodes(plan):
+        table = node.get("Relation Name")
+        if node["Node Type"] != "Seq Scan" or node.get("Schema", "public") != "public" or table is None:
+            continue
+        alias = node.get("Alias", table)
+        condition = node.get("Filter", "")
+        equal = [c for q, c in _EQUALITY.findall(condition) if q in ("", alias)]
+        nulls = dict.fromkeys(c for q, c in _IS_NULL.findall(condition) if q in ("", alias))
+        where = " AND ".join(f"{c} IS NULL" for c in nulls)
+        order = []
+        for key in sort_key:
+            match = _SORT_KEY.match(key)
+            if not match or match[1] not in (None, alias):
+                break
+            order.append(match[2] + (match[3] or ""))
+        equal = list(dict.fromkeys(equal))
+        if equal:
+            found.add(Candidate(table, tuple(equal), where))
+        if order:
+            found.add(Candidate(table, tuple(equal + [c for c in order if c.split()[0] not in equal]), where))
+    return found
+
+
+def existing_indexes(conn: psycopg.Connection) -> dict[str, list[tuple[str, ...]]]:
+    rows = conn.execute(
+        "SELECT c.relname, array_agg(a.attname ORDER BY k.ord) FROM pg_index i"
+        " JOIN pg_class c ON c.oid = i.indrelid"
+        " CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)"
+        " JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum"
+        " WHERE c.relnamespace = 'public'::regnamespace GROUP BY i.indexrelid, c.relname"
+    )
+    existing: dict[str, list[tuple[str, ...]]] = {}
+    for table, columns in rows:
+        existing.setdefault(table, []).append(tuple(columns))
+    return existing
+
+
+def covered(candidate: Candidate, existing: dict[str, list[tuple[str, ...]]]) -> bool:
+    """Whether an index on the table already starts with the candidate's columns (in either direction)."""
+    columns = tuple(column.split()[0] for column in candidate.columns)
+    return any(index[: len(columns)] == columns for index in existing.get(candidate.table, ()))
+
+
+def costs(conn: psycopg.Connection, statements: list[Statement], table: str) -> dict[int, float]:
+    """Generic-plan cost of the statements reading ``table``, with the hypothetical indexes in place."""
+    result = {}
+    for i, statement in enumerate(statements):
+        if table in statement.tables:
+            plan = generic_plan(conn, statement.query)
+            if plan is not None:
+                result[i] = plan["Total Cost"]
+    return result
+
+
+def choose(conn: psycopg.Connection, statements: list[Statement], max_indexes: int = MAX_INDEXES) -> list[Advice]:
+    """Greedily pick hypothetical indexes by the estimated time they save; ``statements`` must be planned."""
+    conn.execute("CREATE EXTENSION IF NOT EXISTS hypopg")
+    conn.execute("SELECT hypopg_reset()")
+    existing = existing_indexes(conn)
+    pool = {c for s in statements for c in candidates(s.plan) if not covered(c, existing)}
+    current = {i: s.cost for i, s in enumerate(statements)}
+    # Estimated time of each statement with the indexes chosen so far.
+    remaining = {i: s.total_ms for i, s in enumerate(statements)}
+    total_ms = sum(remaining.values())
+    chosen: list[Advice] = []
+    while pool and len(chosen) < max_indexes:
+        best: tuple[float, Candidate, dict[int, float]] | None = None
+        for candidate in pool:
+            hypothetical = conn.execute("SELECT indexrelid FROM hypopg_create_index(%s)", (candidate.definition(),))
+            oid = hypothetical.fetchone()[0]
+            after = costs(conn, statements, candidate.table)
+            conn.execute("SELECT hypopg_drop_index(%s)", (oid,))
+            saving = sum(remaining[i] * max(0.0, 1 - cost / current[i]) for i, cost in after.items() if current[i])
+            if best is None or saving > best[0]:
+                best = (saving, candidate, after)
+        if best is None or best[0] < MIN_SAVING * total_ms:
+            break
+        saving, candidate, after = best
+        conn.execute("SELECT hypopg_create_index(%s)", (candidate.definition(),))
+        changed = [i for i, cost in after.items() if cost < current[i]]
+        before_ms = sum(remaining[i] for i in changed)
+        chosen.append(Advice(candidate, len(changed), before_ms, before_ms - saving))
+        # Later candidates are judged against plans that already have this index.
+        for i in changed:
+            remaining[i] *= after[i] / current[i]
+            current[i] = after[i]
+        pool.discard(candidate)
+    conn.execute("SELECT hypopg_reset()")
+    return chosen
+
+
+def measure(conn: psycopg.Connection, advice: Advice) -> None:
+    """Time the catalogued queries on the index's table without and with the index, built for real."""
+    params = fixtures(conn)
+    session = Session(conn, params["viewer"])
+    queries = [q for q in QUERIES if advice.candidate.table in tables_of(q)]
+    if not queries:
+        return
+    before = {q.name: session.time(USER_ROLE, q.sql, params) for q in queries}
+    with conn.transaction():
+        conn.execute(advice.candidate.definition())
+        conn.execute(f"ANALYZE {advice.candidate.table}")
+        advice.measured = {q.name: (before[q.name], session.time(USER_ROLE, q.sql, params)) for q in queries}
+        raise psycopg.Rollback()
+
+
+def format_migration(advice: list[Advice], workload: list[Statement], scale: str | None) -> str:
+    lines = [
+        "/*",
+        "  # Restore the indexes the app's queries need",
+        "",
+        "  Advised by python -m testsprite_tests.harness.pg.indexes from the",
+        f"  {len(workload)} busiest reads of pg_stat_statements "
+        f"({sum(s.calls for s in workload):,} calls) on the {scale or 'given'} dataset.",
+        "  Estimated: total time of the statements an index changes, scaled by",
+        "  their generic-plan cost without and with it (hypopg).",
+        "  Measured: median execution time of the catalogued queries as",
+        "  authenticated, without and with the index.",
+        "",
+        "  ## Indexes",
+    ]
+    for a in advice:
+        lines.append(
+            f"  - {a.candidate.name}: estimated {a.estimated_before_ms:,.0f} ms -> {a.estimated_after_ms:,.0f} ms"
+            f" over {a.statements} statements"
+        )
+        for name, (before, after) in a.measured.items():
+            lines.append(f"    - {name}: {before:.2f} ms -> {after:.2f} ms")
+    lines += ["*/", ""]
+    lines += [a.candidate.definition() + ";" for a in advice]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m testsprite_tests.harness.pg.indexes", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--reset", action="store_true", help="clear pg_stat_statements before a load test and exit")
+    parser.add_argument("--stats", metavar="DSN", help="database the load test ran against (default: SUPABASE_DB_URL)")
+    parser.add_argument("--scale", choices=SCALES, default="medium", help="dataset size to cost and measure on")
+    parser.add_argument("--dsn", help="Postgres server to build the scaled database on (default: SUPABASE_DB_URL)")
+    parser.add_argument("--database", metavar="DSN", help="cost and measure on this database as is instead")
+    parser.add_argument("--max-indexes", type=int, default=MAX_INDEXES)
+    parser.add_argument("--write", action="store_true", help="write the migration into supabase/migrations")
+    args = parser.parse_args(argv)
+    config = load_config()
+    with psycopg.connect(args.stats or config.database_url, autocommit=True) as conn:
+        if args.reset:
+            conn.execute("SELECT pg_stat_statements_reset()")
+            print("pg_stat_statements cleared; run the load test, then the advisor")
+            return 0
+        workload = collect(conn)
+    if not workload:
+        print("pg_stat_statements has no reads; run the load test first", file=sys.stderr)
+        return 2
+    dsn = args.database or scaled_database(TemplateDatabase(args.dsn or config.database_url), args.scale)
+    scale = None if args.database else args.scale
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute("SET jit = off")
+        planned = []
+        for statement in workload:
+            plan = generic_plan(conn, statement.query)
+            if plan is not None:
+                statement.plan, statement.cost = plan, plan["Total Cost"]
+                statement.tables = {node["Relation Name"] for node, _ in _nodes(plan) if "Relation Name" in node}
+                planned.append(statement)
+        print(f"{len(planned)}/{len(workload)} statements planned on the {scale or 'given'} dataset")
+        advice = choose(conn, planned, args.max_indexes)
+        kept = []
+        for a in advice:
+            measure(conn, a)
+            if not a.measured:
+                status = "unverified"
+            else:
+                status = "keep" if a.measured_gain >= MIN_MEASURED_GAIN else "drop"
+            print(f"{status}  {a.candidate.definition()}")
+            measured = (
+                f"measured {100 * a.measured_gain:.0f}% faster over {len(a.measured)} catalogued queries"
+                if a.measured else f"not measured: no catalogued query reads {a.candidate.table}"
+            )
+            print(f"      estimated {a.estimated_before_ms:,.0f} ms -> {a.estimated_after_ms:,.0f} ms, {measured}")
+            if status == "keep":
+                kept.append(a)
+    if not kept:
+        print("no index measurably helps")
+        return 0
+    migration = format_migration(kept, workload, scale)
+    name = f"{datetime.now():%Y%m%d%H%M%S}_023_add_advised_indexes.sql"
+    directory = MIGRATIONS_DIR if args.write else INDEXES_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / name).write_text(migration, encoding="utf-8")
+    print(f"wrote {directory / name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Query-plan regression suite for the catalogued app queries.
+
+Every query of :mod:`.queries` is run under ``EXPLAIN (ANALYZE, BUFFERS)``
+against a scaled copy of the database (:func:`.synthetic.scaled_database`)
+and summarised: the scans it uses, the tables it reads with a sequential
+scan and the shared buffers it touches.  The summaries are compared with
+the accepted ones in ``testsprite_tests/query_plans.json`` and a query
+fails when
+
+* it seq-scans a table of ``SEQ_SCAN_ROWS`` rows or more that its accepted
+  plan did not, or
+* it touches more than ``BUFFER_FACTOR`` times the accepted buffers.
+
+A query without an accepted plan (all of them, on the first run) is not
+failed but recorded: its plan is written to the baseline as the accepted
+one, to be reviewed and committed with it.
+
+Migration ``022_remove_unused_indexes`` dropped ~40 indexes at once, and
+the first thing that noticed was the feed getting slow; with this suite,
+dropping ``idx_posts_feed`` (migration ``012``) turns ``feed`` and
+``feed.deep`` into a seq scan of ``posts`` and fails.  Timings are printed but never fail a query: they
+vary with the machine, buffers do not.  Full plans of every run are kept
+under ``tmp/plans/``.  Queries run as the table owner, so the cost of the
+RLS policies is not part of these plans; :mod:`.rls` measures it.  Usage
+(from the repository root)::
+
+    python -m testsprite_tests.harness.pg.plans [QUERY ...] [--scale medium] [--update-baseline]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+import psycopg
+
+from ..config import QUERY_PLANS_PATH, TMP_DIR, load_config
+from .queries import AppQuery, by_name, fixtures
+from .synthetic import SCALES, scaled_database
+from .template import TemplateDatabase
+
+PLANS_DIR = TMP_DIR / "plans"
+# Smaller tables are cheaper to scan than to look up through an index.
+SEQ_SCAN_ROWS = 10_000
+BUFFER_FACTOR = 1.5
+# Allowance for queries that touch a handful of buffers either way.
+BUFFER_SLACK = 50
+
+
+@dataclass
+class PlanSummary:
+    name: str
+    ms: float
+    buffers: int
+    # "Index Scan posts (idx_posts_created_at)", in plan order.
+    scans: list[str] = field(default_factory=list)
+    seq_scans: list[str] = field(default_factory=list)
+
+
+def _nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def summarize(name: str, explained: list[dict[str, Any]], row_counts: dict[str, float]) -> PlanSummary:
+    """Summary of one ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` result."""
+    root = explained[0]
+    plan = root["Plan"]
+    summary = PlanSummary(
+        name, round(root["Execution Time"], 3), plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+    )
+    for node in _nodes(plan):
+        relation = node.get("Relation Name")
+        if relation is None:
+            continue
+        index = node.get("Index Name")
+        summary.scans.append(f"{node['Node Type']} {relation}" + (f" ({index})" if index else ""))
+        if node["Node Type"] == "Seq Scan" and row_counts.get(relation, 0) >= SEQ_SCAN_ROWS:
+            if relation not in summary.seq_scans:
+                summary.seq_scans.append(relation)
+    return summary
+
+
+def regressions(current: PlanSummary, accepted: dict[str, Any], compare_buffers: bool = True) -> list[str]:
+    problems = [f"seq scan on {relation}" for relation in current.seq_scans if relation not in accepted["seq_scans"]]
+    if compare_buffers:
+        limit = max(accepted["buffers"] * BUFFER_FACTOR, accepted["buffers"] + BUFFER_SLACK)
+        if current.buffers > limit:
+            problems.append(f"{current.buffers} buffers, accepted {accepted['buffers']}")
+    return problems
+
+
+def row_counts(conn: psycopg.Connection) -> dict[str, float]:
+    rows = conn.execute(
+        "SELECT relname, reltuples FROM pg_class WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+    )
+    return dict(rows)
+
+
+def explain(conn: psycopg.Connection, query: AppQuery, params: dict[str, Any]) -> list[dict[str, Any]]:
+    # Values are inlined client-side, so the planner sees them as PostgREST's custom plans do.
+    with psycopg.ClientCursor(conn) as cursor:
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query.sql, params)
+        return cursor.fetchone()[0]
+
+
+def load_baseline(path: Path = QUERY_PLANS_PATH) -> dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {"scale": None, "queries": {}}
+
+
+def run_plans(dsn: str, queries: list[AppQuery], run_dir: Path) -> list[PlanSummary]:
+    run_dir.mkdir(parents=True, exist_ok=True)
+    summaries = []
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute("SET jit = off")  # compile time would swamp the timings of small queries
+        counts = row_counts(conn)
+        params = fixtures(conn)
+        for query in queries:
+            explained = explain(conn, query, params)
+            (run_dir / f"{query.name}.json").write_text(json.dumps(explained, indent=2), encoding="utf-8")
+            summaries.append(summarize(query.name, explained, counts))
+    return summaries
+
+
+def format_summary(summary: PlanSummary, problems: list[str], status: str = "") -> str:
+    status = status or ("FAIL" if problems else "ok")
+    line = f"{status:<5} {summary.ms:9.2f} ms {summary.buffers:8d} buffers  {summary.name}"
+    details = problems or summary.scans[:1]
+    return "\n".join([line] + [f"      {detail}" for detail in details])
+
+
+def save_baseline(scale: str | None, accepted: dict[str, Any], path: Path = QUERY_PLANS_PATH) -> None:
+    path.write_text(
+        json.dumps({"scale": scale, "queries": dict(sorted(accepted.items()))}, indent=2, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+
+
+def _accepted(summary: PlanSummary) -> dict[str, Any]:
+    return {k: v for k, v in asdict(summary).items() if k != "name"}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m testsprite_tests.harness.pg.plans", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("queries", nargs="*", help="only these queries, or query groups such as 'feed'")
+    parser.add_argument("--scale", choices=SCALES, default="medium", help="dataset size to plan against")
+    parser.add_argument("--dsn", help="Postgres server to build the scaled database on (default: SUPABASE_DB_URL)")
+    parser.add_argument("--database", metavar="DSN", help="plan against this database as is instead")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help=f"accept the current plans into {QUERY_PLANS_PATH.name}"
+    )
+    args = parser.parse_args(argv)
+    queries = by_name(args.queries)
+    if not queries:
+        print("no query matched", file=sys.stderr)
+        return 2
+    dsn = args.database or scaled_database(TemplateDatabase(args.dsn or load_config().database_url), args.scale)
+    scale = None if args.database else args.scale
+    baseline = load_baseline()
+    # Buffer counts only compare between datasets of the same size.
+    same_scale = scale is not None and baseline["scale"] == scale
+    run_dir = PLANS_DIR / datetime.now().strftime("%Y%m%d-%H%M%S")
+    started = time.perf_counter()
+    summaries = run_plans(dsn, queries, run_dir)
+    failed = 0
+    new = []
+    for summary in summaries:
+        accepted = baseline["queries"].get(summary.name)
+        if accepted is None:
+            new.append(summary)
+            print(format_summary(summary, [], "new"))
+            continue
+        problems = regressions(summary, accepted, same_scale)
+        failed += bool(problems)
+        print(format_summary(summary, problems))
+    print(f"\n{len(summaries) - failed - len(new)}/{len(summaries)} query plans accepted, {len(new)} new "
+          f"({time.perf_counter() - started:.1f}s; plans in {run_dir})")
+    if not same_scale and baseline["queries"]:
+        print(f"buffers not compared: baseline is for scale {baseline['scale']!r}, this run {scale!r}")
+    if args.update_baseline:
+        accepted = baseline["queries"] if baseline["scale"] == scale else {}
+        accepted.update({s.name: _accepted(s) for s in summaries})
+        save_baseline(scale, accepted)
+        print(f"accepted {len(summaries)} plans into {QUERY_PLANS_PATH}")
+        return 0
+    if new:
+        # A baseline only holds plans of one scale; plans of another are reported, not recorded.
+        if scale is not None and baseline["scale"] in (None, scale):
+            save_baseline(scale, {**baseline["queries"], **{s.name: _accepted(s) for s in new}})
+            print(f"recorded {len(new)} new plans into {QUERY_PLANS_PATH}; review and commit them")
+        else:
+            print(f"{len(new)} new plans not recorded: rerun with --scale {baseline['scale'] or 'medium'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Catalogue of the queries the app sends through PostgREST, as plain SQL.
+
+Each :class:`AppQuery` is the SQL PostgREST runs for one ``supabase.from()``
+or ``supabase.rpc()`` call in ``app/`` or ``components/``, with the embeds
+written as joins and RPCs as a call of the function (``get_feed`` is plain
+SQL, which the planner inlines into the query).  Counts are columns kept
+up to date by triggers (migration ``011``), so no query counts rows.
+Values the app fills in at run time are named parameters; :func:`fixtures`
+picks them from the database so they hit real rows: ``viewer`` is the most
+active synthetic profile (see :mod:`.synthetic`), ``post`` the newest one,
+``events``/``comments`` the ids a screen lists and then looks up in one
+``.in()`` filter, ``cursor_created_at``/``cursor_id`` the feed cursor
+``DEEP_PAGE`` pages down, ``pattern`` a search term that occurs in the
+generated text.
+
+Only reads are catalogued: they are what the screens wait for, and they
+can be run under ``EXPLAIN ANALYZE`` without changing the data.
+"""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+import psycopg
+
+from .synthetic import PROFILE, row_id
+
+
+class AppQuery(NamedTuple):
+    name: str
+    # File and function (or query) of the app the SQL mirrors.
+    source: str
+    sql: str
+
+
+QUERIES = (
+    AppQuery(
+        "feed",
+        "app/(tabs)/index.tsx fetchPosts",
+        "SELECT * FROM get_feed(%(viewer)s, NULL, NULL, 20)",
+    ),
+    AppQuery(
+        "feed.deep",
+        "app/(tabs)/index.tsx fetchPosts (onEndReached, far down the feed)",
+        "SELECT * FROM get_feed(%(viewer)s, %(cursor_created_at)s, %(cursor_id)s, 20)",
+    ),
+    AppQuery(
+        "comments",
+        "components/CommentsModal.tsx fetchComments",
+        """SELECT c.*, pr.username, pr.avatar_url FROM comments c
+           LEFT JOIN profiles pr ON pr.id = c.user_id
+           WHERE c.post_id = %(post)s AND c.deleted_at IS NULL ORDER BY c.created_at ASC""",
+    ),
+    AppQuery(
+        "comments.liked",
+        "components/CommentsModal.tsx fetchComments (one .in() for the listed comments)",
+        "SELECT comment_id FROM comment_likes WHERE comment_id = ANY (%(comments)s) AND user_id = %(viewer)s",
+    ),
+    AppQuery(
+        "messages.sent",
+        "app/(tabs)/messages.tsx fetchConversations",
+        """SELECT m.*, r.username FROM direct_messages m
+           JOIN profiles r ON r.id = m.recipient_id
+           WHERE m.sender_id = %(viewer)s AND NOT (m.deleted_by @> ARRAY[%(viewer)s]::uuid[])
+           ORDER BY m.created_at DESC""",
+    ),
+    AppQuery(
+        "messages.received",
+        "app/(tabs)/messages.tsx fetchConversations",
+        """SELECT m.*, s.username FROM direct_messages m
+           JOIN profiles s ON s.id = m.sender_id
+           WHERE m.recipient_id = %(viewer)s AND NOT (m.deleted_by @> ARRAY[%(viewer)s]::uuid[])
+           ORDER BY m.created_at DESC""",
+    ),
+    AppQuery(
+        "search.profiles",
+        "components/SearchModal.tsx performSearch",
+        """SELECT id, username, full_name, avatar_url, bio FROM profiles
+           WHERE username ILIKE %(pattern)s OR full_name ILIKE %(pattern)s LIMIT 10""",
+    ),
+    AppQuery(
+        "search.posts",
+        "components/SearchModal.tsx performSearch",
+        """SELECT p.id, p.content, p.created_at, p.media_urls, pr.username, pr.avatar_url FROM posts p
+           LEFT JOIN profiles pr ON pr.id = p.user_id
+           WHERE p.content ILIKE %(pattern)s AND p.deleted_at IS NULL LIMIT 10""",
+    ),
+    AppQuery(
+        "search.hashtags",
+        "components/SearchModal.tsx performSearch",
+        "SELECT hashtag, count FROM hashtag_usage WHERE hashtag ILIKE %(pattern)s ORDER BY count DESC LIMIT 10",
+    ),
+    AppQuery(
+        "search.trending",
+        "components/SearchModal.tsx fetchTrendingHashtags",
+        "SELECT hashtag, count FROM hashtag_usage ORDER BY count DESC LIMIT 10",
+    ),
+    AppQuery(
+        "admin.pending_reports",
+        "app/(tabs)/admin.tsx fetchReports",
+        """SELECT r.*, p.id, p.content, author.username, reporter.username FROM post_reports r
+           LEFT JOIN posts p ON p.id = r.post_id
+           LEFT JOIN profiles author ON author.id = p.user_id
+           LEFT JOIN profiles reporter ON reporter.id = r.reported_by
+           WHERE r.status = 'pending' ORDER BY r.created_at DESC""",
+    ),
+    AppQuery(
+        "events.upcoming",
+        "app/(tabs)/events.tsx fetchEvents",
+        "SELECT * FROM events WHERE start_time >= now() ORDER BY start_time ASC LIMIT 50",
+    ),
+    AppQuery(
+        "events.past",
+        "app/(tabs)/events.tsx fetchEvents",
+        "SELECT * FROM events WHERE start_time < now() ORDER BY start_time DESC LIMIT 50",
+    ),
+    AppQuery(
+        "events.joined",
+        "app/(tabs)/events.tsx fetchEvents (one .in() for the listed events)",
+        """SELECT event_id FROM event_participants
+           WHERE event_id = ANY (%(events)s) AND user_id = %(viewer)s AND status = 'going'""",
+    ),
+    AppQuery(
+        "marketplace",
+        "app/(tabs)/marketplace.tsx fetchItems",
+        """SELECT i.*, pr.username FROM marketplace_items i
+           LEFT JOIN profiles pr ON pr.id = i.seller_id
+           WHERE i.status = 'active' ORDER BY i.created_at DESC""",
+    ),
+    AppQuery(
+        "marketplace.category",
+        "app/(tabs)/marketplace.tsx fetchItems (category chip)",
+        """SELECT i.*, pr.username FROM marketplace_items i
+           LEFT JOIN profiles pr ON pr.id = i.seller_id
+           WHERE i.status = 'active' AND i.category = %(category)s ORDER BY i.created_at DESC""",
+    ),
+    AppQuery(
+        "notifications",
+        "app/(tabs)/notifications.tsx fetchNotifications",
+        "SELECT * FROM notifications WHERE user_id = %(viewer)s ORDER BY created_at DESC LIMIT 50",
+    ),
+    AppQuery(
+        "profile.posts",
+        "app/(tabs)/profile.tsx fetchUserPosts",
+        "SELECT * FROM posts WHERE user_id = %(viewer)s AND deleted_at IS NULL ORDER BY created_at DESC LIMIT 20",
+    ),
+    AppQuery(
+        "profile",
+        "app/(tabs)/profile.tsx fetchProfile",
+        "SELECT * FROM profiles WHERE id = %(viewer)s",
+    ),
+    AppQuery(
+        "ads.banner",
+        "components/AdBanner.tsx fetchAd",
+        """SELECT * FROM advertisements
+           WHERE position = 'home_top' AND type = 'banner' AND status = 'active' AND start_date <= now()
+             AND (end_date IS NULL OR end_date >= now())
+           ORDER BY priority DESC LIMIT 1""",
+    ),
+)
+
+# A word the synthetic text generator uses, so searches find rows.
+SEARCH_TERM = "takım"
+# How far down the feed ``feed.deep`` starts; its cost should match ``feed``'s.
+DEEP_PAGE = 500
+
+
+def _first(conn: psycopg.Connection, query: str, params: tuple = ()) -> Any:
+    row = conn.execute(query, params).fetchone()
+    return row[0] if row else None
+
+
+def _column(conn: psycopg.Connection, query: str, params: tuple = ()) -> list[Any]:
+    return [row[0] for row in conn.execute(query, params)]
+
+
+def fixtures(conn: psycopg.Connection) -> dict[str, Any]:
+    """Parameter values for :data:`QUERIES` taken from the database of ``conn``."""
+    viewer = _first(conn, "SELECT id FROM profiles WHERE id = %s", (row_id(PROFILE, 0),))
+    if viewer is None:  # not a synthetic dataset: the newest post's author
+        viewer = _first(conn, "SELECT user_id FROM posts ORDER BY created_at DESC LIMIT 1")
+    post = _first(conn, "SELECT id FROM posts WHERE deleted_at IS NULL ORDER BY created_at DESC LIMIT 1")
+    cursor = conn.execute(
+        """SELECT created_at, id FROM posts WHERE deleted_at IS NULL
+           ORDER BY created_at DESC, id DESC OFFSET %s LIMIT 1""",
+        (DEEP_PAGE * 20 - 1,),
+    ).fetchone() or (None, None)
+    return {
+        "viewer": viewer,
+        "post": post,
+        "cursor_created_at": cursor[0],
+        "cursor_id": cursor[1],
+        "events": _column(conn, "SELECT id FROM events ORDER BY start_time DESC LIMIT 50"),
+        "comments": _column(conn, "SELECT id FROM comments WHERE post_id = %s AND deleted_at IS NULL", (post,)),
+        "pattern": f"%{SEARCH_TERM}%",
+        "category": "ekipman",
+    }
+
+
+def by_name(names: list[str]) -> list[AppQuery]:
+    """The catalogued queries named in ``names`` or starting with ``name.`` (all of them if empty)."""
+    if not names:
+        return list(QUERIES)
+    return [q for q in QUERIES if any(q.name == n or q.name.startswith(n + ".") for n in names)]
@@ -0,0 +1,220 @@
+"""What the RLS policies cost, per query, per table and per policy.
+
+The SELECT policies on ``likes`` and ``comments`` (``002``, rewritten by
+``009``–``013``) run a correlated ``EXISTS`` against ``posts`` — and, for
+``followers_only`` posts, ``follows`` — for every row they let through.
+This benchmark measures that before any of them is rewritten:
+
+* every catalogued query (:mod:`.queries`) runs as ``authenticated`` with
+  ``request.jwt.claims`` set to the viewer, the way PostgREST runs it, and
+  as ``service_role``, which bypasses RLS; the difference is the query's
+  RLS overhead;
+* a probe reading ``PROBE_ROWS`` rows of each table the queries touch
+  gives the table's overhead per row;
+* the probe is repeated with one SELECT policy at a time (the others are
+  dropped in a transaction that is rolled back), which attributes the
+  table's overhead to its policies.
+
+Times are the median ``Execution Time`` of ``REPEAT`` runs of ``EXPLAIN
+(ANALYZE, TIMING OFF)``, so neither the network nor per-node timing
+skews them.  Each scale is a separate copy of the template
+(:func:`.synthetic.scaled_database`) and results are written to
+``tmp/rls/``.  Usage (from the repository root)::
+
+    python -m testsprite_tests.harness.pg.rls [QUERY ...] [--scales small medium]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any
+
+import psycopg
+from psycopg import sql
+
+from ..config import TMP_DIR, load_config
+from .queries import AppQuery, by_name, fixtures
+from .synthetic import SCALES, scaled_database
+from .template import TemplateDatabase
+
+RLS_DIR = TMP_DIR / "rls"
+REPEAT = 5
+PROBE_ROWS = 100_000
+USER_ROLE = "authenticated"
+BYPASS_ROLE = "service_role"
+
+# Names followed by "(" are set-returning functions such as get_feed, not tables.
+_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)\b(?!\s*\()", re.I)
+
+
+@dataclass
+class QueryCost:
+    name: str
+    bypass_ms: float
+    rls_ms: float
+
+    @property
+    def overhead_ms(self) -> float:
+        return self.rls_ms - self.bypass_ms
+
+
+@dataclass
+class PolicyCost:
+    table: str
+    policy: str
+    # Probe time with only this SELECT policy in place, minus the bypass time.
+    overhead_ms: float
+
+
+@dataclass
+class TableCost:
+    table: str
+    rows: int
+    bypass_ms: float
+    rls_ms: float
+    policies: list[PolicyCost] = field(default_factory=list)
+
+    @property
+    def us_per_row(self) -> float:
+        return (self.rls_ms - self.bypass_ms) * 1000 / max(self.rows, 1)
+
+
+@dataclass
+class ScaleReport:
+    scale: str
+    queries: list[QueryCost] = field(default_factory=list)
+    tables: list[TableCost] = field(default_factory=list)
+
+
+def tables_of(query: AppQuery) -> list[str]:
+    return list(dict.fromkeys(_TABLES.findall(query.sql)))
+
+
+class Session:
+    """One connection that switches between the PostgREST user role and the bypass role."""
+
+    def __init__(self, conn: psycopg.Connection, viewer: str):
+        self.conn = conn
+        self.claims = json.dumps({"sub": str(viewer), "role": USER_ROLE})
+        self.viewer = str(viewer)
+
+    def as_role(self, role: str) -> None:
+        self.conn.execute(sql.SQL("SET ROLE {}").format(sql.Identifier(role)))
+        if role == USER_ROLE:
+            self.conn.execute("SELECT set_config('request.jwt.claims', %s, false)", (self.claims,))
+            self.conn.execute("SELECT set_config('request.jwt.claim.sub', %s, false)", (self.viewer,))
+
+    def time(self, role: str, query: str, params: dict[str, Any] | None = None) -> float:
+        """Median execution time of ``query`` as ``role``, in milliseconds."""
+        runs = []
+        try:
+            self.as_role(role)
+            with psycopg.ClientCursor(self.conn) as cursor:
+                for _ in range(REPEAT):
+                    cursor.execute("EXPLAIN (ANALYZE, TIMING OFF, FORMAT JSON) " + query, params)
+                    runs.append(cursor.fetchone()[0][0]["Execution Time"])
+        finally:
+            # A failed query must not leave the next one running under this role.
+            self.conn.execute("RESET ROLE")
+        return statistics.median(runs)
+
+
+def probe(table: str) -> str:
+    return f"SELECT count(*) FROM (SELECT 1 FROM {table} LIMIT {PROBE_ROWS}) AS probe"
+
+
+def select_policies(conn: psycopg.Connection, table: str) -> list[str]:
+    rows = conn.execute(
+        "SELECT policyname FROM pg_policies WHERE schemaname = 'public' AND tablename = %s"
+        " AND cmd IN ('SELECT', 'ALL') AND permissive = 'PERMISSIVE'"
+        " AND roles && ARRAY['public', %s]::name[] ORDER BY policyname",
+        (table, USER_ROLE),
+    )
+    return [name for (name,) in rows]
+
+
+def measure_table(session: Session, table: str) -> TableCost:
+    conn = session.conn
+    rows = conn.execute(
+        sql.SQL("SELECT count(*) FROM (SELECT 1 FROM {} LIMIT %s) AS t").format(sql.Identifier(table)), (PROBE_ROWS,)
+    ).fetchone()[0]
+    cost = TableCost(table, rows, session.time(BYPASS_ROLE, probe(table)), session.time(USER_ROLE, probe(table)))
+    policies = select_policies(conn, table)
+    if len(policies) < 2:
+        # A single policy is the whole table overhead.
+        cost.policies = [PolicyCost(table, name, cost.rls_ms - cost.bypass_ms) for name in policies]
+        return cost
+    for kept in policies:
+        with conn.transaction():
+            for name in policies:
+                if name != kept:
+                    conn.execute(sql.SQL("DROP POLICY {} ON {}").format(sql.Identifier(name), sql.Identifier(table)))
+            alone = session.time(USER_ROLE, probe(table))
+            raise psycopg.Rollback()
+        cost.policies.append(PolicyCost(table, kept, alone - cost.bypass_ms))
+    return cost
+
+
+def benchmark(dsn: str, scale: str, queries: list[AppQuery]) -> ScaleReport:
+    report = ScaleReport(scale)
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute("SET jit = off")
+        params = fixtures(conn)
+        session = Session(conn, params["viewer"])
+        for query in queries:
+            bypass = session.time(BYPASS_ROLE, query.sql, params)
+            report.queries.append(QueryCost(query.name, bypass, session.time(USER_ROLE, query.sql, params)))
+        for table in dict.fromkeys(t for query in queries for t in tables_of(query)):
+            report.tables.append(measure_table(session, table))
+    return report
+
+
+def format_report(report: ScaleReport) -> str:
+    lines = [f"scale {report.scale}", f"  {'query':<28} {'bypass':>10} {'rls':>10} {'overhead':>10}"]
+    for cost in sorted(report.queries, key=lambda c: -c.overhead_ms):
+        ratio = cost.rls_ms / cost.bypass_ms if cost.bypass_ms else float("inf")
+        lines.append(
+            f"  {cost.name:<28} {cost.bypass_ms:8.2f}ms {cost.rls_ms:8.2f}ms {cost.overhead_ms:+8.2f}ms"
+            f"  ({ratio:.1f}x)"
+        )
+    lines.append(f"  {'table':<28} {'rows':>10} {'µs/row':>10}  policy overhead (probe ms)")
+    for table in sorted(report.tables, key=lambda t: -t.us_per_row):
+        lines.append(f"  {table.table:<28} {table.rows:10d} {table.us_per_row:10.2f}")
+        for policy in sorted(table.policies, key=lambda p: -p.overhead_ms):
+            lines.append(f"      {policy.overhead_ms:+9.2f}ms  {policy.policy}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m testsprite_tests.harness.pg.rls", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("queries", nargs="*", help="only these queries, or query groups such as 'feed'")
+    parser.add_argument("--scales", nargs="+", choices=SCALES, default=["small", "medium"])
+    parser.add_argument("--dsn", help="Postgres server to build the scaled databases on (default: SUPABASE_DB_URL)")
+    args = parser.parse_args(argv)
+    queries = by_name(args.queries)
+    if not queries:
+        print("no query matched", file=sys.stderr)
+        return 2
+    template = TemplateDatabase(args.dsn or load_config().database_url)
+    reports = []
+    for scale in args.scales:
+        report = benchmark(scaled_database(template, scale), scale, queries)
+        print(format_report(report), flush=True)
+        reports.append(report)
+    RLS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RLS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    path.write_text(json.dumps([asdict(r) for r in reports], indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nresults in {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""Squash the migration chain into one baseline schema.
+
+``supabase/migrations`` creates ``marketplace_items`` twice (``006`` and
+``004``) and ``notifications`` twice (``005`` and ``007``), and ``008`` to
+``013`` drop and recreate the RLS policies again and again; a fresh
+database replays all of it, retry passes included (:mod:`.template`).
+This tool
+
+1. applies the chain to a scratch database (after :mod:`.bootstrap`);
+2. dumps its schema with ``pg_dump --schema-only``, plus the policies and
+   triggers the migrations put on Supabase's own ``auth`` and ``storage``
+   tables (the ``storage.objects`` policies, the ``008`` signup trigger),
+   which a dump of ``public`` leaves out;
+3. applies that baseline to a second scratch database, dumps it the same
+   way and writes ``supabase/baseline.sql`` only if both schemas match
+   line for line.
+
+Demo data stays out of the baseline, as it stays out of the template.  The
+baseline's header names the fingerprint of the chain it was made from;
+:class:`.TemplateDatabase` applies it instead of the chain only while that
+matches, so a new migration falls back to the replay until the baseline is
+regenerated.  ``--check`` verifies the existing baseline instead of
+writing one, for CI.  Usage (from the repository root)::
+
+    python -m testsprite_tests.harness.pg.squash [--check] [--keep] [--pg-dump PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import psycopg
+from psycopg import sql
+
+from ..config import BASELINE_PATH, load_config
+from .bootstrap import BOOTSTRAP_SQL
+from .template import (
+    BASELINE_HEADER,
+    MigrationReport,
+    admin_connection,
+    apply_migrations,
+    chain_fingerprint,
+    current_baseline,
+    drop_database,
+    schema_migrations,
+    with_database,
+)
+
+SCRATCH_PREFIX = "airsoftvibe_squash_"
+# Supabase's own schemas: :mod:`.bootstrap` creates them here, the platform does in production.
+PLATFORM_SCHEMAS = ("auth", "storage")
+DUMP_OPTIONS = (
+    "--schema-only",
+    "--no-owner",
+    "--no-publications",
+    "--no-subscriptions",
+    *(f"--exclude-schema={schema}" for schema in PLATFORM_SCHEMAS),
+)
+# Diff lines printed when the schemas differ.
+DIFF_LINES = 200
+
+# pg_dump's own comments; comments inside function bodies are kept.
+_DUMP_COMMENT = re.compile(r"^--$|^-- (Name|Dumped from|Dumped by|PostgreSQL database dump)\b")
+
+_PLATFORM_POLICIES = """
+SELECT format('CREATE POLICY %%I ON %%I.%%I AS %%s FOR %%s TO %%s%%s%%s;', p.polname, n.nspname, c.relname,
+              CASE WHEN p.polpermissive THEN 'PERMISSIVE' ELSE 'RESTRICTIVE' END,
+              CASE p.polcmd WHEN 'r' THEN 'SELECT' WHEN 'a' THEN 'INSERT' WHEN 'w' THEN 'UPDATE'
+                            WHEN 'd' THEN 'DELETE' ELSE 'ALL' END,
+              CASE WHEN p.polroles = '{0}' THEN 'public'
+                   ELSE (SELECT string_agg(quote_ident(rolname), ', ' ORDER BY rolname)
+                         FROM pg_roles WHERE oid = ANY (p.polroles)) END,
+              ' USING (' || pg_get_expr(p.polqual, p.polrelid) || ')',
+              ' WITH CHECK (' || pg_get_expr(p.polwithcheck, p.polrelid) || ')')
+FROM pg_policy p JOIN pg_class c ON c.oid = p.polrelid JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = ANY (%s) ORDER BY n.nspname, c.relname, p.polname
+"""
+_PLATFORM_TRIGGERS = """
+SELECT pg_get_triggerdef(t.oid) || ';'
+FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE NOT t.tgisinternal AND n.nspname = ANY (%s) ORDER BY n.nspname, c.relname, t.tgname
+"""
+
+
+@dataclass
+class Squash:
+    baseline: str
+    report: MigrationReport
+    replay_seconds: float
+    baseline_seconds: float
+    # Unified diff of the replayed schema against the baseline's; empty when they match.
+    diff: list[str] = field(default_factory=list)
+
+
+def canonical(dump: str) -> str:
+    """``dump`` without pg_dump's comments and ``\\restrict`` lines, its settings local to one transaction."""
+    lines: list[str] = []
+    for line in dump.splitlines():
+        if _DUMP_COMMENT.match(line) or line.startswith("\\"):
+            continue
+        if line.startswith("SET "):
+            line = "SET LOCAL " + line[len("SET "):]
+        line = line.replace("set_config('search_path', '', false)", "set_config('search_path', '', true)")
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip() + "\n"
+
+
+def dump_schema(dsn: str, pg_dump: str) -> str:
+    result = subprocess.run([pg_dump, *DUMP_OPTIONS, "--dbname", dsn], capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"pg_dump failed: {result.stderr.strip()}")
+    return canonical(result.stdout)
+
+
+def platform_statements(conn: psycopg.Connection) -> list[str]:
+    """Policies and triggers on the tables of :data:`PLATFORM_SCHEMAS`, as statements."""
+    with conn.transaction():
+        # Print every name schema-qualified, as pg_dump does.
+        conn.execute("SET LOCAL search_path = ''")
+        schemas = list(PLATFORM_SCHEMAS)
+        return [row[0] for query in (_PLATFORM_POLICIES, _PLATFORM_TRIGGERS) for row in conn.execute(query, (schemas,))]
+
+
+def format_baseline(schema: str, platform: list[str], report: MigrationReport, paths: list[Path]) -> str:
+    header = [
+        BASELINE_HEADER.format(count=len(paths), fingerprint=chain_fingerprint(paths)),
+        "-- Generated by python -m testsprite_tests.harness.pg.squash; do not edit.",
+        *(f"-- not applied: {name}: {error}" for name, error in report.failed.items()),
+    ]
+    body = schema
+    if platform:
+        body += "\n-- Policies and triggers on Supabase's auth and storage tables.\n" + "\n".join(platform) + "\n"
+    return "\n".join(header) + "\n\n" + body
+
+
+def _bootstrapped(admin: psycopg.Connection, dsn: str, name: str) -> str:
+    drop_database(admin, name)
+    admin.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(name)))
+    dsn = with_database(dsn, name)
+    with psycopg.connect(dsn) as conn:
+        conn.execute(BOOTSTRAP_SQL)
+    return dsn
+
+
+def squash(dsn: str, pg_dump: str, baseline: str | None = None, keep: bool = False) -> Squash:
+    """Replay the chain and apply ``baseline`` (default: one dumped from the replay) in scratch databases."""
+    paths = schema_migrations()
+    chain, target = SCRATCH_PREFIX + "chain", SCRATCH_PREFIX + "baseline"
+    with admin_connection(dsn) as admin:
+        try:
+            chain_dsn = _bootstrapped(admin, dsn, chain)
+            target_dsn = _bootstrapped(admin, dsn, target)
+            with psycopg.connect(chain_dsn, autocommit=True) as conn:
+                started = time.perf_counter()
+                report = apply_migrations(conn, paths)
+                replay_seconds = time.perf_counter() - started
+                chain_platform = platform_statements(conn)
+            chain_schema = dump_schema(chain_dsn, pg_dump)
+            with psycopg.connect(target_dsn, autocommit=True) as conn:
+                # What the bootstrap creates is not the migrations' to keep.
+                bootstrap = set(platform_statements(conn))
+                if baseline is None:
+                    platform = [s for s in chain_platform if s not in bootstrap]
+                    baseline = format_baseline(chain_schema, platform, report, paths)
+                started = time.perf_counter()
+                with conn.transaction():
+                    conn.execute(baseline)
+                baseline_seconds = time.perf_counter() - started
+                target_platform = platform_statements(conn)
+            target_schema = dump_schema(target_dsn, pg_dump)
+        finally:
+            if not keep:
+                drop_database(admin, chain)
+                drop_database(admin, target)
+    diff = difflib.unified_diff(
+        (chain_schema + "\n".join(chain_platform)).splitlines(),
+        (target_schema + "\n".join(target_platform)).splitlines(),
+        "replayed chain",
+        "baseline",
+        lineterm="",
+    )
+    return Squash(baseline, report, replay_seconds, baseline_seconds, list(diff))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m testsprite_tests.harness.pg.squash", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--dsn", help="Postgres server for the scratch databases (default: SUPABASE_DB_URL)")
+    parser.add_argument("--pg-dump", default="pg_dump", help="pg_dump of the server's major version or newer")
+    parser.add_argument("--output", type=Path, default=BASELINE_PATH, help="baseline file to write or check")
+    parser.add_argument("--check", action="store_true", help="verify the existing baseline instead of writing one")
+    parser.add_argument("--keep", action="store_true", help=f"keep the {SCRATCH_PREFIX}* databases for inspection")
+    args = parser.parse_args(argv)
+    existing = None
+    if args.check:
+        current = current_baseline(args.output)
+        if current is None:
+            print(f"{args.output} is missing or was made from other migrations; regenerate it", file=sys.stderr)
+            return 1
+        existing = current[0]
+    try:
+        result = squash(args.dsn or load_config().database_url, args.pg_dump, existing, args.keep)
+    except psycopg.Error as exc:
+        print(f"squash failed: {exc}", file=sys.stderr)
+        return 1
+    print(result.report.describe())
+    print(f"chain replayed in {result.replay_seconds:.2f}s, baseline applied in {result.baseline_seconds:.2f}s")
+    if result.diff:
+        print("\n".join(result.diff[:DIFF_LINES]))
+        print(f"the baseline's schema differs from the replayed chain ({len(result.diff)} diff lines)")
+        return 1
+    if args.check:
+        print(f"{args.output} matches the migrations")
+        return 0
+    args.output.write_text(result.baseline, encoding="utf-8")
+    print(f"wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
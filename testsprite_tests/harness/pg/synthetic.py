@@ -0,0 +1,447 @@
+"""Production-sized synthetic data, streamed into Postgres with ``COPY``.
+
+The demo scripts hold a few hundred rows, which says nothing about how the
+feed, comment and marketplace queries behave with millions.  This module
+generates profiles, follows, posts, likes, saves, comments, listings,
+events, participants, direct messages and notifications at a chosen
+:class:`Scale` and writes each table through one ``COPY ... FROM STDIN``.
+Rows come from generators and go straight to the server, so memory stays
+flat however many are written.  No list of ids is ever built either: row
+``i`` of a table has the id ``UUID(int=(tag << 96) | i)``, so any table
+can reference it from its index alone.
+
+Distributions follow the shapes that matter for query plans:
+
+* authors, followed accounts, message recipients and likes per post are
+  power-law (a few profiles and posts get most of the activity);
+* comments are spread over posts the same way; 40% reply to an earlier
+  comment on the same post, up to ``MAX_REPLY_DEPTH`` levels of
+  ``parent_comment_id``;
+* ``created_at`` grows with the row index over the last ``DAYS`` days, as
+  if the rows had been inserted live.
+
+Triggers and foreign keys are skipped while loading
+(``session_replication_role = replica``, which needs a superuser such as
+the Supabase CLI's ``postgres``): the generator keeps references valid
+itself, and the ``008`` profile trigger would write its own rows.  The
+``011`` counter columns are filled afterwards by ``reconcile_counters(true)``,
+the bulk mode of the job that fixes their drift in production: one
+``GROUP BY`` update per counter rather than a recount per row.  Loading the
+``large`` scale takes minutes on a laptop.  Usage (from the repository
+root)::
+
+    python -m testsprite_tests.harness.pg.synthetic [--scale medium] [--posts N ...] [--into NAME]
+
+``scaled_database()`` gives the query-plan and benchmark tools a scaled
+copy of the template database, built once per scale and migrations.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator
+
+import psycopg
+from psycopg import sql
+
+from ..config import load_config
+from .template import TemplateDatabase, with_database
+
+SCALED_PREFIX = "airsoftvibe_scale_"
+DAYS = 365
+MAX_REPLY_DEPTH = 4
+REPLY_SHARE = 0.4
+# Pareto shape for the per-row fan-out (likes per post, follows per profile).
+FANOUT_ALPHA = 1.5
+PASSWORD = "synthetic"
+# A few bytes per row are enough; content length is not what plans depend on.
+WORDS = (
+    "airsoft", "oyun", "saha", "takım", "sniper", "taktik", "ekipman", "hafta", "sonu", "harika",
+    "turnuva", "maç", "yeni", "replika", "gözlük", "yelek", "antrenman", "ankara", "istanbul", "izmir",
+)
+HASHTAGS = ("airsoft", "milsim", "cqb", "sniper", "tactical", "gear", "weekend", "team")
+CATEGORIES = ("silah", "ekipman", "taktik_malzeme", "aksesuar", "koruma", "giyim", "diger")
+CONDITIONS = ("yeni", "sifir_gibi", "kullanilmis", "tamir_gerekli")
+# Every branch of the posts SELECT policy gets rows, the follows lookup included.
+VISIBILITIES = ("public", "followers_only", "private")
+VISIBILITY_WEIGHTS = (85, 10, 5)
+EVENT_TYPES = ("game", "tournament", "training", "meetup")
+NOTIFICATION_TYPES = ("like", "comment", "follow", "event", "message")
+
+
+@dataclass(frozen=True)
+class Scale:
+    profiles: int
+    posts: int
+    likes: int
+    comments: int
+    saves: int
+    follows: int
+    listings: int
+    events: int
+    participants: int
+    messages: int
+    notifications: int
+
+    @property
+    def rows(self) -> int:
+        # Each profile also gets an auth.users, privacy settings and XP row.
+        return sum(getattr(self, f.name) for f in fields(self)) + 3 * self.profiles
+
+
+SCALES = {
+    "small": Scale(1_000, 10_000, 100_000, 30_000, 10_000, 20_000, 2_000, 200, 5_000, 20_000, 20_000),
+    "medium": Scale(10_000, 500_000, 5_000_000, 1_500_000, 500_000, 200_000, 20_000, 2_000, 50_000, 500_000, 500_000),
+    "large": Scale(
+        100_000, 5_000_000, 50_000_000, 15_000_000, 5_000_000, 2_000_000, 200_000, 20_000, 500_000, 5_000_000,
+        5_000_000,
+    ),
+}
+
+# Tag of each table's ids (see the module docstring).
+PROFILE, POST, COMMENT, LISTING, EVENT = 1, 2, 3, 4, 5
+
+
+def row_id(tag: int, index: int) -> str:
+    return str(uuid.UUID(int=(tag << 96) | index))
+
+
+def skewed(rng: random.Random, n: int) -> int:
+    """Index in ``range(n)`` with P(rank r) ~ 1/r, scattered so rank 0 is not index 0."""
+    rank = int(n ** rng.random()) - 1
+    return (rank * 2_654_435_761) % n
+
+
+def fanout(rng: random.Random, mean: float, cap: int) -> int:
+    """Power-law count with the given mean, at most ``cap``."""
+    value = mean * (FANOUT_ALPHA - 1) / FANOUT_ALPHA * rng.paretovariate(FANOUT_ALPHA)
+    # Round at random so small means (one save per post) are not truncated to zero.
+    count = int(value) + (rng.random() < value % 1)
+    return min(cap, count)
+
+
+def distinct(rng: random.Random, n: int, k: int, exclude: int = -1) -> list[int]:
+    """``k`` distinct skewed indexes of ``range(n)`` (fewer if ``n`` runs out)."""
+    k = min(k, n - (0 <= exclude < n))
+    picked: set[int] = set()
+    draws = 0
+    while len(picked) < k:
+        # Uniform picks once the popular indexes are used up.
+        index = skewed(rng, n) if draws < 4 * k else rng.randrange(n)
+        draws += 1
+        if index != exclude:
+            picked.add(index)
+    return list(picked)
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+class Timeline:
+    """``created_at`` for row ``i`` of ``n``, spread evenly over the last ``DAYS`` days."""
+
+    def __init__(self, n: int, now: datetime):
+        self.start = now - timedelta(days=DAYS)
+        self.step = timedelta(days=DAYS) / max(n, 1)
+
+    def at(self, index: int) -> datetime:
+        return self.start + self.step * index
+
+
+@dataclass(frozen=True)
+class Table:
+    name: str
+    columns: tuple[str, ...]
+    rows: Callable[[Scale, random.Random, datetime], Iterator[tuple]]
+
+
+def _users(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.profiles, now)
+    for i in range(scale.profiles):
+        yield (
+            row_id(PROFILE, i), "00000000-0000-0000-0000-000000000000", "authenticated", "authenticated",
+            f"user{i}@synthetic.test", None, clock.at(i), '{"provider":"email","providers":["email"]}',
+            f'{{"username":"synthetic_{i}"}}', False, clock.at(i),
+        )
+
+
+def _profiles(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.profiles, now)
+    for i in range(scale.profiles):
+        role = "admin" if i % 10_000 == 0 else "moderator" if i % 1_000 == 0 else "user"
+        yield row_id(PROFILE, i), f"synthetic_{i}", f"Synthetic {i}", text(rng, 6), role, clock.at(i)
+
+
+def _privacy(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    for i in range(scale.profiles):
+        yield (row_id(PROFILE, i),)
+
+
+def _xp(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    for i in range(scale.profiles):
+        xp = fanout(rng, 500, 100_000)
+        yield row_id(PROFILE, i), xp, 1 + xp // 1000
+
+
+def _follows(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.follows, now)
+    written = 0
+    mean = scale.follows / max(scale.profiles, 1)
+    for follower in range(scale.profiles):
+        budget = scale.follows - written
+        if budget <= 0:
+            return
+        count = budget if follower == scale.profiles - 1 else fanout(rng, mean, budget)
+        for following in distinct(rng, scale.profiles, count, exclude=follower):
+            yield row_id(PROFILE, follower), row_id(PROFILE, following), clock.at(written)
+            written += 1
+
+
+def _posts(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.posts, now)
+    for i in range(scale.posts):
+        media = rng.random() < 0.3
+        yield (
+            row_id(POST, i), row_id(PROFILE, skewed(rng, scale.profiles)), text(rng, rng.randint(4, 30)),
+            '["https://picsum.photos/800"]' if media else "[]", "image" if media else "none",
+            rng.sample(HASHTAGS, rng.randint(0, 2)), rng.choices(VISIBILITIES, VISIBILITY_WEIGHTS)[0], clock.at(i),
+            clock.at(i) if rng.random() < 0.01 else None,
+        )
+
+
+def _per_post(scale: Scale, rng: random.Random, total: int) -> Iterator[tuple[int, list[int]]]:
+    """(post, distinct users) pairs adding up to about ``total`` rows, skewed towards popular posts."""
+    written = 0
+    mean = total / max(scale.posts, 1)
+    for post in range(scale.posts):
+        budget = total - written
+        if budget <= 0:
+            return
+        users = distinct(rng, scale.profiles, fanout(rng, mean, min(budget, scale.profiles)))
+        written += len(users)
+        yield post, users
+
+
+def _likes(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.posts, now)
+    for post, users in _per_post(scale, rng, scale.likes):
+        for user in users:
+            yield row_id(POST, post), row_id(PROFILE, user), clock.at(post)
+
+
+def _saves(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.posts, now)
+    for post, users in _per_post(scale, rng, scale.saves):
+        for user in users:
+            yield row_id(POST, post), row_id(PROFILE, user), clock.at(post)
+
+
+def _comments(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.posts, now)
+    index = 0
+    mean = scale.comments / max(scale.posts, 1)
+    for post in range(scale.posts):
+        if index >= scale.comments:
+            return
+        depths: list[tuple[int, int]] = []  # (comment index, depth) on this post
+        for _ in range(fanout(rng, mean, scale.comments - index)):
+            parent, depth = None, 0
+            if depths and rng.random() < REPLY_SHARE:
+                parent_index, parent_depth = rng.choice(depths)
+                if parent_depth < MAX_REPLY_DEPTH:
+                    parent, depth = row_id(COMMENT, parent_index), parent_depth + 1
+            depths.append((index, depth))
+            yield (
+                row_id(COMMENT, index), row_id(POST, post), row_id(PROFILE, skewed(rng, scale.profiles)), parent,
+                text(rng, rng.randint(2, 15)), clock.at(post) + timedelta(minutes=len(depths)),
+            )
+            index += 1
+
+
+def _listings(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.listings, now)
+    for i in range(scale.listings):
+        status = "sold" if rng.random() < 0.2 else "active"
+        yield (
+            row_id(LISTING, i), row_id(PROFILE, skewed(rng, scale.profiles)), text(rng, 4), text(rng, 20),
+            round(rng.uniform(100, 20_000), 2), rng.choice(CATEGORIES), rng.choice(CONDITIONS), status,
+            rng.randint(0, 500), clock.at(i),
+        )
+
+
+def _events(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.events, now)
+    for i in range(scale.events):
+        # Created up to a year ago, taking place from a month before to a month after creation.
+        start = clock.at(i) + timedelta(days=rng.uniform(-30, 30) + 30)
+        status = "completed" if start < now else "upcoming"
+        yield (
+            row_id(EVENT, i), row_id(PROFILE, skewed(rng, scale.profiles)), text(rng, 4), text(rng, 20),
+            rng.choice(("Ankara", "İstanbul", "İzmir", "Bursa")), rng.choice((20, 50, 100)), rng.choice(EVENT_TYPES),
+            status, start, start + timedelta(hours=6), clock.at(i),
+        )
+
+
+def _participants(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    written = 0
+    mean = scale.participants / max(scale.events, 1)
+    for event in range(scale.events):
+        budget = scale.participants - written
+        if budget <= 0:
+            return
+        for user in distinct(rng, scale.profiles, fanout(rng, mean, min(budget, 100))):
+            written += 1
+            yield row_id(EVENT, event), row_id(PROFILE, user), "going"
+
+
+def _messages(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.messages, now)
+    for i in range(scale.messages):
+        sender = rng.randrange(scale.profiles)
+        recipient = skewed(rng, scale.profiles)
+        if recipient == sender:
+            recipient = (recipient + 1) % scale.profiles
+        content = text(rng, rng.randint(1, 12))
+        yield row_id(PROFILE, sender), row_id(PROFILE, recipient), content, i % 3 != 0, clock.at(i)
+
+
+def _notifications(scale: Scale, rng: random.Random, now: datetime) -> Iterator[tuple]:
+    clock = Timeline(scale.notifications, now)
+    for i in range(scale.notifications):
+        kind = rng.choice(NOTIFICATION_TYPES)
+        yield row_id(PROFILE, skewed(rng, scale.profiles)), kind, kind, text(rng, 6), rng.random() < 0.7, clock.at(i)
+
+
+TABLES = (
+    Table(
+        "auth.users",
+        (
+            "id", "instance_id", "aud", "role", "email", "encrypted_password", "email_confirmed_at",
+            "raw_app_meta_data", "raw_user_meta_data", "is_super_admin", "created_at",
+        ),
+        _users,
+    ),
+    Table("profiles", ("id", "username", "full_name", "bio", "role", "created_at"), _profiles),
+    Table("user_privacy_settings", ("user_id",), _privacy),
+    Table("user_xp", ("user_id", "total_xp", "level"), _xp),
+    Table("follows", ("follower_id", "following_id", "created_at"), _follows),
+    Table(
+        "posts",
+        ("id", "user_id", "content", "media_urls", "media_type", "hashtags", "visibility", "created_at", "deleted_at"),
+        _posts,
+    ),
+    Table("likes", ("post_id", "user_id", "created_at"), _likes),
+    Table("post_saves", ("post_id", "user_id", "created_at"), _saves),
+    Table("comments", ("id", "post_id", "user_id", "parent_comment_id", "content", "created_at"), _comments),
+    Table(
+        "marketplace_items",
+        ("id", "seller_id", "title", "description", "price", "category", "condition", "status", "view_count",
+         "created_at"),
+        _listings,
+    ),
+    Table(
+        "events",
+        ("id", "creator_id", "title", "description", "location", "max_participants", "type", "status",
+         "start_time", "end_time", "created_at"),
+        _events,
+    ),
+    Table("event_participants", ("event_id", "user_id", "status"), _participants),
+    Table("direct_messages", ("sender_id", "recipient_id", "content", "is_read", "created_at"), _messages),
+    Table("notifications", ("user_id", "type", "title", "message", "is_read", "created_at"), _notifications),
+)
+
+
+def copy_rows(conn: psycopg.Connection, table: Table, rows: Iterator[tuple]) -> int:
+    schema, _, name = table.name.rpartition(".")
+    target = sql.Identifier(schema, name) if schema else sql.Identifier(name)
+    columns = sql.SQL(", ").join(map(sql.Identifier, table.columns))
+    statement = sql.SQL("COPY {} ({}) FROM STDIN").format(target, columns)
+    count = 0
+    with conn.cursor() as cursor, cursor.copy(statement) as copy:
+        for row in rows:
+            copy.write_row(row)
+            count += 1
+    return count
+
+
+def load(dsn: str, scale: Scale, seed: int = 0, log: Callable[[str], None] = print) -> dict[str, int]:
+    """Stream every table of ``scale`` into the database of ``dsn``; return rows written per table."""
+    written = {}
+    now = datetime.now(timezone.utc)
+    with psycopg.connect(dsn) as conn:
+        conn.execute("SET session_replication_role = replica")
+        password = conn.execute("SELECT crypt(%s, gen_salt('bf'))", (PASSWORD,)).fetchone()[0]
+        for table in TABLES:
+            started = time.perf_counter()
+            rng = random.Random(f"{seed}:{table.name}")
+            rows = table.rows(scale, rng, now)
+            if table.name == "auth.users":
+                rows = (row[:5] + (password,) + row[6:] for row in rows)
+            written[table.name] = copy_rows(conn, table, rows)
+            conn.commit()
+            seconds = time.perf_counter() - started
+            log(f"{table.name:<22} {written[table.name]:>11,} rows  {seconds:7.1f}s  "
+                f"({written[table.name] / max(seconds, 1e-9):,.0f} rows/s)")
+        started = time.perf_counter()
+        fixed = sum(row[1] for row in conn.execute("SELECT * FROM reconcile_counters(true)"))
+        conn.commit()
+        log(f"{'counters':<22} {fixed:>11,} rows  {time.perf_counter() - started:7.1f}s")
+        conn.autocommit = True
+        conn.execute("ANALYZE")
+    return written
+
+
+def scaled_database(template: TemplateDatabase, scale_name: str, seed: int = 0) -> str:
+    """DSN of a copy of the template loaded at ``SCALES[scale_name]``, built on first use."""
+    name = f"{SCALED_PREFIX}{scale_name}_{template.fingerprint}"
+    if not template.exists(name):
+        template.build()
+        building = name + "_build"
+        template.drop(building)
+        load(template.clone(building), SCALES[scale_name], seed)
+        template.rename(building, name)
+    return with_database(template.dsn, name)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m testsprite_tests.harness.pg.synthetic", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--dsn", help="Postgres server to use (default: SUPABASE_DB_URL)")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="row counts to start from")
+    for f in fields(Scale):
+        parser.add_argument(f"--{f.name}", type=int, metavar="N", help=f"override the number of {f.name}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--into",
+        metavar="NAME",
+        help="load into a new copy of the template database called NAME (default: the DSN's database as is)",
+    )
+    args = parser.parse_args(argv)
+    scale = replace(
+        SCALES[args.scale], **{f.name: getattr(args, f.name) for f in fields(Scale) if getattr(args, f.name)}
+    )
+    dsn = args.dsn or load_config().database_url
+    if args.into:
+        template = TemplateDatabase(dsn)
+        template.build()
+        template.drop(args.into)
+        dsn = template.clone(args.into)
+    print(f"loading {scale.rows:,} rows into {dsn}", flush=True)
+    started = time.perf_counter()
+    written = load(dsn, scale, args.seed, log=lambda line: print(line, flush=True))
+    total = sum(written.values())
+    seconds = time.perf_counter() - started
+    print(f"{total:,} rows in {seconds:.1f}s ({total / max(seconds, 1e-9):,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
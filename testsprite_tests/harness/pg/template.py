@@ -0,0 +1,304 @@
+"""Build the template database and clone it.
+
+The template is named after :func:`..config.migrations_fingerprint`, so a
+changed migration or demo script builds a new one and the old one is
+dropped.  It is built under a ``_build`` name and renamed only once
+complete: an interrupted build is never mistaken for a template.  An
+advisory lock keeps concurrent workers from building it twice.
+
+Migrations are applied in name order, each in its own transaction.  The
+timestamps do not match the order the files were written in
+(``20250125000000`` alters ``profiles`` before ``…195045_001`` creates it,
+the ``006`` marketplace migration precedes the ``004`` tables), so files
+that fail are retried after the others until a pass applies nothing new;
+what still fails is reported, not raised.  When ``supabase/baseline.sql``
+(:mod:`.squash`) was made from the current migrations, it is applied in
+one transaction instead of the chain.
+
+The database the backend serves (the Supabase CLI's is ``postgres``, which
+is never dropped) is reset in place by :meth:`TemplateDatabase.reset_data`:
+its ``public`` tables and ``auth.users`` are truncated and copied back
+from the template in one transaction, with triggers off so the counters
+and the profile trigger do not fire twice.  Truncating ``auth.users``
+cascades to GoTrue's sessions, so signed-in clients have to sign in again.
+"""
+
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import psycopg
+from psycopg import sql
+from psycopg.conninfo import conninfo_to_dict, make_conninfo
+from psycopg.types.json import Jsonb
+
+from ..config import (
+    BASELINE_PATH,
+    MIGRATIONS_DIR,
+    HarnessConfig,
+    files_fingerprint,
+    load_config,
+    migrations_fingerprint,
+)
+from ..standin.schema import EXTRA_TABLES, is_demo_data
+from ..standin.seed import DEMO_DATA_PATH, accounts
+from .bootstrap import BOOTSTRAP_SQL
+
+TEMPLATE_PREFIX = "airsoftvibe_tpl_"
+CLONE_PREFIX = "airsoftvibe_test_"
+# Databases the server itself needs; never dropped or restored.
+MAINTENANCE_DATABASES = ("postgres", "template0", "template1")
+APP_METADATA = {"provider": "email", "providers": ["email"]}
+BASELINE_HEADER = "-- Baseline of {count} schema migrations, chain {fingerprint}."
+
+_BASELINE_CHAIN = re.compile(r"-- Baseline of \d+ schema migrations, chain (\w+)\.")
+_NOT_APPLIED = re.compile(r"^-- not applied: (\S+): (.*)$", re.M)
+
+
+@dataclass
+class MigrationReport:
+    applied: list[str] = field(default_factory=list)
+    # File name -> first line of the error from its last attempt.
+    failed: dict[str, str] = field(default_factory=dict)
+    passes: int = 0
+
+    def describe(self) -> str:
+        line = f"{len(self.applied)} migrations applied in {self.passes} passes"
+        return "\n".join([line] + [f"  not applied: {name}: {error}" for name, error in self.failed.items()])
+
+
+def database_name(dsn: str) -> str:
+    return conninfo_to_dict(dsn).get("dbname") or "postgres"
+
+
+def with_database(dsn: str, name: str) -> str:
+    """``dsn`` pointing at database ``name`` of the same server."""
+    return make_conninfo(dsn, dbname=name)
+
+
+def schema_migrations(migrations_dir: Path = MIGRATIONS_DIR) -> list[Path]:
+    return [path for path in sorted(migrations_dir.glob("*.sql")) if not is_demo_data(path)]
+
+
+def chain_fingerprint(paths: list[Path] | None = None) -> str:
+    """Fingerprint of the schema migrations, the part of ``supabase/migrations`` a baseline replaces."""
+    return files_fingerprint(schema_migrations() if paths is None else paths)
+
+
+def current_baseline(path: Path = BASELINE_PATH) -> tuple[str, MigrationReport] | None:
+    """The baseline at ``path`` and the report of the chain it replaces, if made from the current chain."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    header = _BASELINE_CHAIN.match(text)
+    if header is None or header[1] != chain_fingerprint():
+        return None
+    # The header (up to the first blank line) lists what the chain did not apply.
+    failed = dict(_NOT_APPLIED.findall(text.split("\n\n", 1)[0]))
+    return text, MigrationReport([path.name], failed, passes=1)
+
+
+def apply_migrations(conn: psycopg.Connection, paths: list[Path]) -> MigrationReport:
+    report = MigrationReport()
+    pending = list(paths)
+    while pending:
+        report.passes += 1
+        failed = {}
+        for path in pending:
+            try:
+                with conn.transaction():
+                    conn.execute(path.read_text(encoding="utf-8"))
+            except psycopg.Error as exc:
+                failed[path.name] = str(exc).splitlines()[0]
+            else:
+                report.applied.append(path.name)
+        stuck = len(failed) == len(pending)
+        pending = [path for path in pending if path.name in failed]
+        if stuck:
+            report.failed = failed
+            break
+    return report
+
+
+def seed_users(conn: psycopg.Connection, config: HarnessConfig) -> None:
+    """Create the accounts of :func:`..standin.seed.accounts`; the ``008`` trigger adds their profiles."""
+    with conn.transaction():
+        for email, password, username, full_name, role in accounts(config):
+            user_id = conn.execute(
+                "INSERT INTO auth.users (instance_id, email, encrypted_password, email_confirmed_at,"
+                " raw_app_meta_data, raw_user_meta_data, is_super_admin, role, aud)"
+                " VALUES ('00000000-0000-0000-0000-000000000000', %s, crypt(%s, gen_salt('bf')), now(),"
+                " %s, %s, false, 'authenticated', 'authenticated') RETURNING id",
+                (email, password, Jsonb(APP_METADATA), Jsonb({"username": username, "full_name": full_name})),
+            ).fetchone()[0]
+            if role != "user":
+                conn.execute("UPDATE profiles SET role = %s WHERE id = %s", (role, user_id))
+
+
+def admin_connection(dsn: str) -> psycopg.Connection:
+    # CREATE/DROP DATABASE cannot run inside a transaction block.
+    return psycopg.connect(with_database(dsn, "postgres"), autocommit=True)
+
+
+def drop_database(conn: psycopg.Connection, name: str) -> None:
+    if name in MAINTENANCE_DATABASES:
+        raise ValueError(f"refusing to drop the {name!r} database")
+    if _exists(conn, name):
+        # Template databases cannot be dropped.
+        conn.execute(sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE false").format(sql.Identifier(name)))
+    conn.execute(sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(sql.Identifier(name)))
+
+
+def data_tables(conn: psycopg.Connection) -> dict[tuple[str, str], list[str]]:
+    """(schema, table) -> writable columns of the tables :meth:`TemplateDatabase.reset_data` replaces."""
+    rows = conn.execute(
+        "SELECT c.table_schema, c.table_name, array_agg(c.column_name::text ORDER BY c.ordinal_position)"
+        " FROM information_schema.columns c"
+        " JOIN information_schema.tables t USING (table_schema, table_name)"
+        " WHERE t.table_type = 'BASE TABLE' AND c.is_generated = 'NEVER'"
+        " AND (c.table_schema = 'public' OR (c.table_schema = 'auth' AND c.table_name = 'users'))"
+        " GROUP BY c.table_schema, c.table_name"
+    )
+    return {(schema, table): columns for schema, table, columns in rows}
+
+
+def _exists(conn: psycopg.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM pg_database WHERE datname = %s", (name,)).fetchone() is not None
+
+
+@dataclass
+class TemplateDatabase:
+    """Template built from the migrations and demo data on the server of ``dsn``."""
+
+    dsn: str
+    config: HarnessConfig = field(default_factory=load_config)
+    fingerprint: str = field(default_factory=migrations_fingerprint)
+    report: MigrationReport | None = None
+    # Apply a current ``supabase/baseline.sql`` instead of replaying the migrations.
+    use_baseline: bool = True
+
+    @property
+    def name(self) -> str:
+        return TEMPLATE_PREFIX + self.fingerprint
+
+    def build(self, force: bool = False) -> bool:
+        """Build the template unless it exists; return whether it was built."""
+        building = self.name + "_build"
+        with admin_connection(self.dsn) as admin:
+            admin.execute("SELECT pg_advisory_lock(hashtext(%s))", (self.name,))
+            if _exists(admin, self.name) and not force:
+                return False
+            drop_database(admin, building)
+            admin.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(building)))
+            try:
+                with psycopg.connect(with_database(self.dsn, building), autocommit=True) as conn:
+                    with conn.transaction():
+                        conn.execute(BOOTSTRAP_SQL)
+                    baseline = current_baseline() if self.use_baseline else None
+                    if baseline is None:
+                        self.report = apply_migrations(conn, schema_migrations())
+                    else:
+                        text, self.report = baseline
+                        with conn.transaction():
+                            conn.execute(text)
+                    with conn.transaction():
+                        conn.execute(EXTRA_TABLES)
+                    seed_users(conn, self.config)
+                    with conn.transaction():
+                        conn.execute(DEMO_DATA_PATH.read_text(encoding="utf-8"))
+                    conn.execute("VACUUM ANALYZE")
+            except BaseException:
+                drop_database(admin, building)
+                raise
+            drop_database(admin, self.name)
+            admin.execute(
+                sql.SQL("ALTER DATABASE {} RENAME TO {}").format(sql.Identifier(building), sql.Identifier(self.name))
+            )
+            admin.execute(sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE true").format(sql.Identifier(self.name)))
+            for stale in self.templates(admin):
+                if stale != self.name:
+                    drop_database(admin, stale)
+        return True
+
+    def templates(self, admin: psycopg.Connection) -> list[str]:
+        rows = admin.execute(
+            "SELECT datname FROM pg_database WHERE datname LIKE %s AND datname NOT LIKE %s ORDER BY datname",
+            (TEMPLATE_PREFIX + "%", "%\\_build"),
+        )
+        return [name for (name,) in rows]
+
+    def clone(self, name: str) -> str:
+        """Create database ``name`` as a copy of the template; return its DSN."""
+        with admin_connection(self.dsn) as admin:
+            admin.execute(
+                sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(sql.Identifier(name), sql.Identifier(self.name))
+            )
+        return with_database(self.dsn, name)
+
+    def restore(self, name: str | None = None) -> str:
+        """Replace database ``name`` (default: the one ``dsn`` names) with a fresh clone.
+
+        Connections to it are terminated; PostgREST and GoTrue reconnect on
+        their own.
+        """
+        name = name or database_name(self.dsn)
+        with admin_connection(self.dsn) as admin:
+            drop_database(admin, name)
+        return self.clone(name)
+
+    def reset_data(self, name: str | None = None) -> None:
+        """Replace the rows of database ``name`` (default: the one ``dsn`` names) with the template's.
+
+        Unlike :meth:`restore` the database itself stays, so this works on
+        the one PostgREST and GoTrue serve.  Columns only one side has are
+        left out of the copy; tables the template lacks end up empty.
+        """
+        target = with_database(self.dsn, name or database_name(self.dsn))
+        with psycopg.connect(with_database(self.dsn, self.name)) as source, psycopg.connect(target) as conn:
+            copied, tables = data_tables(source), data_tables(conn)
+            with conn.transaction():
+                conn.execute("SET LOCAL session_replication_role = replica")
+                if tables:
+                    truncated = sql.SQL(", ").join(sql.Identifier(*table) for table in tables)
+                    conn.execute(sql.SQL("TRUNCATE {} CASCADE").format(truncated))
+                for table, columns in copied.items():
+                    shared = [column for column in columns if column in tables.get(table, ())]
+                    if not shared:
+                        continue
+                    listed = sql.SQL(", ").join(map(sql.Identifier, shared))
+                    copy_out = sql.SQL("COPY {} ({}) TO STDOUT").format(sql.Identifier(*table), listed)
+                    copy_in = sql.SQL("COPY {} ({}) FROM STDIN").format(sql.Identifier(*table), listed)
+                    with source.cursor().copy(copy_out) as rows, conn.cursor().copy(copy_in) as into:
+                        for data in rows:
+                            into.write(data)
+
+    def drop(self, name: str) -> None:
+        with admin_connection(self.dsn) as admin:
+            drop_database(admin, name)
+
+    def exists(self, name: str) -> bool:
+        with admin_connection(self.dsn) as admin:
+            return _exists(admin, name)
+
+    def rename(self, old: str, new: str) -> str:
+        """Rename database ``old`` to ``new``, dropping any ``new``; return its DSN."""
+        with admin_connection(self.dsn) as admin:
+            drop_database(admin, new)
+            admin.execute(sql.SQL("ALTER DATABASE {} RENAME TO {}").format(sql.Identifier(old), sql.Identifier(new)))
+        return with_database(self.dsn, new)
+
+    @contextmanager
+    def cloned(self, name: str) -> Iterator[str]:
+        """A clone named ``CLONE_PREFIX + name`` for the duration of the block."""
+        clone = CLONE_PREFIX + name
+        self.drop(clone)
+        dsn = self.clone(clone)
+        try:
+            yield dsn
+        finally:
+            self.drop(clone)
@@ -0,0 +1,52 @@
+"""Read access to ``testsprite_frontend_test_plan.json``."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from .config import FRONTEND_PLAN_PATH
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    type: str
+    description: str
+
+
+@dataclass(frozen=True)
+class PlanEntry:
+    id: str
+    title: str
+    description: str
+    category: str
+    priority: str
+    steps: tuple[PlanStep, ...]
+
+    def mentions(self, *phrases: str) -> bool:
+        """True if any step description contains one of ``phrases`` (case-insensitive)."""
+        text = " ".join(step.description.lower() for step in self.steps)
+        return any(phrase.lower() in text for phrase in phrases)
+
+    @property
+    def exercises_login(self) -> bool:
+        """The test is about signing in/up itself, so it must not start logged in."""
+        return self.mentions("registration", "login page", "login form", "password")
+
+
+@lru_cache(maxsize=None)
+def load_plan(path: Path = FRONTEND_PLAN_PATH) -> dict[str, PlanEntry]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        item["id"]: PlanEntry(
+            id=item["id"],
+            title=item["title"],
+            description=item.get("description", ""),
+            category=item.get("category", ""),
+            priority=item.get("priority", ""),
+            steps=tuple(PlanStep(s["type"], s["description"]) for s in item.get("steps", [])),
+        )
+        for item in raw
+    }
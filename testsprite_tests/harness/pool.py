@@ -0,0 +1,136 @@
+"""A single Chromium instance shared by every test in a run.
+
+The generated tests start Playwright and launch their own browser.  Inside
+the pool they get stand-ins instead: ``async_playwright().start()`` and
+``chromium.launch()`` return the already running browser, ``new_context()``
+still creates a fresh, isolated ``BrowserContext``, and ``browser.close()`` /
+``pw.stop()`` become no-ops because the pool owns their lifetime.
+"""
+
+from __future__ import annotations
+
+import inspect
+import time
+from typing import Any, Awaitable, Callable
+
+from playwright import async_api
+
+from .config import BROWSER_ARGS
+
+ContextHook = Callable[[async_api.BrowserContext], "Awaitable[None] | None"]
+
+
+class BrowserPool:
+    def __init__(self, headless: bool = True, context_options: dict[str, Any] | None = None):
+        self.headless = headless
+        self.context_options = dict(context_options or {})
+        # Called with every context a test creates, e.g. to attach listeners.
+        self.context_hooks: list[ContextHook] = []
+        self.launch_seconds = 0.0
+        self._playwright: async_api.Playwright | None = None
+        self._browser: async_api.Browser | None = None
+        self._contexts: list[async_api.BrowserContext] = []
+
+    async def start(self) -> "BrowserPool":
+        started = time.perf_counter()
+        self._playwright = await async_api.async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=self.headless, args=BROWSER_ARGS)
+        self.launch_seconds = time.perf_counter() - started
+        return self
+
+    async def stop(self) -> None:
+        await self.release()
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+        self._browser = self._playwright = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
+
+    @property
+    def browser(self) -> async_api.Browser:
+        if self._browser is None:
+            raise RuntimeError("BrowserPool.start() has not been awaited")
+        return self._browser
+
+    async def new_context(self, **options: Any) -> async_api.BrowserContext:
+        context = await self.browser.new_context(**{**self.context_options, **options})
+        self._contexts.append(context)
+        for hook in self.context_hooks:
+            result = hook(context)
+            if inspect.isawaitable(result):
+                await result
+        return context
+
+    async def release(self) -> None:
+        """Close contexts a test left open (e.g. it failed before its ``finally``)."""
+        contexts, self._contexts = self._contexts, []
+        for context in contexts:
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+
+    def shim(self, **context_options: Any) -> "PooledAsyncApi":
+        """``async_api`` stand-in; ``context_options`` apply to every context the test creates."""
+        return PooledAsyncApi(self, context_options)
+
+
+class _PooledBrowser:
+    def __init__(self, pool: BrowserPool, context_options: dict[str, Any]):
+        self._pool = pool
+        self._context_options = context_options
+
+    async def new_context(self, **options: Any) -> async_api.BrowserContext:
+        return await self._pool.new_context(**{**self._context_options, **options})
+
+    async def close(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool.browser, name)
+
+
+class _PooledChromium:
+    def __init__(self, pool: BrowserPool, context_options: dict[str, Any]):
+        self._pool = pool
+        self._context_options = context_options
+
+    async def launch(self, **_: Any) -> _PooledBrowser:
+        return _PooledBrowser(self._pool, self._context_options)
+
+
+class _PooledPlaywright:
+    def __init__(self, pool: BrowserPool, context_options: dict[str, Any]):
+        self.chromium = _PooledChromium(pool, context_options)
+
+    async def stop(self) -> None:
+        pass
+
+
+class _PooledContextManager:
+    def __init__(self, pool: BrowserPool, context_options: dict[str, Any]):
+        self._pool = pool
+        self._context_options = context_options
+
+    async def start(self) -> _PooledPlaywright:
+        return _PooledPlaywright(self._pool, self._context_options)
+
+
+class PooledAsyncApi:
+    """Drop-in for the ``playwright.async_api`` module as seen by ``run_test``."""
+
+    def __init__(self, pool: BrowserPool, context_options: dict[str, Any] | None = None):
+        self._pool = pool
+        self._context_options = dict(context_options or {})
+
+    def async_playwright(self) -> _PooledContextManager:
+        return _PooledContextManager(self._pool, self._context_options)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(async_api, name)
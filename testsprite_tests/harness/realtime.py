@@ -0,0 +1,368 @@
+"""Fan-out simulator for the realtime channel of the notifications screen.
+
+``app/(tabs)/notifications.tsx`` subscribes every signed-in user to a
+``notifications_changes`` channel (``postgres_changes``, ``event: '*'``,
+filter ``user_id=eq.<user>``) and calls ``fetchNotifications`` — the 50
+newest notifications, over REST — on every event it receives.  This
+simulator opens the same subscription for N users, one websocket each as
+one device would, then inserts notifications for them at a fixed rate and
+measures
+
+* delivery latency, from the moment an ``INSERT`` is sent to the moment a
+  subscriber receives its change;
+* dropped events: changes a subscribed user never received (and
+  duplicates: changes received more often than the user is subscribed);
+* the refetch load the current client design puts on PostgREST: one
+  request per event per subscriber, how many of them start while the
+  previous one is still running, and their latencies.
+
+Subscribers use the accounts of :mod:`.load`
+(``load<i % accounts>@airsoftvibe.test``), so the two can run together.
+Like there, each account is signed in once and its subscribers share the
+token; accounts that cannot sign in are reported and fail the run.
+Every inserted row carries the run and a sequence number in ``data`` and
+is deleted once the subscribers have disconnected.  Realtime only streams
+tables of the ``supabase_realtime`` publication and no migration adds
+``notifications`` to it; ``--publish`` does.  Results are saved under
+``tmp/realtime/``.  Usage (from the repository root)::
+
+    python -m testsprite_tests.harness.realtime [--subscribers 500] [--rate 50] [--duration 60] [--no-refetch]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import aiohttp
+import psycopg
+import websockets
+from psycopg.types.json import Jsonb
+
+from .config import TMP_DIR, HarnessConfig, load_config
+from .load import Client, Metrics, sign_in_accounts
+from .timing import percentile
+
+REALTIME_DIR = TMP_DIR / "realtime"
+# supabase-js prefixes channel names with "realtime:".
+TOPIC = "realtime:notifications_changes"
+PUBLICATION = "supabase_realtime"
+# Phoenix closes sockets that send nothing for 60 seconds; supabase-js beats every 25.
+HEARTBEAT = 25
+JOIN_TIMEOUT = 30
+REFETCH = "notifications.refetch"
+
+INSERT = """INSERT INTO notifications (user_id, type, title, message, data)
+            VALUES (%s, 'system', 'Load test', %s, %s)"""
+
+
+@dataclass
+class FanOut:
+    """What was inserted and what the subscribers received, keyed by sequence number."""
+
+    run: str = field(default_factory=lambda: uuid.uuid4().hex)
+    # Seconds from opening the socket to "Subscribed to PostgreSQL".
+    joins: list[float] = field(default_factory=list)
+    join_failures: int = 0
+    disconnects: int = 0
+    # Sequence number -> (user, perf_counter when the INSERT was sent).
+    sent: dict[int, tuple[str, float]] = field(default_factory=dict)
+    # Sequence number -> perf_counter of every delivery.
+    received: dict[int, list[float]] = field(default_factory=dict)
+    # Changes Realtime delivered with an ``errors`` field (e.g. a failed RLS check).
+    change_errors: int = 0
+    # Refetches started while the same subscriber's previous one was still running.
+    overlapping: int = 0
+    refetched_rows: int = 0
+
+
+class Subscriber:
+    """One device on the notifications screen: a socket, the channel and the refetch on every event."""
+
+    def __init__(self, client: Client, fanout: FanOut, refetch: bool):
+        self.client = client
+        self.fanout = fanout
+        self.refetch = refetch
+        self.ready = asyncio.Event()
+        self.subscribed = False
+        self.refetches: set[asyncio.Task] = set()
+        self._in_flight = 0
+        self._ref = 0
+
+    def message(self, topic: str, event: str, payload: dict[str, Any], join_ref: str | None = None) -> str:
+        self._ref += 1
+        return json.dumps(
+            {"topic": topic, "event": event, "payload": payload, "ref": str(self._ref), "join_ref": join_ref}
+        )
+
+    def join(self) -> str:
+        change = {
+            "event": "*", "schema": "public", "table": "notifications", "filter": f"user_id=eq.{self.client.user_id}",
+        }
+        config = {
+            "broadcast": {"ack": False, "self": False},
+            "presence": {"key": ""},
+            "postgres_changes": [change],
+            "private": False,
+        }
+        return self.message(TOPIC, "phx_join", {"config": config, "access_token": self.client.token}, "1")
+
+    async def heartbeat(self, socket: Any) -> None:
+        while True:
+            await asyncio.sleep(HEARTBEAT)
+            await socket.send(self.message("phoenix", "heartbeat", {}))
+
+    async def run(self, url: str) -> None:
+        """Listen until cancelled; a socket closed before that counts as a disconnect."""
+        started = time.perf_counter()
+        try:
+            async with websockets.connect(url, ping_interval=None, max_queue=None) as socket:
+                await socket.send(self.join())
+                beating = asyncio.create_task(self.heartbeat(socket))
+                try:
+                    async for raw in socket:
+                        self.handle(json.loads(raw), started)
+                finally:
+                    beating.cancel()
+        except (OSError, websockets.WebSocketException):
+            pass
+        if self.subscribed:
+            self.fanout.disconnects += 1
+        else:
+            self.failed()
+
+    def failed(self) -> None:
+        if not self.ready.is_set():
+            self.fanout.join_failures += 1
+            self.ready.set()
+
+    def handle(self, message: dict[str, Any], started: float) -> None:
+        event, payload = message["event"], message["payload"]
+        if message["topic"] != TOPIC:
+            return
+        if event == "phx_reply" and payload.get("status") != "ok":
+            self.failed()
+        elif event == "system" and payload.get("extension") == "postgres_changes":
+            if payload.get("status") != "ok":
+                self.failed()
+            elif not self.ready.is_set():
+                self.subscribed = True
+                self.fanout.joins.append(time.perf_counter() - started)
+                self.ready.set()
+        elif event == "postgres_changes":
+            self.change(payload["data"])
+
+    def change(self, data: dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if data.get("errors"):
+            self.fanout.change_errors += 1
+        marker = (data.get("record") or {}).get("data") or {}
+        if data.get("type") == "INSERT" and marker.get("load_run") == self.fanout.run:
+            self.fanout.received.setdefault(marker["load_id"], []).append(now)
+        if self.refetch:
+            task = asyncio.create_task(self.fetch_notifications())
+            self.refetches.add(task)
+            task.add_done_callback(self.refetches.discard)
+
+    async def fetch_notifications(self) -> None:
+        # What the screen's event handler does, once per event and without waiting for the previous call.
+        self.fanout.overlapping += self._in_flight > 0
+        self._in_flight += 1
+        try:
+            rows = await self.client.rest(REFETCH, "notifications", {
+                "select": "*", "user_id": f"eq.{self.client.user_id}", "order": "created_at.desc", "limit": "50",
+            })
+            self.fanout.refetched_rows += len(rows)
+        finally:
+            self._in_flight -= 1
+
+
+def socket_url(config: HarnessConfig) -> str:
+    base = config.supabase_url.rstrip("/").replace("http", "ws", 1)
+    return f"{base}/realtime/v1/websocket?apikey={config.supabase_anon_key}&vsn=1.0.0"
+
+
+async def published(conn: psycopg.AsyncConnection, publish: bool) -> bool:
+    cursor = await conn.execute(
+        "SELECT 1 FROM pg_publication_tables WHERE pubname = %s AND schemaname = 'public'"
+        " AND tablename = 'notifications'",
+        (PUBLICATION,),
+    )
+    if await cursor.fetchone():
+        return True
+    if publish:
+        await conn.execute(f"ALTER PUBLICATION {PUBLICATION} ADD TABLE public.notifications")
+    return publish
+
+
+async def insert_notifications(
+    conn: psycopg.AsyncConnection, users: list[str], args: argparse.Namespace, fanout: FanOut
+) -> None:
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    for load_id in range(int(args.rate * args.duration)):
+        # Paced against the start, so a slow insert does not lower the rate.
+        delay = started + load_id / args.rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        user = rng.choice(users)
+        fanout.sent[load_id] = (user, time.perf_counter())
+        marker = Jsonb({"load_run": fanout.run, "load_id": load_id})
+        await conn.execute(INSERT, (user, f"load notification {load_id}", marker))
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    return {f"p{q}": round(percentile(values, q), 1) if values else 0.0 for q in (50, 95, 99)}
+
+
+def summarize(fanout: FanOut, subscribers: list[Subscriber], metrics: Metrics, seconds: float) -> dict[str, Any]:
+    per_user = Counter(s.client.user_id for s in subscribers if s.subscribed)
+    latencies, expected, delivered, duplicates = [], 0, 0, 0
+    for load_id, (user, sent) in fanout.sent.items():
+        received = fanout.received.get(load_id, [])
+        latencies.extend((at - sent) * 1000 for at in received)
+        expected += per_user[user]
+        delivered += min(len(received), per_user[user])
+        duplicates += max(len(received) - per_user[user], 0)
+    refetch = metrics.endpoints.get(REFETCH)
+    refetch_latencies = refetch.latencies if refetch else []
+    return {
+        "seconds": round(seconds, 1),
+        "subscribers": len(subscribers),
+        "subscribed": sum(per_user.values()),
+        "users": len(per_user),
+        "join_failures": fanout.join_failures,
+        "join_p95_ms": _percentiles([s * 1000 for s in fanout.joins])["p95"],
+        "disconnects": fanout.disconnects,
+        "inserted": len(fanout.sent),
+        "expected": expected,
+        "delivered": delivered,
+        "dropped": expected - delivered,
+        "duplicates": duplicates,
+        "change_errors": fanout.change_errors,
+        "latency_ms": {
+            **_percentiles(latencies),
+            "max": round(max(latencies, default=0.0), 1),
+        },
+        "refetch": {
+            "requests": len(refetch_latencies),
+            "errors": refetch.errors if refetch else 0,
+            "per_second": round(len(refetch_latencies) / max(seconds, 1e-9), 1),
+            "overlapping": fanout.overlapping,
+            "rows": fanout.refetched_rows,
+            **_percentiles(refetch_latencies),
+        },
+    }
+
+
+async def run_fanout(args: argparse.Namespace) -> dict[str, Any] | None:
+    config = load_config()
+    metrics, fanout = Metrics(), FanOut()
+    async with await psycopg.AsyncConnection.connect(config.database_url, autocommit=True) as conn:
+        if not await published(conn, args.publish):
+            print(f"notifications is not in the {PUBLICATION} publication, so Realtime sends no changes for it;"
+                  " run with --publish to add it", file=sys.stderr)
+            return None
+        connector = aiohttp.TCPConnector(limit=args.connections)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=30)) as http:
+            sign_ins = Metrics()
+            accounts = await sign_in_accounts(http, config, sign_ins, min(args.accounts, args.subscribers))
+            subscribers = [
+                Subscriber(Client(http, config, metrics, accounts[i % len(accounts)]), fanout, args.refetch)
+                for i in range(args.subscribers if accounts else 0)
+            ]
+            url = socket_url(config)
+            listening = [asyncio.create_task(s.run(url)) for s in subscribers]
+            try:
+                await asyncio.wait_for(asyncio.gather(*(s.ready.wait() for s in subscribers)), JOIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            users = sorted({s.client.user_id for s in subscribers if s.subscribed})
+            started = time.perf_counter()
+            if users:
+                await insert_notifications(conn, users, args, fanout)
+                await asyncio.sleep(args.drain)
+            for task in listening:
+                task.cancel()
+            await asyncio.gather(*listening, return_exceptions=True)
+            await asyncio.gather(*(t for s in subscribers for t in list(s.refetches)), return_exceptions=True)
+            seconds = time.perf_counter() - started
+        await conn.execute("DELETE FROM notifications WHERE data->>'load_run' = %s", (fanout.run,))
+    summary = summarize(fanout, subscribers, metrics, seconds)
+    # Requested, so that subscribers left without an account show as not subscribed.
+    summary["subscribers"] = args.subscribers
+    summary["sign_ins"] = {
+        "accounts": len(accounts),
+        "failed": min(args.accounts, args.subscribers) - len(accounts),
+        "rate_limited": sign_ins.summary(0)["rate_limited"],
+    }
+    options = ("subscribers", "accounts", "rate", "duration", "drain", "refetch")
+    summary["options"] = {name: getattr(args, name) for name in options}
+    return summary
+
+
+def format_summary(summary: dict[str, Any]) -> str:
+    latency, refetch = summary["latency_ms"], summary["refetch"]
+    sign_ins = summary["sign_ins"]
+    lines = [
+        f"sign-ins: {sign_ins['accounts']} accounts, {sign_ins['failed']} failed, "
+        f"{sign_ins['rate_limited']} rate limited",
+        f"{summary['subscribed']}/{summary['subscribers']} subscribed ({summary['users']} users, "
+        f"join p95 {summary['join_p95_ms']:.0f}ms), {summary['disconnects']} disconnected",
+        f"{summary['inserted']} notifications inserted, {summary['delivered']}/{summary['expected']} deliveries: "
+        f"{summary['dropped']} dropped, {summary['duplicates']} duplicates, {summary['change_errors']} with errors",
+        f"delivery latency p50 {latency['p50']:.0f}ms  p95 {latency['p95']:.0f}ms  p99 {latency['p99']:.0f}ms  "
+        f"max {latency['max']:.0f}ms",
+    ]
+    if summary["options"]["refetch"]:
+        lines.append(
+            f"refetches: {refetch['requests']} ({refetch['per_second']:.0f}/s, {refetch['overlapping']} overlapping, "
+            f"{refetch['errors']} errors, {refetch['rows']} rows), "
+            f"p50 {refetch['p50']:.0f}ms  p95 {refetch['p95']:.0f}ms"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m testsprite_tests.harness.realtime", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--subscribers", type=int, default=200, help="realtime subscriptions, one socket each")
+    parser.add_argument(
+        "--accounts", type=int, default=25,
+        help="distinct accounts the subscribers share (signed in once each; GoTrue allows 30 sign-ins per 5 minutes)",
+    )
+    parser.add_argument("--rate", type=float, default=20, help="notifications inserted per second")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to insert for")
+    parser.add_argument("--drain", type=float, default=5, help="seconds to wait for late deliveries")
+    parser.add_argument("--seed", type=int, default=0, help="seed for picking the recipient of each notification")
+    parser.add_argument("--connections", type=int, default=200, help="size of the HTTP pool for sign-ins and refetches")
+    parser.add_argument(
+        "--no-refetch", dest="refetch", action="store_false", help="only receive events, do not refetch the list"
+    )
+    parser.add_argument(
+        "--publish", action="store_true", help="add notifications to the realtime publication if missing"
+    )
+    args = parser.parse_args(argv)
+    summary = asyncio.run(run_fanout(args))
+    if summary is None:
+        return 2
+    print(format_summary(summary))
+    REALTIME_DIR.mkdir(parents=True, exist_ok=True)
+    path = REALTIME_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(f"saved to {path}")
+    return 1 if summary["dropped"] or summary["join_failures"] or summary["sign_ins"]["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
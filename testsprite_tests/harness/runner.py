@@ -0,0 +1,272 @@
+"""Run TC files in one process against a single pooled browser.
+
+Each test gets a fresh context from :class:`.pool.BrowserPool`; the fixed
+``wait_for_timeout(3000)`` before each step goes through the event-driven
+waits from :mod:`.waits` unless ``fixed_waits`` is set, and tests that only
+log in to reach their real subject start from the saved session from
+:mod:`.session`.  Prerequisite flows (:mod:`.deps`) are checked first and
+tests behind a broken flow are reported as ``BLOCKED`` without running.
+Every result is appended to the result store (:mod:`.store`) as it finishes.
+With ``standin`` set, requests to the app's Supabase origin are answered by
+the in-memory stand-in from :mod:`.standin` instead of the network; with
+``har`` set they are recorded to or replayed from per-test archives
+(:mod:`.har`).  ``timing`` records the wall time of every step and ``trace``
+keeps a Playwright trace of each failing test (:mod:`.timing`).  With
+``reset_db`` the data of the backend's Postgres database is reset in place
+from the template of :mod:`.pg` before the run and after every test in
+``MUTATING_TESTS``; the reset is reported as the ``database`` flow, and
+once it fails the remaining tests are blocked behind it.
+The command line lives in :mod:`.cli`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .adapter import TestCase, load_test
+from .config import HarnessConfig, load_config
+from .deps import FlowGate, FlowResult, prerequisites_for
+from .har import HarArchive
+from .plan import load_plan
+from .pool import BrowserPool
+from .session import AuthSession, StripLoginPrelude
+from .standin import StandIn
+from .store import ResultStore
+from .timing import StepClock, TimeSteps, TraceOnFailure
+from .waits import StepWaits
+
+PASSED = "PASSED"
+FAILED = "FAILED"
+BLOCKED = "BLOCKED"
+# Tests that leave rows behind: a registered user, a post, a participation,
+# a deleted post.
+MUTATING_TESTS = ("TC001", "TC006", "TC015", "TC018")
+
+
+@dataclass
+class CaseResult:
+    name: str
+    test_id: str
+    status: str
+    duration: float
+    error: str = ""
+    waited: float = 0.0
+    sleep_budget: float = 0.0
+    # (step label, seconds) in execution order; empty unless steps are timed.
+    steps: list[tuple[str, float]] = field(default_factory=list)
+    traces: list[Path] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    headless: bool = True
+    fixed_waits: bool = False
+    auth_mode: str = "api"
+    deps: bool = True
+    record: bool = True
+    standin: bool = False
+    # "auto", "record" or "replay" to route Supabase traffic through HAR archives.
+    har: str | None = None
+    timing: bool = False
+    trace: bool = False
+    # Reset the data of ``HarnessConfig.database_url`` around mutating tests.
+    reset_db: bool = False
+    # Set by the sharded runner so all workers append to the same run.
+    run_id: int | None = None
+
+
+@dataclass
+class RunReport:
+    results: list[CaseResult]
+    launch_seconds: float
+    wall_seconds: float
+    launches: int = 1
+    flows: list[FlowResult] = field(default_factory=list)
+    # Supabase requests the stand-in answered and the time it spent on them.
+    backend_requests: int = 0
+    backend_seconds: float = 0.0
+
+    @property
+    def failed(self) -> list[CaseResult]:
+        return [r for r in self.results if r.status != PASSED]
+
+    @property
+    def blocked(self) -> list[CaseResult]:
+        return [r for r in self.results if r.status == BLOCKED]
+
+    @property
+    def launch_seconds_saved(self) -> float:
+        # The per-file model launches once per test; each pool launches once.
+        per_launch = self.launch_seconds / max(self.launches, 1)
+        return per_launch * max(len(self.results) - self.launches, 0)
+
+
+async def run_case(
+    case: TestCase,
+    pool: BrowserPool,
+    fixed_waits: bool = False,
+    context_options: dict[str, Any] | None = None,
+    har: HarArchive | None = None,
+    trace: bool = False,
+) -> CaseResult:
+    clock = StepClock()
+    run_test = case.bind(async_api=pool.shim(**(context_options or {})), _step_clock=clock)
+    waits = StepWaits(supabase_origin=load_config().supabase_url)
+    clock.on_step.append(lambda label: setattr(waits, "step", label))
+    hooks = [] if fixed_waits else [waits.attach_context]
+    if har is not None:
+        hooks.append(har.hook(case.name))
+    tracer = TraceOnFailure(case.name) if trace else None
+    if tracer is not None:
+        hooks.append(tracer)
+    pool.context_hooks.extend(hooks)
+    started = time.perf_counter()
+    try:
+        await run_test()
+    except Exception as exc:  # a failing test must not stop the run
+        status, error = FAILED, "".join(traceback.format_exception_only(type(exc), exc)).strip()
+    else:
+        status, error = PASSED, ""
+    finally:
+        for hook in hooks:
+            pool.context_hooks.remove(hook)
+        await pool.release()
+    duration = time.perf_counter() - started
+    if har is not None:
+        har.finish(case.name, ok=status == PASSED)
+    traces = tracer.finish(ok=status == PASSED) if tracer is not None else []
+    steps = [(step.step, step.seconds) for step in clock.steps]
+    return CaseResult(
+        case.name, case.test_id, status, duration, error, waits.waited, waits.budget, steps, traces
+    )
+
+
+async def reset_database(template: Any, build: bool = False) -> FlowResult:
+    """Reset the served database from ``template`` (building it first if ``build``) as the ``database`` flow."""
+    started = time.perf_counter()
+    try:
+        if build:
+            await asyncio.to_thread(template.build)
+        await asyncio.to_thread(template.reset_data)
+    except Exception as exc:  # psycopg errors, a server without the template's tables, ...
+        error = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+        return FlowResult("database", False, time.perf_counter() - started, error)
+    return FlowResult("database", True, time.perf_counter() - started)
+
+
+def blocked_result(path: Path, blocker: FlowResult) -> CaseResult:
+    error = f"blocked: prerequisite flow '{blocker.name}' failed ({blocker.error})"
+    return CaseResult(path.stem, path.stem.split("_", 1)[0], BLOCKED, 0.0, error)
+
+
+def format_flow(flow: FlowResult) -> str:
+    status = "ok" if flow.ok else f"FAILED: {flow.error}"
+    return f"flow    {flow.seconds:7.1f}s  {flow.name}: {status}"
+
+
+def format_result(result: CaseResult) -> str:
+    line = f"{result.status:<7} {result.duration:7.1f}s  {result.name}"
+    if result.sleep_budget:
+        line += f"  (waited {result.waited:.1f}s of {result.sleep_budget:.0f}s fixed sleeps)"
+    for path in result.traces:
+        line += f"\n        trace: {path}  (npx playwright show-trace {path.name})"
+    return line
+
+
+async def prepare_case(
+    path: Path, pool: BrowserPool, config: HarnessConfig, auth: AuthSession | None, timing: bool = False
+) -> tuple[TestCase, dict[str, Any]]:
+    """Load ``path``; tests that merely log in first get the saved session instead."""
+    timed = (TimeSteps.for_path(path),) if timing else ()
+    plan_entry = load_plan().get(path.stem.split("_", 1)[0])
+    if auth is None or (plan_entry and plan_entry.exercises_login):
+        return load_test(path, timed), {}
+    prelude = StripLoginPrelude(config.login_user, config.login_password)
+    case = load_test(path, (prelude, *timed))
+    if not prelude.removed:
+        return case, {}
+    try:
+        storage_state = await auth.storage_state(pool)
+    except Exception as exc:
+        print(f"shared login unavailable ({exc}); {path.stem} keeps its own login steps", flush=True)
+        return load_test(path, timed), {}
+    return case, {"storage_state": str(storage_state)}
+
+
+async def run_suite(paths: list[Path], options: RunOptions = RunOptions(), worker: str = "0") -> RunReport:
+    started = time.perf_counter()
+    config = load_config()
+    auth_mode = options.auth_mode
+    backend: dict[str, Any] = {}
+    standin = None
+    if options.standin:
+        standin = StandIn(config)
+        backend = {"grant": standin.password_grant, "backend": "standin"}
+    elif auth_mode == "api" and not config.supabase_anon_key:
+        auth_mode = "ui"
+    auth = None if auth_mode == "off" else AuthSession(config, worker=worker, mode=auth_mode, **backend)
+    store = ResultStore() if options.record else None
+    run_id = options.run_id if options.run_id is not None or store is None else store.start_run()
+    har = HarArchive(config.supabase_url, options.har) if options.har else None
+    template = None
+    # The last database reset, while it is failing.
+    reset_failure: FlowResult | None = None
+    resets: list[FlowResult] = []
+    if options.reset_db:
+        from .pg import TemplateDatabase  # psycopg is only needed here
+
+        template = TemplateDatabase(config.database_url, config)
+        resets.append(await reset_database(template, build=True))
+        print(format_flow(resets[-1]), flush=True)
+        reset_failure = None if resets[-1].ok else resets[-1]
+    results = []
+    async with BrowserPool(headless=options.headless) as pool:
+        if standin is not None:
+            pool.context_hooks.append(standin.attach)
+        gate = None
+        if options.deps:
+            gate = FlowGate(pool, config, auth or AuthSession(config, worker=worker, mode="ui", **backend))
+            flow_hook = har.hook(f"flows-{worker}") if har else None
+            if flow_hook:
+                pool.context_hooks.append(flow_hook)
+            await gate.check({flow for path in paths for flow in prerequisites_for(path)})
+            if flow_hook:
+                pool.context_hooks.remove(flow_hook)
+                har.finish(f"flows-{worker}", ok=all(flow.ok for flow in gate.results.values()))
+            for flow in gate.results.values():
+                print(format_flow(flow), flush=True)
+        for path in paths:
+            blocker = reset_failure or (gate.blocker(path) if gate else None)
+            if blocker is not None:
+                result = blocked_result(path, blocker)
+            else:
+                case, context_options = await prepare_case(path, pool, config, auth, options.timing)
+                result = await run_case(case, pool, options.fixed_waits, context_options, har, options.trace)
+                if template is not None and result.test_id in MUTATING_TESTS:
+                    resets.append(await reset_database(template))
+                    if not resets[-1].ok:
+                        print(format_flow(resets[-1]), flush=True)
+                        reset_failure = resets[-1]
+            print(format_result(result), flush=True)
+            results.append(result)
+            if store is not None:
+                code = path.read_text(encoding="utf-8") if blocker is None else None
+                result_id = store.append(
+                    run_id, result.test_id, result.name, result.status, result.duration, result.error, code
+                )
+                if result.steps:
+                    store.append_steps(result_id, result.steps)
+    if store is not None:
+        store.close()
+    if har is not None:
+        print(har.summary(), flush=True)
+    flows = (list(gate.results.values()) if gate else []) + ([reset_failure or resets[-1]] if resets else [])
+    report = RunReport(results, pool.launch_seconds, time.perf_counter() - started, flows=flows)
+    if standin is not None:
+        report.backend_requests, report.backend_seconds = standin.requests, standin.busy_seconds
+    return report
@@ -0,0 +1,212 @@
+"""Log in once and start the tests that need it from a saved session.
+
+Most generated tests begin with the same three steps: fill the e-mail, fill
+the password, click "Giriş Yap".  :class:`AuthSession` produces a Playwright
+``storage_state`` for the configured user once per worker, either by seeding
+the Supabase session straight into ``localStorage`` (``mode="api"``, one
+GoTrue call) or by going through the login form once (``mode="ui"``).  The
+snapshot is cached under ``tmp/auth/`` and reused until the access token is
+about to expire.
+
+:class:`StripLoginPrelude` removes the login steps from a test's
+``run_test`` so it starts directly on the authenticated feed.
+"""
+
+from __future__ import annotations
+
+import ast
+import asyncio
+import json
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+from .config import TMP_DIR, HarnessConfig
+
+AUTH_DIR = TMP_DIR / "auth"
+# Refresh the snapshot when the access token has less than this left.
+EXPIRY_MARGIN_SECONDS = 300
+
+
+def storage_key(supabase_url: str) -> str:
+    """Key supabase-js v2 uses for the persisted session (see ``lib/supabase.ts``)."""
+    return f"sb-{urlsplit(supabase_url).hostname.split('.')[0]}-auth-token"
+
+
+def _password_grant(config: HarnessConfig) -> dict[str, Any]:
+    request = urllib.request.Request(
+        f"{config.supabase_url.rstrip('/')}/auth/v1/token?grant_type=password",
+        data=json.dumps({"email": config.login_user, "password": config.login_password}).encode(),
+        headers={"apikey": config.supabase_anon_key, "Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        session = json.loads(response.read())
+    session.setdefault("expires_at", int(time.time()) + int(session.get("expires_in", 3600)))
+    return session
+
+
+def storage_state_for(config: HarnessConfig, session: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "cookies": [],
+        "origins": [
+            {
+                "origin": config.base_url.rstrip("/"),
+                "localStorage": [{"name": storage_key(config.supabase_url), "value": json.dumps(session)}],
+            }
+        ],
+    }
+
+
+def _expires_at(state: dict[str, Any], key: str) -> float:
+    for origin in state.get("origins", []):
+        for item in origin.get("localStorage", []):
+            if item["name"] == key:
+                return float(json.loads(item["value"]).get("expires_at", 0))
+    return 0.0
+
+
+@dataclass
+class AuthSession:
+    config: HarnessConfig
+    worker: str = "0"
+    mode: str = "api"
+    # How ``mode="api"`` obtains a session; the Supabase stand-in swaps in its own.
+    grant: Callable[[HarnessConfig], dict[str, Any]] = field(default=_password_grant, repr=False)
+    # Keeps snapshots from different backends apart (their tokens are not interchangeable).
+    backend: str = ""
+    # First login failure, re-raised instead of retrying for every test.
+    error: Exception | None = field(default=None, repr=False)
+
+    @property
+    def path(self) -> Path:
+        prefix = f"{self.backend}-" if self.backend else ""
+        return AUTH_DIR / f"storage_state-{prefix}{self.worker}.json"
+
+    def cached(self) -> Path | None:
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        expires_at = _expires_at(state, storage_key(self.config.supabase_url))
+        return self.path if expires_at - EXPIRY_MARGIN_SECONDS > time.time() else None
+
+    async def storage_state(self, pool) -> Path:
+        """Return the path of a fresh storage_state snapshot, logging in if needed."""
+        if self.error is not None:
+            raise self.error
+        cached = self.cached()
+        if cached:
+            return cached
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if self.mode == "api":
+                session = await asyncio.to_thread(self.grant, self.config)
+                self.path.write_text(json.dumps(storage_state_for(self.config, session)), encoding="utf-8")
+            else:
+                await self._login_via_ui(pool)
+        except Exception as exc:
+            self.error = exc
+            raise
+        return self.path
+
+    async def _login_via_ui(self, pool) -> None:
+        context = await pool.browser.new_context()
+        try:
+            page = await context.new_page()
+            await page.goto(self.config.base_url, wait_until="domcontentloaded")
+            await page.get_by_placeholder("E-posta").fill(self.config.login_user)
+            await page.get_by_placeholder("Şifre").fill(self.config.login_password)
+            await page.get_by_text("Giriş Yap", exact=True).last.click()
+            await page.wait_for_function(
+                "key => !!window.localStorage.getItem(key)",
+                arg=storage_key(self.config.supabase_url),
+                timeout=30_000,
+            )
+            await context.storage_state(path=str(self.path))
+        finally:
+            await context.close()
+
+
+def _awaited_call(node: ast.stmt, method: str) -> ast.Call | None:
+    """Return the call in ``await elem.<method>(...)``, if ``node`` is one."""
+    if isinstance(node, ast.Expr) and isinstance(node.value, ast.Await):
+        call = node.value.value
+        if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) and call.func.attr == method:
+            return call
+    return None
+
+
+def _fills(node: ast.stmt, value: str) -> bool:
+    call = _awaited_call(node, "fill")
+    return bool(
+        call and call.args and isinstance(call.args[0], ast.Constant) and call.args[0].value == value
+    )
+
+
+def _is_action(node: ast.stmt) -> bool:
+    return bool(_awaited_call(node, "fill") or _awaited_call(node, "click"))
+
+
+class StripLoginPrelude:
+    """AST transform dropping the leading fill-email/fill-password/click-login steps.
+
+    Only removes the login when it is the first interaction of the test;
+    ``removed`` tells the caller whether the test now needs a logged-in context.
+    The consolidated tests (:mod:`.consolidate`) keep their login as a step
+    and declare it with a module-level ``LOGIN = True``, which is cleared.
+    """
+
+    def __init__(self, user: str, password: str):
+        self.user = user
+        self.password = password
+        self.removed = False
+
+    def __call__(self, tree: ast.Module) -> ast.Module:
+        for node in tree.body:
+            if _is_login_flag(node):
+                node.value = ast.Constant(False)
+                self.removed = True
+                return tree
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Try) and self._strip(node.body):
+                self.removed = True
+                break
+        return tree
+
+    def _strip(self, body: list[ast.stmt]) -> bool:
+        actions = [i for i, node in enumerate(body) if _is_action(node)]
+        if len(actions) < 3:
+            return False
+        email, password, submit = actions[:3]
+        if not (
+            _fills(body[email], self.user)
+            and _fills(body[password], self.password)
+            and _awaited_call(body[submit], "click")
+        ):
+            return False
+        # Each generated step starts with ``frame = context.pages[-1]``.
+        start = next((i for i in range(email, max(email - 4, -1), -1) if _is_step_start(body[i])), email)
+        del body[start : submit + 1]
+        return True
+
+
+def _is_login_flag(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.Assign)
+        and isinstance(node.targets[0], ast.Name)
+        and node.targets[0].id == "LOGIN"
+        and isinstance(node.value, ast.Constant)
+        and node.value.value is True
+    )
+
+
+def _is_step_start(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.Assign)
+        and isinstance(node.targets[0], ast.Name)
+        and node.targets[0].id == "frame"
+    )
@@ -0,0 +1,89 @@
+"""Run the suite sharded across worker processes, one browser per worker.
+
+Files are assigned longest-first to the currently least loaded worker (LPT
+scheduling) using the durations of earlier runs, so the shards finish at
+roughly the same time: about total duration divided by the worker count.
+Each worker writes its own log under ``tmp/logs/``; :func:`merge_logs`
+folds them into one report once every worker is done.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from .config import TMP_DIR
+from .durations import estimate, load_durations
+from .runner import RunOptions, RunReport, run_suite
+from .store import ResultStore
+
+LOG_DIR = TMP_DIR / "logs"
+
+
+@dataclass
+class Shard:
+    worker: int
+    paths: list[Path] = field(default_factory=list)
+    expected: float = 0.0
+
+    @property
+    def log_path(self) -> Path:
+        return LOG_DIR / f"worker-{self.worker}.log"
+
+
+def plan_shards(paths: list[Path], workers: int, durations: dict[str, float] | None = None) -> list[Shard]:
+    expected = estimate(paths, load_durations() if durations is None else durations)
+    shards = [Shard(worker) for worker in range(max(1, min(workers, len(paths))))]
+    heap = [(0.0, shard.worker) for shard in shards]
+    for path in sorted(paths, key=lambda p: (-expected[p], p.name)):
+        load, worker = heapq.heappop(heap)
+        shards[worker].paths.append(path)
+        shards[worker].expected = load + expected[path]
+        heapq.heappush(heap, (shards[worker].expected, worker))
+    return shards
+
+
+def _run_shard(shard: Shard, options: RunOptions) -> RunReport:
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    with shard.log_path.open("w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        return asyncio.run(run_suite(shard.paths, options, worker=str(shard.worker)))
+
+
+def merge_logs(shards: list[Shard], path: Path = LOG_DIR / "report.log") -> Path:
+    with path.open("w", encoding="utf-8") as report:
+        for shard in shards:
+            try:
+                lines = shard.log_path.read_text(encoding="utf-8").splitlines()
+            except FileNotFoundError:
+                lines = ["(no log written)"]
+            report.writelines(f"[w{shard.worker}] {line}\n" for line in lines)
+    return path
+
+
+def run_sharded(paths: list[Path], workers: int, options: RunOptions = RunOptions()) -> RunReport:
+    started = time.perf_counter()
+    shards = plan_shards(paths, workers)
+    if options.record and options.run_id is None:
+        with ResultStore() as store:
+            options = replace(options, run_id=store.start_run(f"harness:{len(shards)} workers"))
+    for shard in shards:
+        print(f"worker {shard.worker}: {len(shard.paths)} files, ~{shard.expected:.0f}s expected", flush=True)
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        reports = list(executor.map(_run_shard, shards, [options] * len(shards)))
+    print(f"merged worker logs into {merge_logs(shards)}")
+    order = {path.stem: i for i, path in enumerate(paths)}
+    results = sorted((r for report in reports for r in report.results), key=lambda r: order[r.name])
+    return RunReport(
+        results,
+        launch_seconds=sum(report.launch_seconds for report in reports),
+        wall_seconds=time.perf_counter() - started,
+        launches=len(reports),
+        flows=[flow for report in reports for flow in report.flows],
+        backend_requests=sum(report.backend_requests for report in reports),
+        backend_seconds=sum(report.backend_seconds for report in reports),
+    )
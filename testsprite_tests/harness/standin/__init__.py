@@ -0,0 +1,19 @@
+"""In-memory stand-in for the Supabase services the app talks to.
+
+PostgREST (``/rest/v1``), GoTrue (``/auth/v1``) and Storage (``/storage/v1``)
+are emulated well enough for the queries in ``app/``, ``components/`` and
+``lib/``, on tables built from ``supabase/migrations`` and seeded from
+``demo_data_complete.sql``.  UI tests then need no network and every backend
+call is answered in well under a millisecond.
+
+Either let the harness serve the app's Supabase origin from it
+(``python -m testsprite_tests.harness --standin``) or run it on its own::
+
+    python -m testsprite_tests.harness.standin [--port 54321]
+
+and start the app with ``EXPO_PUBLIC_SUPABASE_URL=http://127.0.0.1:54321``.
+"""
+
+from .server import StandIn
+
+__all__ = ["StandIn"]
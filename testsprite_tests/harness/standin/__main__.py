@@ -0,0 +1,21 @@
+import argparse
+import asyncio
+
+from .server import DEFAULT_PORT, StandIn
+
+
+async def serve(args: argparse.Namespace) -> None:
+    async with StandIn(seed=args.seed, host=args.host, port=args.port) as standin:
+        counts = ", ".join(f"{name} {len(rows)}" for name, rows in standin.db.tables.items() if rows)
+        print(f"Supabase stand-in on {standin.url} (seeded: {counts})", flush=True)
+        await asyncio.Event().wait()
+
+
+parser = argparse.ArgumentParser(prog="python -m testsprite_tests.harness.standin")
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+parser.add_argument("--seed", type=int, default=0, help="seed for the demo script's random() calls")
+try:
+    asyncio.run(serve(parser.parse_args()))
+except KeyboardInterrupt:
+    pass
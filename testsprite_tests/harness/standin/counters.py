@@ -0,0 +1,58 @@
+"""The counter columns that migration ``011`` keeps up to date with triggers.
+
+``posts.likes_count``, ``profiles.followers_count`` and the rest are
+maintained in Postgres by row triggers on the counted tables.  The stand-in
+emulates those counting triggers (not ``protect_counters``, which is a
+permission check like RLS): :class:`~.database.Database` calls
+:func:`apply` for every row it inserts, updates or deletes, cascades
+included, so the columns the screens read agree with the rows.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, NamedTuple
+
+
+def _always(row: dict[str, Any]) -> bool:
+    return True
+
+
+def _not_deleted(row: dict[str, Any]) -> bool:
+    return row.get("deleted_at") is None
+
+
+def _going(row: dict[str, Any]) -> bool:
+    return row.get("status") == "going"
+
+
+class Counter(NamedTuple):
+    # Rows of ``source`` matching ``counts`` are counted in ``target.column``
+    # of the ``target`` row whose id is their ``key``.
+    source: str
+    key: str
+    target: str
+    column: str
+    counts: Callable[[dict[str, Any]], bool] = _always
+
+
+COUNTERS = (
+    Counter("likes", "post_id", "posts", "likes_count"),
+    Counter("likes", "user_id", "profiles", "likes_given_count"),
+    Counter("post_saves", "post_id", "posts", "saves_count"),
+    Counter("comments", "post_id", "posts", "comments_count", _not_deleted),
+    Counter("comment_likes", "comment_id", "comments", "likes_count"),
+    Counter("posts", "user_id", "profiles", "posts_count", _not_deleted),
+    Counter("follows", "following_id", "profiles", "followers_count"),
+    Counter("follows", "follower_id", "profiles", "following_count"),
+    Counter("event_participants", "event_id", "events", "participants_count", _going),
+)
+
+
+def apply(tables: dict[str, list[dict[str, Any]]], source: str, row: dict[str, Any], sign: int) -> None:
+    """Count ``row`` of ``source`` in (``sign`` 1) or out of (``sign`` -1) the counters it feeds."""
+    for counter in COUNTERS:
+        if counter.source != source or not counter.counts(row):
+            continue
+        for target in tables.get(counter.target, ()):
+            if target.get("id") == row.get(counter.key) and counter.column in target:
+                target[counter.column] = (target[counter.column] or 0) + sign
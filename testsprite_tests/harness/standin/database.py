@@ -0,0 +1,206 @@
+"""In-memory tables with the handful of Postgres behaviours the app relies on.
+
+Rows are plain JSON-ready dicts.  Column defaults from the migrations are
+applied on insert, ``UNIQUE`` constraints (including ``PRIMARY KEY`` and
+unique indexes) and foreign keys are enforced, and deletes follow ``ON
+DELETE CASCADE`` / ``SET NULL``.  The counter triggers of migration ``011``
+are emulated (:mod:`.counters`); ``CHECK`` constraints, other triggers and
+row-level security are not: every request sees and may write every row, so
+a test that passes here can still be refused by the policies of a real
+Supabase.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from . import counters
+from .schema import Column, ForeignKey, Schema, Table
+
+
+class DatabaseError(Exception):
+    """An error PostgREST would report with a Postgres SQLSTATE."""
+
+    status = 400
+
+    def __init__(self, code: str, message: str, details: str | None = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details
+
+    def as_json(self) -> dict[str, Any]:
+        return {"code": self.code, "message": self.message, "details": self.details, "hint": None}
+
+
+class UniqueViolation(DatabaseError):
+    status = 409
+
+    def __init__(self, table: Table, columns: tuple[str, ...], row: dict[str, Any]):
+        constraint = f"{table.name}_{'_'.join(columns)}_key"
+        key = ", ".join(columns)
+        values = ", ".join(str(row.get(c)) for c in columns)
+        super().__init__(
+            "23505",
+            f'duplicate key value violates unique constraint "{constraint}"',
+            f"Key ({key})=({values}) already exists.",
+        )
+
+
+class ForeignKeyViolation(DatabaseError):
+    status = 409
+
+    def __init__(self, fk: ForeignKey, value: Any):
+        super().__init__(
+            "23503",
+            f'insert or update on table "{fk.table}" violates foreign key constraint "{fk.name}"',
+            f'Key ({fk.column})=({value}) is not present in table "{fk.ref_table}".',
+        )
+
+
+def timestamp(value: datetime) -> str:
+    """Render ``value`` the way PostgREST returns ``timestamptz`` columns."""
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def parse_timestamp(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00").replace(" ", "T", 1))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class Database:
+    def __init__(self, schema: Schema, seed: int = 0, now: datetime | None = None):
+        self.schema = schema
+        self.random = random.Random(seed)
+        # Frozen at startup so seeded "now() - interval" values and later
+        # defaults stay ordered the same way on every run.
+        self.started = now or datetime.now(timezone.utc)
+        self._started_clock = datetime.now(timezone.utc)
+        self.tables: dict[str, list[dict[str, Any]]] = {name: [] for name in schema.tables}
+
+    def now(self) -> datetime:
+        return self.started + (datetime.now(timezone.utc) - self._started_clock)
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    def rows(self, table: str) -> list[dict[str, Any]]:
+        self.schema.table(table)
+        return self.tables.setdefault(table, [])
+
+    # -- values -------------------------------------------------------------
+
+    def default(self, column: Column) -> Any:
+        default = column.default
+        if default is None:
+            return None
+        lowered = default.lower()
+        if lowered in ("gen_random_uuid()", "uuid_generate_v4()"):
+            return self.uuid()
+        if lowered == "now()":
+            return timestamp(self.now())
+        if lowered in ("true", "false"):
+            return lowered == "true"
+        if default.startswith("'"):
+            text, _, cast = default[1:].rpartition("'")
+            text = text.replace("''", "'")
+            if cast.startswith("::json") or text in ("[]", "{}") and "jsonb" in column.type:
+                return json.loads(text)
+            if text == "{}" or column.type.endswith("[]"):
+                return []
+            return text
+        try:
+            return int(default)
+        except ValueError:
+            return float(default) if default.replace(".", "", 1).isdigit() else None
+
+    @staticmethod
+    def coerce(column: Column | None, value: Any) -> Any:
+        """Store ``value`` in one canonical form so filters and ordering compare like Postgres."""
+        if isinstance(value, datetime):
+            return timestamp(value)
+        if isinstance(value, tuple):
+            return list(value)
+        if column is not None and column.type.startswith("timestamp") and isinstance(value, str):
+            parsed = parse_timestamp(value)
+            return timestamp(parsed) if parsed else value
+        return value
+
+    def _values(self, table: Table, values: dict[str, Any]) -> dict[str, Any]:
+        return {k: self.coerce(table.columns.get(k), v) for k, v in values.items()}
+
+    # -- writes -------------------------------------------------------------
+
+    def _check_unique(self, table: Table, row: dict[str, Any], ignore: Iterable[dict] = ()) -> None:
+        ignored = [id(r) for r in ignore]
+        for columns in table.uniques:
+            key = tuple(row.get(c) for c in columns)
+            if any(v is None for v in key):
+                continue
+            for other in self.rows(table.name):
+                if id(other) not in ignored and tuple(other.get(c) for c in columns) == key:
+                    raise UniqueViolation(table, columns, row)
+
+    def _check_foreign_keys(self, table: Table, row: dict[str, Any]) -> None:
+        for fk in table.foreign_keys:
+            value = row.get(fk.column)
+            # References outside the stand-in's tables (``auth.users``) cannot be checked.
+            if value is None or fk.ref_table not in self.schema.tables:
+                continue
+            if not any(r.get(fk.ref_column) == value for r in self.rows(fk.ref_table)):
+                raise ForeignKeyViolation(fk, value)
+
+    def conflicting(self, table_name: str, values: dict[str, Any], columns: tuple[str, ...]) -> dict | None:
+        key = tuple(values.get(c) for c in columns)
+        return next(
+            (r for r in self.rows(table_name) if tuple(r.get(c) for c in columns) == key), None
+        )
+
+    def insert(self, table_name: str, values: dict[str, Any]) -> dict[str, Any]:
+        table = self.schema.table(table_name)
+        values = self._values(table, values)
+        row = {name: values[name] if name in values else self.default(column) for name, column in table.columns.items()}
+        row.update(values)
+        if "id" in table.columns and row.get("id") is None:
+            row["id"] = self.uuid()
+        self._check_unique(table, row)
+        self._check_foreign_keys(table, row)
+        self.rows(table_name).append(row)
+        counters.apply(self.tables, table_name, row, 1)
+        return row
+
+    def update(self, table_name: str, rows: list[dict[str, Any]], changes: dict[str, Any]) -> list[dict[str, Any]]:
+        table = self.schema.table(table_name)
+        changes = self._values(table, changes)
+        for row in rows:
+            self._check_unique(table, {**row, **changes}, ignore=rows)
+            self._check_foreign_keys(table, {**row, **changes})
+        for row in rows:
+            counters.apply(self.tables, table_name, row, -1)
+            row.update(changes)
+            counters.apply(self.tables, table_name, row, 1)
+        return rows
+
+    def delete(self, table_name: str, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        doomed = {id(r) for r in rows}
+        self.tables[table_name] = [r for r in self.rows(table_name) if id(r) not in doomed]
+        for row in rows:
+            counters.apply(self.tables, table_name, row, -1)
+        for fk in self.schema.referencing(table_name):
+            keys = {r.get(fk.ref_column) for r in rows}
+            children = [r for r in self.rows(fk.table) if r.get(fk.column) in keys]
+            if not children:
+                continue
+            if fk.on_delete == "CASCADE":
+                self.delete(fk.table, children)
+            elif fk.on_delete == "SET NULL":
+                for child in children:
+                    child[fk.column] = None
+        return rows
@@ -0,0 +1,218 @@
+"""Email/password auth compatible with what supabase-js sends to ``/auth/v1``.
+
+Access tokens are HS256 JWTs signed with the Supabase CLI's default local
+secret, so they look like the ones a ``supabase start`` stack hands out.
+Sign-up confirms immediately and runs the ``handle_new_user`` trigger from
+``20251124151342_008`` (profile, privacy settings and XP rows).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from .database import Database, DatabaseError, timestamp
+
+# Defaults of a local ``supabase start``; the anon key is the fallback in lib/supabase.ts.
+JWT_SECRET = "super-secret-jwt-token-with-at-least-32-characters-long"
+ANON_KEY = (
+    "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZS1kZW1vIiwicm9sZSI6ImFub24iLCJleHAiOjE5ODM4MTI5OTZ9"
+    ".CRXP1A7WOeoJeXxjNni43kdQwgnWNReilDMblYTn_I0"
+)
+ACCESS_TOKEN_SECONDS = 3600
+
+
+class AuthError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+    def as_json(self) -> dict[str, Any]:
+        return {"code": self.status, "error_code": self.code, "msg": self.message}
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def encode_jwt(claims: dict[str, Any], secret: str = JWT_SECRET) -> str:
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    payload = _b64(json.dumps(claims, separators=(",", ":")).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64(signature)}"
+
+
+def decode_jwt(token: str, secret: str = JWT_SECRET) -> dict[str, Any]:
+    try:
+        header, payload, signature = token.split(".")
+        expected = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _unb64(signature)):
+            raise ValueError("bad signature")
+        claims = json.loads(_unb64(payload))
+    except ValueError as exc:
+        raise AuthError(401, "bad_jwt", f"invalid JWT: {exc}") from None
+    if claims.get("exp", 0) < time.time():
+        raise AuthError(401, "bad_jwt", "JWT expired")
+    return claims
+
+
+def _hash_password(password: str, salt: str) -> str:
+    return hashlib.sha256(f"{salt}:{password}".encode()).hexdigest()
+
+
+@dataclass
+class User:
+    id: str
+    email: str
+    password_hash: str
+    salt: str
+    created_at: str
+    user_metadata: dict[str, Any] = field(default_factory=dict)
+    last_sign_in_at: str | None = None
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": self.email,
+            "email_confirmed_at": self.created_at,
+            "confirmed_at": self.created_at,
+            "phone": "",
+            "last_sign_in_at": self.last_sign_in_at,
+            "app_metadata": {"provider": "email", "providers": ["email"]},
+            "user_metadata": self.user_metadata,
+            "identities": [],
+            "created_at": self.created_at,
+            "updated_at": self.last_sign_in_at or self.created_at,
+        }
+
+
+@dataclass
+class GoTrue:
+    db: Database
+    users: dict[str, User] = field(default_factory=dict)
+    refresh_tokens: dict[str, str] = field(default_factory=dict)
+
+    def user(self, user_id: str) -> User:
+        user = next((u for u in self.users.values() if u.id == user_id), None)
+        if user is None:
+            raise AuthError(404, "user_not_found", "User not found")
+        return user
+
+    def sign_up(self, email: str, password: str, metadata: dict[str, Any] | None = None) -> User:
+        email = email.strip().lower()
+        if email in self.users:
+            raise AuthError(422, "user_already_exists", "User already registered")
+        if len(password) < 6:
+            raise AuthError(422, "weak_password", "Password should be at least 6 characters.")
+        salt = secrets.token_hex(8)
+        user = User(
+            id=self.db.uuid(),
+            email=email,
+            password_hash=_hash_password(password, salt),
+            salt=salt,
+            created_at=timestamp(self.db.now()),
+            user_metadata=dict(metadata or {}),
+        )
+        self._handle_new_user(user)
+        self.users[email] = user
+        return user
+
+    def _handle_new_user(self, user: User) -> None:
+        metadata = user.user_metadata
+        try:
+            self.db.insert(
+                "profiles",
+                {
+                    "id": user.id,
+                    "username": metadata.get("username") or f"user_{secrets.token_hex(3)}",
+                    "full_name": metadata.get("full_name") or "",
+                    "role": "user",
+                    "rank": "newbie",
+                },
+            )
+        except DatabaseError as exc:
+            raise AuthError(500, "unexpected_failure", f"Database error saving new user: {exc.message}") from None
+        self.db.insert("user_privacy_settings", {"user_id": user.id})
+        self.db.insert("user_xp", {"user_id": user.id, "total_xp": 0, "level": 1, "rank": "Newbie"})
+
+    def session(self, user: User) -> dict[str, Any]:
+        now = int(time.time())
+        user.last_sign_in_at = timestamp(self.db.now())
+        refresh_token = secrets.token_urlsafe(16)
+        self.refresh_tokens[refresh_token] = user.id
+        claims = {
+            "aud": "authenticated",
+            "exp": now + ACCESS_TOKEN_SECONDS,
+            "iat": now,
+            "iss": "http://127.0.0.1:54321/auth/v1",
+            "sub": user.id,
+            "email": user.email,
+            "role": "authenticated",
+            "session_id": secrets.token_hex(8),
+        }
+        return {
+            "access_token": encode_jwt(claims),
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_SECONDS,
+            "expires_at": now + ACCESS_TOKEN_SECONDS,
+            "refresh_token": refresh_token,
+            "user": user.as_json(),
+        }
+
+    def password_grant(self, email: str, password: str) -> dict[str, Any]:
+        user = self.users.get((email or "").strip().lower())
+        if user is None or not hmac.compare_digest(user.password_hash, _hash_password(password or "", user.salt)):
+            raise AuthError(400, "invalid_credentials", "Invalid login credentials")
+        return self.session(user)
+
+    def refresh_grant(self, refresh_token: str) -> dict[str, Any]:
+        user_id = self.refresh_tokens.pop(refresh_token or "", None)
+        if user_id is None:
+            raise AuthError(400, "refresh_token_not_found", "Invalid Refresh Token: Refresh Token Not Found")
+        return self.session(self.user(user_id))
+
+    def authenticate(self, authorization: str | None) -> User | None:
+        """The signed-in user for a ``Bearer`` header, ``None`` for an anon key.
+
+        Anon keys are not verified: the app ships the remote project's key,
+        which was signed with a secret the stand-in does not know.
+        """
+        if not authorization or not authorization.lower().startswith("bearer "):
+            return None
+        token = authorization[7:].strip()
+        try:
+            role = json.loads(_unb64(token.split(".")[1])).get("role")
+        except (IndexError, ValueError):
+            raise AuthError(401, "bad_jwt", "invalid JWT: malformed token") from None
+        if role != "authenticated":
+            return None
+        return self.user(decode_jwt(token)["sub"])
+
+    def update_user(self, user: User, changes: dict[str, Any]) -> User:
+        if changes.get("password"):
+            user.password_hash = _hash_password(changes["password"], user.salt)
+        if changes.get("email"):
+            self.users.pop(user.email, None)
+            user.email = changes["email"].strip().lower()
+            self.users[user.email] = user
+        user.user_metadata.update(changes.get("data") or {})
+        return user
+
+    def sign_out(self, user: User) -> None:
+        for token, user_id in list(self.refresh_tokens.items()):
+            if user_id == user.id:
+                del self.refresh_tokens[token]
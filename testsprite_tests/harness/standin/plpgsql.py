@@ -0,0 +1,679 @@
+"""A small interpreter for the PL/pgSQL the demo data scripts are written in.
+
+``demo_data_complete.sql`` is one ``DO $$ ... $$`` block: literal ``INSERT
+... VALUES`` lists plus ``FOR`` loops that insert random follows, likes,
+comments, messages and so on.  Rather than keeping a Python copy of that
+data in sync by hand, the stand-in runs the script itself against
+:class:`~.database.Database`.  Supported is exactly what the script uses:
+
+* ``DECLARE`` with optional ``:=`` initialisers, nested ``BEGIN ... EXCEPTION
+  WHEN OTHERS THEN ... END`` blocks, ``IF``/``ELSIF``/``ELSE``, integer
+  ``FOR`` loops, ``:=`` assignments, ``RAISE`` (ignored) and ``RETURN``;
+* ``SELECT ... INTO``, ``INSERT ... VALUES``, ``INSERT ... SELECT`` and
+  ``UPDATE`` over a single table, with ``WHERE``, ``ORDER BY``, ``LIMIT``,
+  ``EXISTS (...)``, ``= ANY(array)``, ``ARRAY_AGG`` and ``COUNT(*)``;
+* every ``ON CONFLICT`` clause behaves as ``DO NOTHING``.
+
+``random()`` draws from the database's seeded generator, so the same seed
+always produces the same rows.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from .database import Database, DatabaseError, parse_timestamp
+
+
+class SqlSyntaxError(Exception):
+    pass
+
+
+class _Return(Exception):
+    pass
+
+
+_TOKEN = re.compile(
+    r"""
+    (?P<skip>\s+|--[^\n]*|/\*.*?\*/)
+    |(?P<string>'(?:[^']|'')*')
+    |(?P<number>\d+(?:\.\d+)?)
+    |(?P<name>[A-Za-z_]\w*)
+    |(?P<op>::|:=|\|\||!=|<>|<=|>=|\.\.|[-+*/<>=(),;\[\].])
+    """,
+    re.S | re.X,
+)
+
+_INTERVAL = re.compile(r"(-?\d+(?:\.\d+)?)\s*(second|minute|hour|day|week|month|year)s?", re.I)
+_INTERVAL_UNITS = {
+    "second": timedelta(seconds=1),
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+
+@dataclass(frozen=True)
+class Token:
+    kind: str
+    text: str
+
+    @property
+    def word(self) -> str:
+        return self.text.upper() if self.kind == "name" else self.text
+
+
+def tokenize(sql: str) -> list[Token]:
+    tokens, pos = [], 0
+    while pos < len(sql):
+        match = _TOKEN.match(sql, pos)
+        if match is None:
+            raise SqlSyntaxError(f"unexpected {sql[pos:pos + 20]!r}")
+        pos = match.end()
+        if match.lastgroup != "skip":
+            tokens.append(Token(match.lastgroup, match.group()))
+    tokens.append(Token("end", ""))
+    return tokens
+
+
+def interval(text: str) -> timedelta:
+    return sum(
+        (_INTERVAL_UNITS[unit.lower()] * float(n) for n, unit in _INTERVAL.findall(text)), timedelta()
+    )
+
+
+@dataclass
+class Scope:
+    db: Database
+    variables: dict[str, Any] = field(default_factory=dict)
+    row: dict[str, Any] | None = None
+    rows: list[dict[str, Any]] | None = None
+
+    def with_row(self, row: dict[str, Any] | None) -> "Scope":
+        return Scope(self.db, self.variables, row)
+
+
+Expr = Callable[[Scope], Any]
+Stmt = Callable[[Scope], None]
+
+
+@dataclass(frozen=True)
+class _AnyOf:
+    values: tuple
+
+
+def _and(*values: Any) -> bool | None:
+    if any(v is False for v in values):
+        return False
+    return None if any(v is None for v in values) else True
+
+
+def _or(*values: Any) -> bool | None:
+    if any(v is True for v in values):
+        return True
+    return None if any(v is None for v in values) else False
+
+
+def _comparable(a: Any, b: Any) -> tuple[Any, Any]:
+    if isinstance(a, datetime) and isinstance(b, str):
+        return a, parse_timestamp(b)
+    if isinstance(b, datetime) and isinstance(a, str):
+        return parse_timestamp(a), b
+    return a, b
+
+
+_COMPARE = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    ">": lambda a, b: a > b,
+    "<=": lambda a, b: a <= b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def _compare(op: str, a: Any, b: Any) -> bool | None:
+    if isinstance(b, _AnyOf):
+        return _or(*(_compare(op, a, v) for v in b.values)) if b.values else False
+    if a is None or b is None:
+        return None
+    return _COMPARE[op](*_comparable(a, b))
+
+
+def _arith(op: str, a: Any, b: Any) -> Any:
+    if a is None or b is None:
+        return None
+    if op == "||":
+        return f"{a}{b}"
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    return a // b if isinstance(a, int) and isinstance(b, int) else a / b
+
+
+def _cast(value: Any, type_: str) -> Any:
+    if value is None:
+        return None
+    type_ = type_.lower()
+    if type_.endswith("[]"):
+        return list(value) if not isinstance(value, str) else [v for v in value.strip("{}").split(",") if v]
+    if type_ in ("int", "integer", "bigint", "smallint"):
+        return int(math.floor(value + 0.5)) if isinstance(value, float) else int(value)
+    if type_ in ("numeric", "real", "float", "double"):
+        return float(value)
+    if type_ in ("jsonb", "json"):
+        return json.loads(value) if isinstance(value, str) else value
+    if type_ == "text":
+        return str(value)
+    if type_ in ("timestamptz", "timestamp"):
+        return parse_timestamp(value) if isinstance(value, str) else value
+    return value
+
+
+def _least(*values: Any) -> Any:
+    present = [v for v in values if v is not None]
+    return min(present) if present else None
+
+
+def _greatest(*values: Any) -> Any:
+    present = [v for v in values if v is not None]
+    return max(present) if present else None
+
+
+def _array_length(array: Any, dimension: int = 1) -> int | None:
+    return len(array) if array else None
+
+
+def _coalesce(*values: Any) -> Any:
+    return next((v for v in values if v is not None), None)
+
+
+def _subscript(array: Any, index: Any) -> Any:
+    if array is None or index is None or not 1 <= index <= len(array):
+        return None
+    return array[index - 1]
+
+
+_SCALAR_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "FLOOR": lambda x: None if x is None else math.floor(x),
+    "CEIL": lambda x: None if x is None else math.ceil(x),
+    "LEAST": _least,
+    "GREATEST": _greatest,
+    "ARRAY_LENGTH": _array_length,
+    "COALESCE": _coalesce,
+}
+
+
+@dataclass
+class Select:
+    columns: list[Expr]
+    into: list[str]
+    table: str | None
+    where: Expr | None
+    order: Expr | None
+    descending: bool
+    limit: Expr | None
+    aggregate: bool
+
+    def candidates(self, scope: Scope) -> list[dict[str, Any] | None]:
+        rows = list(scope.db.rows(self.table)) if self.table else [None]
+        if self.where is not None:
+            rows = [r for r in rows if self.where(scope.with_row(r)) is True]
+        if self.order is not None:
+            keyed = [(self.order(scope.with_row(r)), i, r) for i, r in enumerate(rows)]
+            keyed.sort(key=lambda k: (k[0] is None, k[0], k[1]), reverse=self.descending)
+            rows = [r for _, _, r in keyed]
+        return rows
+
+    def run(self, scope: Scope) -> list[tuple]:
+        rows = self.candidates(scope)
+        if self.aggregate:
+            aggregate = Scope(scope.db, scope.variables, None, [r for r in rows if r is not None])
+            result = [tuple(column(aggregate) for column in self.columns)]
+        else:
+            result = [tuple(column(scope.with_row(r)) for column in self.columns) for r in rows]
+        if self.limit is not None:
+            result = result[: self.limit(scope)]
+        return result
+
+
+class Parser:
+    def __init__(self, sql: str):
+        self.tokens = tokenize(sql)
+        self.pos = 0
+        self._aggregate = False
+
+    # -- token helpers --------------------------------------------------------
+
+    def peek(self, offset: int = 0) -> Token:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def at(self, *words: str) -> bool:
+        return all(self.peek(i).word == w for i, w in enumerate(words))
+
+    def accept(self, *words: str) -> bool:
+        if self.at(*words):
+            self.pos += len(words)
+            return True
+        return False
+
+    def expect(self, *words: str) -> None:
+        if not self.accept(*words):
+            raise SqlSyntaxError(f"expected {' '.join(words)!r}, got {self.peek().text!r}")
+
+    def name(self) -> str:
+        token = self.peek()
+        if token.kind != "name":
+            raise SqlSyntaxError(f"expected a name, got {token.text!r}")
+        self.pos += 1
+        return token.text.lower()
+
+    def skip_to(self, word: str) -> None:
+        while not self.at(word):
+            if self.peek().kind == "end":
+                raise SqlSyntaxError(f"missing {word!r}")
+            self.pos += 1
+
+    # -- expressions ----------------------------------------------------------
+
+    def expression(self) -> Expr:
+        left = self._and()
+        while self.accept("OR"):
+            parts = [left, self._and()]
+            left = lambda s, parts=parts: _or(*(p(s) for p in parts))
+        return left
+
+    def _and(self) -> Expr:
+        left = self._not()
+        while self.accept("AND"):
+            right = self._not()
+            left = lambda s, a=left, b=right: _and(a(s), b(s))
+        return left
+
+    def _not(self) -> Expr:
+        if self.accept("NOT"):
+            operand = self._not()
+            return lambda s: None if (v := operand(s)) is None else not v
+        return self._comparison()
+
+    def _comparison(self) -> Expr:
+        left = self._additive()
+        if self.accept("IS"):
+            negate = self.accept("NOT")
+            self.expect("NULL")
+            return lambda s: (left(s) is None) != negate
+        op = self.peek().word
+        if op in _COMPARE:
+            self.pos += 1
+            right = self._additive()
+            return lambda s: _compare(op, left(s), right(s))
+        return left
+
+    def _additive(self) -> Expr:
+        left = self._multiplicative()
+        while self.peek().word in ("+", "-", "||"):
+            op = self.peek().word
+            self.pos += 1
+            right = self._multiplicative()
+            left = lambda s, a=left, b=right, op=op: _arith(op, a(s), b(s))
+        return left
+
+    def _multiplicative(self) -> Expr:
+        left = self._unary()
+        while self.peek().word in ("*", "/"):
+            op = self.peek().word
+            self.pos += 1
+            right = self._unary()
+            left = lambda s, a=left, b=right, op=op: _arith(op, a(s), b(s))
+        return left
+
+    def _unary(self) -> Expr:
+        if self.accept("-"):
+            operand = self._unary()
+            return lambda s: None if (v := operand(s)) is None else -v
+        return self._postfix()
+
+    def _postfix(self) -> Expr:
+        expr = self._primary()
+        while True:
+            if self.accept("::"):
+                type_ = self.name()
+                if self.accept("[", "]"):
+                    type_ += "[]"
+                expr = lambda s, e=expr, t=type_: _cast(e(s), t)
+            elif self.accept("["):
+                index = self.expression()
+                self.expect("]")
+                expr = lambda s, e=expr, i=index: _subscript(e(s), i(s))
+            else:
+                return expr
+
+    def _list(self, close: str = ")") -> list[Expr]:
+        items = []
+        if not self.at(close):
+            items.append(self.expression())
+            while self.accept(","):
+                items.append(self.expression())
+        self.expect(close)
+        return items
+
+    def _primary(self) -> Expr:
+        token = self.peek()
+        if token.kind == "number":
+            self.pos += 1
+            value = float(token.text) if "." in token.text else int(token.text)
+            return lambda s: value
+        if token.kind == "string":
+            self.pos += 1
+            text = token.text[1:-1].replace("''", "'")
+            return lambda s: text
+        if self.accept("("):
+            inner = self.expression()
+            self.expect(")")
+            return inner
+        word = token.word
+        if word in ("NULL", "TRUE", "FALSE"):
+            self.pos += 1
+            value = {"NULL": None, "TRUE": True, "FALSE": False}[word]
+            return lambda s: value
+        if word == "INTERVAL" and self.peek(1).kind == "string":
+            self.pos += 2
+            delta = interval(self.peek(-1).text)
+            return lambda s: delta
+        if self.accept("ARRAY", "["):
+            items = self._list("]")
+            return lambda s: [item(s) for item in items]
+        if self.accept("CASE"):
+            return self._case()
+        if self.accept("EXISTS", "("):
+            query = self.select()
+            self.expect(")")
+            return lambda s: bool(query.candidates(s))
+        if self.accept("ANY", "("):
+            values = self.expression()
+            self.expect(")")
+            return lambda s: _AnyOf(tuple(values(s) or ()))
+        if token.kind == "name" and self.peek(1).word == "(":
+            return self._call()
+        if token.kind == "name":
+            name = self.name()
+            if self.accept("."):
+                name = self.name()  # table-qualified column
+            return lambda s: s.row[name] if s.row is not None and name in s.row else s.variables.get(name)
+        raise SqlSyntaxError(f"unexpected {token.text!r}")
+
+    def _case(self) -> Expr:
+        operand = None if self.at("WHEN") else self.expression()
+        branches: list[tuple[Expr, Expr]] = []
+        while self.accept("WHEN"):
+            condition = self.expression()
+            self.expect("THEN")
+            branches.append((condition, self.expression()))
+        otherwise = self.expression() if self.accept("ELSE") else (lambda s: None)
+        self.expect("END")
+
+        def case(s: Scope) -> Any:
+            if operand is None:
+                match = next((r for c, r in branches if c(s) is True), None)
+            else:
+                value = operand(s)  # evaluated once, like Postgres
+                match = next((r for c, r in branches if _compare("=", value, c(s)) is True), None)
+            return (match or otherwise)(s)
+
+        return case
+
+    def _call(self) -> Expr:
+        function = self.name().upper()
+        self.expect("(")
+        if function == "COUNT" and self.accept("*", ")"):
+            self._aggregate = True
+            return lambda s: len(s.rows or ())
+        args = self._list()
+        if function == "ARRAY_AGG":
+            self._aggregate = True
+            (arg,) = args
+            return lambda s: [arg(s.with_row(r)) for r in s.rows] or None
+        if function == "RANDOM":
+            return lambda s: s.db.random.random()
+        if function == "NOW":
+            return lambda s: s.db.now()
+        if function == "GEN_RANDOM_UUID":
+            return lambda s: s.db.uuid()
+        if function not in _SCALAR_FUNCTIONS:
+            raise SqlSyntaxError(f"unsupported function {function}")
+        call = _SCALAR_FUNCTIONS[function]
+        return lambda s: call(*(a(s) for a in args))
+
+    # -- queries --------------------------------------------------------------
+
+    def select(self) -> Select:
+        self.expect("SELECT")
+        outer, self._aggregate = self._aggregate, False
+        columns = [self.expression()]
+        while self.accept(","):
+            columns.append(self.expression())
+        aggregate, self._aggregate = self._aggregate, outer
+        into = []
+        if self.accept("INTO"):
+            into.append(self.name())
+            while self.accept(","):
+                into.append(self.name())
+        table = where = order = limit = None
+        descending = False
+        if self.accept("FROM"):
+            table = self.name()
+            if self.accept("."):
+                table = self.name()
+        if self.accept("WHERE"):
+            where = self.expression()
+        if self.accept("ORDER", "BY"):
+            order = self.expression()
+            descending = self.accept("DESC")
+            self.accept("ASC")
+        if self.accept("LIMIT"):
+            limit = self.expression()
+        return Select(columns, into, table, where, order, descending, limit, aggregate)
+
+    # -- statements -----------------------------------------------------------
+
+    def block(self) -> Stmt:
+        """``[DECLARE ...] BEGIN ... [EXCEPTION WHEN OTHERS THEN ...] END``"""
+        declarations: list[tuple[str, Expr | None]] = []
+        if self.accept("DECLARE"):
+            while not self.at("BEGIN"):
+                name = self.name()
+                while not self.at(";") and not self.at(":="):
+                    self.pos += 1
+                declarations.append((name, self.expression() if self.accept(":=") else None))
+                self.expect(";")
+        self.expect("BEGIN")
+        body = self.statements()
+        handler = None
+        if self.accept("EXCEPTION", "WHEN", "OTHERS", "THEN"):
+            handler = self.statements()
+        self.expect("END")
+
+        def run(s: Scope) -> None:
+            for name, initial in declarations:
+                s.variables[name] = initial(s) if initial else None
+            try:
+                for statement in body:
+                    statement(s)
+            except DatabaseError:
+                if handler is None:
+                    raise
+                for statement in handler:
+                    statement(s)
+
+        return run
+
+    def statements(self) -> list[Stmt]:
+        body = []
+        while not any(self.at(w) for w in ("END", "ELSE", "ELSIF", "EXCEPTION")):
+            body.append(self.statement())
+        return body
+
+    def statement(self) -> Stmt:
+        if self.at("BEGIN") or self.at("DECLARE"):
+            run = self.block()
+        elif self.accept("IF"):
+            run = self._if()
+        elif self.accept("FOR"):
+            run = self._for()
+        elif self.accept("RAISE"):
+            self.skip_to(";")
+            run = lambda s: None
+        elif self.accept("RETURN"):
+            run = self._return
+        elif self.accept("NULL"):
+            run = lambda s: None
+        elif self.at("INSERT"):
+            run = self._insert()
+        elif self.at("UPDATE"):
+            run = self._update()
+        elif self.at("SELECT"):
+            run = self._select_into()
+        elif self.peek().kind == "name" and self.peek(1).word == ":=":
+            name = self.name()
+            self.expect(":=")
+            value = self.expression()
+            run = lambda s: s.variables.__setitem__(name, value(s))
+        else:
+            raise SqlSyntaxError(f"unsupported statement at {self.peek().text!r}")
+        self.expect(";")
+        return run
+
+    @staticmethod
+    def _return(s: Scope) -> None:
+        raise _Return
+
+    def _if(self) -> Stmt:
+        branches = []
+        while True:
+            condition = self.expression()
+            self.expect("THEN")
+            branches.append((condition, self.statements()))
+            if not self.accept("ELSIF"):
+                break
+        otherwise = self.statements() if self.accept("ELSE") else []
+        self.expect("END", "IF")
+
+        def run(s: Scope) -> None:
+            body = next((b for c, b in branches if c(s) is True), otherwise)
+            for statement in body:
+                statement(s)
+
+        return run
+
+    def _for(self) -> Stmt:
+        name = self.name()
+        self.expect("IN")
+        low = self.expression()
+        self.expect("..")
+        high = self.expression()
+        self.expect("LOOP")
+        body = self.statements()
+        self.expect("END", "LOOP")
+
+        def run(s: Scope) -> None:
+            start, stop = low(s), high(s)
+            if start is None or stop is None:
+                return
+            for i in range(start, stop + 1):
+                s.variables[name] = i
+                for statement in body:
+                    statement(s)
+
+        return run
+
+    def _insert(self) -> Stmt:
+        self.expect("INSERT", "INTO")
+        table = self.name()
+        columns = []
+        if self.accept("("):
+            columns.append(self.name())
+            while self.accept(","):
+                columns.append(self.name())
+            self.expect(")")
+        if self.accept("VALUES"):
+            self.expect("(")
+            literal_rows = [self._list()]
+            while self.accept(","):
+                self.expect("(")
+                literal_rows.append(self._list())
+            source = lambda s: [tuple(v(s) for v in row) for row in literal_rows]
+        else:
+            source = self.select().run
+        ignore_conflicts = self.at("ON", "CONFLICT")
+        if ignore_conflicts:
+            self.skip_to(";")
+
+        def run(s: Scope) -> None:
+            for values in source(s):
+                try:
+                    s.db.insert(table, dict(zip(columns, values)))
+                except DatabaseError:
+                    if not ignore_conflicts:
+                        raise
+
+        return run
+
+    def _update(self) -> Stmt:
+        self.expect("UPDATE")
+        table = self.name()
+        self.expect("SET")
+        assignments = []
+        while True:
+            column = self.name()
+            self.expect("=")
+            assignments.append((column, self.expression()))
+            if not self.accept(","):
+                break
+        where = self.expression() if self.accept("WHERE") else None
+
+        def run(s: Scope) -> None:
+            for row in s.db.rows(table):
+                scoped = s.with_row(row)
+                if where is None or where(scoped) is True:
+                    s.db.update(table, [row], {c: v(scoped) for c, v in assignments})
+
+        return run
+
+    def _select_into(self) -> Stmt:
+        query = self.select()
+
+        def run(s: Scope) -> None:
+            rows = query.run(s)
+            values = rows[0] if rows else (None,) * len(query.into)
+            s.variables.update(zip(query.into, values))
+
+        return run
+
+
+_DO_BLOCK = re.compile(r"\bDO\s+\$\$(.*?)\$\$\s*;", re.S | re.I)
+
+
+def run_script(sql: str, db: Database) -> None:
+    """Execute every ``DO $$ ... $$;`` block in ``sql`` against ``db``."""
+    for body in _DO_BLOCK.findall(sql):
+        parser = Parser(body)
+        block = parser.block()
+        parser.accept(";")
+        if parser.peek().kind != "end":
+            raise SqlSyntaxError(f"trailing input at {parser.peek().text!r}")
+        try:
+            block(Scope(db))
+        except _Return:
+            pass
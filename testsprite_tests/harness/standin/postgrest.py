@@ -0,0 +1,489 @@
+"""``/rest/v1`` — the PostgREST subset supabase-js builds from the app's queries.
+
+Covered: ``select`` with renamed columns and resource embedding
+(``alias:table!fkey_or_column(...)``, many-to-one as an object, one-to-many
+as a list, ``!inner``, ``table(count)``), horizontal filters (``eq`` ...
+``is``, ``in``, ``cs``/``cd``, ``like``/``ilike``, ``not.`` and nested
+``or``/``and``), ``order``, ``limit``/``offset``, ``Prefer: count=exact``
+with ``Content-Range`` (including ``HEAD``), single-object responses, inserts
+and upserts (``on_conflict``, ``resolution=merge-duplicates``), ``PATCH``,
+``DELETE`` and ``rpc``.  Error bodies use PostgREST's codes; writes that
+break a unique or foreign key constraint are refused with ``409`` and
+``23505`` / ``23503``, as PostgREST does.  Row-level security is not
+emulated: every caller reads and writes every row (see :mod:`.database`).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .database import Database, DatabaseError, parse_timestamp
+from .gotrue import User
+from .protocol import Request, Response
+from .schema import ForeignKey
+
+OBJECT_MEDIA_TYPE = "application/vnd.pgrst.object+json"
+
+
+def _error(status: int, code: str, message: str, details: str | None = None) -> DatabaseError:
+    error = DatabaseError(code, message, details)
+    error.status = status
+    return error
+
+
+# -- select trees -------------------------------------------------------------
+
+
+@dataclass
+class Embed:
+    relation: str
+    alias: str
+    hint: str | None
+    inner: bool
+    fields: list["Field | Embed"]
+
+
+@dataclass
+class Field:
+    name: str
+    alias: str
+    cast: str | None = None
+
+
+def _split_top_level(text: str, separator: str = ",") -> list[str]:
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == separator and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return [p for p in parts if p]
+
+
+def parse_select(text: str) -> list[Field | Embed]:
+    items: list[Field | Embed] = []
+    for part in _split_top_level(re.sub(r"\s+", "", text or "*")):
+        alias = None
+        head = part.split("(", 1)[0]
+        if ":" in head and "::" not in head:
+            alias, part = part.split(":", 1)
+        if "(" in part:
+            if not part.endswith(")"):
+                raise _error(400, "PGRST100", f'"failed to parse select parameter ({text})"')
+            target, inner = part[:-1].split("(", 1)
+            relation, *hints = target.split("!")
+            is_inner = "inner" in hints
+            hints = [h for h in hints if h not in ("inner", "left")]
+            items.append(Embed(relation, alias or relation, hints[0] if hints else None, is_inner, parse_select(inner)))
+        else:
+            name, _, cast = part.partition("::")
+            items.append(Field(name, alias or name, cast or None))
+    return items
+
+
+# -- filters ------------------------------------------------------------------
+
+Predicate = Callable[[dict[str, Any]], bool]
+
+_OPERATORS = ("eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "is", "in", "cs", "cd", "ov", "match", "imatch")
+
+
+def _operands(row_value: Any, text: str) -> tuple[Any, Any]:
+    """Coerce the filter text to the row value's type, as Postgres would cast the literal."""
+    if isinstance(row_value, bool):
+        return row_value, text.lower() in ("true", "t", "1")
+    if isinstance(row_value, (int, float)):
+        try:
+            return row_value, float(text)
+        except ValueError:
+            return str(row_value), text
+    if isinstance(row_value, str):
+        left, right = parse_timestamp(row_value), parse_timestamp(text)
+        if left is not None and right is not None and len(row_value) >= 10 and len(text) >= 10:
+            return left, right
+    return row_value, text
+
+
+def _like(pattern: str, flags: int = 0) -> re.Pattern:
+    regex = "".join(
+        ".*" if c in "%*" else "." if c == "_" else re.escape(c) for c in pattern
+    )
+    return re.compile(f"^{regex}$", flags | re.S)
+
+
+def _array_literal(text: str) -> list[Any]:
+    text = text.strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [v.strip().strip('"') for v in _split_top_level(text.strip("{}"))]
+
+
+def _contains(value: Any, wanted: Any) -> bool:
+    if isinstance(value, dict) and isinstance(wanted, dict):
+        return all(k in value and _contains(value[k], v) for k, v in wanted.items())
+    if isinstance(value, list):
+        wanted = wanted if isinstance(wanted, list) else [wanted]
+        return all(any(_contains(v, w) for v in value) for w in wanted)
+    return value == wanted
+
+
+def _compare(op: str, value: Any, text: str) -> bool:
+    if op == "is":
+        wanted = {"null": None, "true": True, "false": False, "unknown": None}[text.lower()]
+        return value is wanted if wanted is not None else value is None
+    if value is None:
+        return False
+    if op in ("like", "ilike"):
+        return bool(_like(text, re.I if op == "ilike" else 0).match(str(value)))
+    if op in ("match", "imatch"):
+        return bool(re.search(text, str(value), re.I if op == "imatch" else 0))
+    if op == "in":
+        return any(_compare("eq", value, item) for item in _array_literal(text.strip("()")))
+    if op in ("cs", "cd", "ov"):
+        wanted = json.loads(text) if text.startswith(("{\"", "[")) and op != "ov" else _array_literal(text)
+        if op == "cs":
+            return _contains(value, wanted)
+        if op == "cd":
+            return _contains(wanted, value)
+        return bool(set(map(str, value)) & set(map(str, wanted)))
+    left, right = _operands(value, text)
+    try:
+        return {
+            "eq": lambda: left == right,
+            "neq": lambda: left != right,
+            "gt": lambda: left > right,
+            "gte": lambda: left >= right,
+            "lt": lambda: left < right,
+            "lte": lambda: left <= right,
+        }[op]()
+    except TypeError:
+        return False
+
+
+def parse_filter(column: str, expression: str) -> Predicate:
+    """``column=[not.]op.value`` as a row predicate."""
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, text = expression.partition(".")
+    if op not in _OPERATORS:
+        raise _error(400, "PGRST100", f'"failed to parse filter ({op}.{text})"')
+
+    def predicate(row: dict[str, Any]) -> bool:
+        result = _compare(op, row.get(column), text)
+        # SQL three-valued logic: NOT (NULL op x) is still not true.
+        if negate:
+            return row.get(column) is not None and not result if op != "is" else not result
+        return result
+
+    return predicate
+
+
+def parse_logic(operator: str, text: str) -> Predicate:
+    """``or=(a.eq.1,and(b.gt.2,c.is.null))`` as a row predicate."""
+    negate = operator.startswith("not.")
+    combine = any if operator.removeprefix("not.") == "or" else all
+    predicates = []
+    for part in _split_top_level(text.strip()[1:-1]):
+        nested = re.match(r"(not\.)?(or|and)(\(.*\))$", part)
+        if nested:
+            predicates.append(parse_logic((nested.group(1) or "") + nested.group(2), nested.group(3)))
+        else:
+            column, _, expression = part.partition(".")
+            predicates.append(parse_filter(column, expression))
+
+    def predicate(row: dict[str, Any]) -> bool:
+        return combine(p(row) for p in predicates) != negate
+
+    return predicate
+
+
+# -- ordering -----------------------------------------------------------------
+
+
+def _sort_key(value: Any) -> Any:
+    if isinstance(value, str):
+        parsed = parse_timestamp(value) if len(value) >= 19 and value[4:5] == "-" else None
+        return (0, parsed.timestamp()) if parsed else (1, value)
+    if isinstance(value, (list, dict)):
+        return (2, json.dumps(value, sort_keys=True))
+    return (0, value)
+
+
+def order_rows(rows: list[dict[str, Any]], order: str | None) -> list[dict[str, Any]]:
+    for term in reversed(_split_top_level(order or "")):
+        column, *modifiers = term.split(".")
+        descending = "desc" in modifiers
+        nulls_first = "nullsfirst" in modifiers or ("nullslast" not in modifiers and descending)
+        present = [r for r in rows if r.get(column) is not None]
+        missing = [r for r in rows if r.get(column) is None]
+        present.sort(key=lambda r: _sort_key(r[column]), reverse=descending)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+# -- the endpoint ---------------------------------------------------------------
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+@dataclass
+class PostgREST:
+    db: Database
+    functions: dict[str, Callable[[Database, dict[str, Any], User | None], Any]] = field(default_factory=dict)
+
+    def handle(self, request: Request, resource: str, user: User | None) -> Response:
+        try:
+            if resource.startswith("rpc/"):
+                return self._rpc(request, resource[4:], user)
+            if resource not in self.db.schema.tables:
+                raise _error(
+                    404, "PGRST205", f"Could not find the table 'public.{resource}' in the schema cache"
+                )
+            method = request.method
+            if method in ("GET", "HEAD"):
+                return self._read(request, resource)
+            if method == "POST":
+                return self._insert(request, resource)
+            if method == "PATCH":
+                return self._update(request, resource)
+            if method == "DELETE":
+                return self._delete(request, resource)
+            raise _error(405, "PGRST117", f"Unsupported HTTP method: {method}")
+        except DatabaseError as exc:
+            return Response(exc.status, exc.as_json())
+
+    # -- helpers ------------------------------------------------------------
+
+    def _matching(self, request: Request, table: str) -> list[dict[str, Any]]:
+        predicates = []
+        for key, value in request.query:
+            if key in RESERVED_PARAMS:
+                continue
+            if key in ("or", "and", "not.or", "not.and"):
+                predicates.append(parse_logic(key, value))
+            elif "." in key:
+                raise _error(400, "PGRST100", f"filters on embedded resources are not supported ({key})")
+            else:
+                predicates.append(parse_filter(key, value))
+        return [row for row in self.db.rows(table) if all(p(row) for p in predicates)]
+
+    def _relationship(self, source: str, embed: Embed) -> tuple[ForeignKey, bool]:
+        """The foreign key behind ``embed`` and whether it points away from ``source``."""
+        schema = self.db.schema
+        relation, hint = embed.relation, embed.hint
+        if relation not in schema.tables:
+            # Embedding through a foreign key column: ``author:user_id(...)``.
+            fk = next((fk for fk in schema.table(source).foreign_keys if fk.column == relation), None)
+            if fk is None:
+                raise _error(
+                    400,
+                    "PGRST200",
+                    f"Could not find a relationship between '{source}' and '{relation}' in the schema cache",
+                )
+            return fk, True
+        candidates = [(fk, True) for fk in schema.foreign_keys_between(source, relation)]
+        candidates += [(fk, False) for fk in schema.foreign_keys_between(relation, source)]
+        if hint is not None:
+            candidates = [(fk, out) for fk, out in candidates if hint in (fk.name, fk.column)]
+        if not candidates:
+            raise _error(
+                400,
+                "PGRST200",
+                f"Could not find a relationship between '{source}' and '{relation}' in the schema cache",
+            )
+        if len(candidates) > 1:
+            raise _error(
+                300,
+                "PGRST201",
+                f"Could not embed because more than one relationship was found for '{source}' and '{relation}'",
+                ", ".join(fk.name for fk, _ in candidates),
+            )
+        return candidates[0]
+
+    def _render(self, table: str, row: dict[str, Any], fields: list[Field | Embed]) -> dict[str, Any] | None:
+        """Shape ``row`` like the select tree; ``None`` when an ``!inner`` embed is empty."""
+        out: dict[str, Any] = {}
+        for item in fields:
+            if isinstance(item, Field):
+                if item.name == "*":
+                    out.update(row)
+                elif item.name not in row and item.name not in self.db.schema.table(table).columns:
+                    raise _error(400, "42703", f"column {table}.{item.name} does not exist")
+                else:
+                    value = row.get(item.name)
+                    out[item.alias] = str(value) if item.cast == "text" and value is not None else value
+                continue
+            fk, outgoing = self._relationship(table, item)
+            if outgoing:
+                target = next(
+                    (r for r in self.db.rows(fk.ref_table) if r.get(fk.ref_column) == row.get(fk.column)), None
+                )
+                value = self._render(fk.ref_table, target, item.fields) if target is not None else None
+                if item.inner and value is None:
+                    return None
+            else:
+                children = [r for r in self.db.rows(fk.table) if r.get(fk.column) == row.get(fk.ref_column)]
+                if [f.name for f in item.fields if isinstance(f, Field)] == ["count"]:
+                    value = [{"count": len(children)}]
+                else:
+                    value = [v for v in (self._render(fk.table, c, item.fields) for c in children) if v is not None]
+                if item.inner and not children:
+                    return None
+            out[item.alias] = value
+        return out
+
+    def _represent(self, request: Request, table: str, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        fields = parse_select(request.param("select", "*"))
+        rendered = (self._render(table, row, fields) for row in rows)
+        return [r for r in rendered if r is not None]
+
+    @staticmethod
+    def _prefer(request: Request) -> dict[str, str]:
+        prefer = {}
+        for item in request.headers.get("prefer", "").split(","):
+            key, _, value = item.strip().partition("=")
+            if key:
+                prefer[key] = value
+        return prefer
+
+    def _respond(self, request: Request, rows: list[dict[str, Any]], status: int = 200, total: int | None = None,
+                 offset: int = 0) -> Response:
+        headers = {}
+        end = f"{offset}-{offset + len(rows) - 1}" if rows else "*"
+        headers["Content-Range"] = f"{end}/{'*' if total is None else total}"
+        if OBJECT_MEDIA_TYPE in request.headers.get("accept", ""):
+            if len(rows) != 1:
+                return Response(
+                    406,
+                    {
+                        "code": "PGRST116",
+                        "details": f"The result contains {len(rows)} rows",
+                        "hint": None,
+                        "message": "JSON object requested, multiple (or no) rows returned",
+                    },
+                )
+            return Response(status, rows[0], headers, OBJECT_MEDIA_TYPE + "; charset=utf-8")
+        return Response(status, rows, headers)
+
+    # -- verbs ----------------------------------------------------------------
+
+    def _read(self, request: Request, table: str) -> Response:
+        rows = order_rows(self._matching(request, table), request.param("order"))
+        fields = parse_select(request.param("select", "*"))
+        if any(isinstance(f, Embed) and f.inner for f in fields):
+            rows = [r for r in rows if self._render(table, r, fields) is not None]
+        total = len(rows) if self._prefer(request).get("count") in ("exact", "planned", "estimated") else None
+        offset = int(request.param("offset") or 0)
+        limit = request.param("limit")
+        rows = rows[offset : offset + int(limit) if limit is not None else None]
+        response = self._respond(request, self._represent(request, table, rows), total=total, offset=offset)
+        if request.method == "HEAD":
+            response.body = None
+        elif total is not None and response.status == 200 and offset + len(rows) < total:
+            response.status = 206
+        return response
+
+    def _insert(self, request: Request, table: str) -> Response:
+        body = request.json()
+        payload = body if isinstance(body, list) else [body or {}]
+        columns = request.param("columns")
+        if columns:
+            allowed = {c.strip('"') for c in columns.split(",")}
+            payload = [{k: v for k, v in values.items() if k in allowed} for values in payload]
+        prefer = self._prefer(request)
+        resolution = prefer.get("resolution")
+        conflict = tuple((request.param("on_conflict") or "").split(",")) if request.param("on_conflict") else None
+        if resolution and conflict is None:
+            conflict = ("id",)
+        written = []
+        for values in payload:
+            existing = self.db.conflicting(table, values, conflict) if conflict else None
+            if existing is not None:
+                if resolution == "ignore-duplicates":
+                    continue
+                if resolution == "merge-duplicates":
+                    written.extend(self.db.update(table, [existing], values))
+                    continue
+            written.append(self.db.insert(table, values))
+        if prefer.get("return") != "representation":
+            return Response(201)
+        return self._respond(request, self._represent(request, table, written), status=201)
+
+    def _update(self, request: Request, table: str) -> Response:
+        rows = self.db.update(table, self._matching(request, table), request.json() or {})
+        if self._prefer(request).get("return") != "representation":
+            return Response(204)
+        return self._respond(request, self._represent(request, table, rows))
+
+    def _delete(self, request: Request, table: str) -> Response:
+        rows = self._matching(request, table)
+        represented = self._represent(request, table, rows)
+        self.db.delete(table, rows)
+        if self._prefer(request).get("return") != "representation":
+            return Response(204)
+        return self._respond(request, represented)
+
+    def _rpc(self, request: Request, name: str, user: User | None) -> Response:
+        function = self.functions.get(name)
+        if function is None:
+            raise _error(
+                404, "PGRST202", f"Could not find the function public.{name} in the schema cache"
+            )
+        args = request.json() if request.method == "POST" else dict(request.query)
+        result = function(self.db, args or {}, user)
+        if result is None:
+            return Response(204)
+        return Response(200, result)
+
+
+def increment_ad_view_count(db: Database, args: dict[str, Any], user: User | None) -> None:
+    """``UPDATE advertisements SET view_count = view_count + 1 WHERE id = ad_uuid``"""
+    ads = [ad for ad in db.rows("advertisements") if ad["id"] == args.get("ad_uuid")]
+    for ad in ads:
+        db.update("advertisements", [ad], {"view_count": (ad.get("view_count") or 0) + 1})
+
+
+def get_feed(db: Database, args: dict[str, Any], user: User | None) -> list[dict[str, Any]]:
+    """``get_feed(p_viewer, p_cursor_created_at, p_cursor_id, p_limit)``: the feed page after the cursor.
+
+    Posts come with author, counts and the viewer's like and save, ordered by
+    ``(created_at, id)`` descending; the cursor is the last post of the
+    previous page, or absent for the first page.
+    """
+    viewer, created_at, cursor_id = args.get("p_viewer"), args.get("p_cursor_created_at"), args.get("p_cursor_id")
+
+    def after_cursor(post: dict[str, Any]) -> bool:
+        if created_at is None:
+            return True
+        if _compare("eq", post["created_at"], created_at):
+            return cursor_id is None or post["id"] < cursor_id
+        return _compare("lt", post["created_at"], created_at)
+
+    posts = [post for post in db.rows("posts") if post.get("deleted_at") is None and after_cursor(post)]
+    page = order_rows(posts, "created_at.desc,id.desc")[: min(max(int(args.get("p_limit") or 20), 1), 100)]
+    profiles = {profile["id"]: profile for profile in db.rows("profiles")}
+    feed = []
+    for post in page:
+        author = profiles.get(post["user_id"], {})
+        feed.append({
+            **{k: v for k, v in post.items() if k not in ("deleted_at", "saves_count")},
+            "profiles": {"username": author.get("username"), "avatar_url": author.get("avatar_url")},
+            "is_liked": any(like["post_id"] == post["id"] and like["user_id"] == viewer for like in db.rows("likes")),
+            "is_saved": any(s["post_id"] == post["id"] and s["user_id"] == viewer for s in db.rows("post_saves")),
+        })
+    return feed
+
+
+FUNCTIONS = {"increment_ad_view_count": increment_ad_view_count, "get_feed": get_feed}
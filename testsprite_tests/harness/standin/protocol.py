@@ -0,0 +1,105 @@
+"""Just enough HTTP/1.1 on asyncio streams for supabase-js and Playwright.
+
+Requests are read with ``Content-Length`` or chunked bodies, connections are
+kept alive, and every response carries permissive CORS headers because the
+Expo web app calls the stand-in from another origin.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, HEAD, POST, PUT, PATCH, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "*",
+    "Access-Control-Expose-Headers": "Content-Range, Content-Location, Content-Profile, Range",
+    "Access-Control-Max-Age": "86400",
+}
+
+
+class BadRequest(Exception):
+    pass
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: list[tuple[str, str]]
+    headers: dict[str, str]
+    body: bytes = b""
+
+    def param(self, name: str, default: str | None = None) -> str | None:
+        return next((v for k, v in self.query if k == name), default)
+
+    def json(self) -> Any:
+        if not self.body:
+            return None
+        try:
+            return json.loads(self.body)
+        except ValueError as exc:
+            raise BadRequest(f"invalid JSON body: {exc}") from None
+
+
+@dataclass
+class Response:
+    status: int = 200
+    body: Any = None
+    headers: dict[str, str] = field(default_factory=dict)
+    content_type: str = "application/json; charset=utf-8"
+
+    def payload(self) -> bytes:
+        if self.body is None:
+            return b""
+        if isinstance(self.body, bytes):
+            return self.body
+        return json.dumps(self.body, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def all_headers(self, payload: bytes) -> dict[str, str]:
+        headers = {**CORS_HEADERS, **self.headers, "Content-Length": str(len(payload))}
+        if payload:
+            headers.setdefault("Content-Type", self.content_type)
+        return headers
+
+    def encode(self, head_only: bool = False) -> bytes:
+        payload = self.payload()
+        reason = HTTPStatus(self.status).phrase
+        lines = [f"HTTP/1.1 {self.status} {reason}", *(f"{k}: {v}" for k, v in self.all_headers(payload).items())]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (b"" if head_only else payload)
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request | None:
+    """Read one request, or ``None`` when the client closed the connection."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+    try:
+        method, target, _ = request_line.split(" ", 2)
+    except ValueError:
+        raise BadRequest(f"malformed request line {request_line!r}") from None
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = bytearray()
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                await reader.readuntil(b"\r\n")
+                break
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+        body = bytes(body)
+    else:
+        body = await reader.readexactly(int(headers.get("content-length") or 0))
+    url = urlsplit(target)
+    return Request(method.upper(), unquote(url.path), parse_qsl(url.query, keep_blank_values=True), headers, body)
@@ -0,0 +1,198 @@
+"""Table definitions read from ``supabase/migrations``.
+
+Only what the stand-in needs is extracted: columns with their type and
+default, ``UNIQUE`` constraints and foreign keys (for embedding and
+``ON DELETE`` behaviour).  Files are read in name order like the Supabase
+CLI does and ``CREATE TABLE IF NOT EXISTS`` keeps the first definition.
+``ALTER TABLE ... ADD COLUMN`` / ``RENAME COLUMN`` and unique indexes are
+applied once every table exists, since ``20250125000000`` alters
+``profiles`` before the migration that creates it.
+Demo data files are skipped here and handled by :mod:`.seed`.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..config import MIGRATIONS_DIR
+
+
+@dataclass
+class Column:
+    name: str
+    type: str
+    default: str | None = None
+
+
+@dataclass(frozen=True)
+class ForeignKey:
+    table: str
+    column: str
+    ref_table: str
+    ref_column: str = "id"
+    on_delete: str = "NO ACTION"
+
+    @property
+    def name(self) -> str:
+        """Postgres' default constraint name, as used in PostgREST ``!hint`` embeds."""
+        return f"{self.table}_{self.column}_fkey"
+
+
+@dataclass
+class Table:
+    name: str
+    columns: dict[str, Column] = field(default_factory=dict)
+    uniques: list[tuple[str, ...]] = field(default_factory=list)
+    foreign_keys: list[ForeignKey] = field(default_factory=list)
+
+
+@dataclass
+class Schema:
+    tables: dict[str, Table] = field(default_factory=dict)
+
+    def table(self, name: str) -> Table:
+        """Known table, or an empty one for tables no migration creates."""
+        if name not in self.tables:
+            self.tables[name] = Table(name, {"id": Column("id", "uuid", "gen_random_uuid()")})
+        return self.tables[name]
+
+    def foreign_keys_between(self, source: str, target: str) -> list[ForeignKey]:
+        return [fk for fk in self.table(source).foreign_keys if fk.ref_table == target]
+
+    def referencing(self, target: str) -> list[ForeignKey]:
+        return [fk for table in self.tables.values() for fk in table.foreign_keys if fk.ref_table == target]
+
+
+# Tables the app queries that no migration creates (they predate the
+# migration history).  Shapes follow the columns the screens read and write.
+EXTRA_TABLES = """
+CREATE TABLE IF NOT EXISTS direct_messages (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  sender_id uuid REFERENCES profiles(id) ON DELETE CASCADE NOT NULL,
+  recipient_id uuid REFERENCES profiles(id) ON DELETE CASCADE NOT NULL,
+  content text,
+  media_url text,
+  is_read boolean DEFAULT false,
+  deleted_by uuid[] DEFAULT '{}',
+  created_at timestamptz DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS group_chats (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  creator_id uuid REFERENCES profiles(id) ON DELETE CASCADE NOT NULL,
+  name text NOT NULL,
+  description text,
+  avatar_url text,
+  created_at timestamptz DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS group_members (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  group_id uuid REFERENCES group_chats(id) ON DELETE CASCADE NOT NULL,
+  user_id uuid REFERENCES profiles(id) ON DELETE CASCADE NOT NULL,
+  role text DEFAULT 'member',
+  joined_at timestamptz DEFAULT now(),
+  UNIQUE(group_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS group_messages (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  group_id uuid REFERENCES group_chats(id) ON DELETE CASCADE NOT NULL,
+  user_id uuid REFERENCES profiles(id) ON DELETE CASCADE NOT NULL,
+  content text,
+  created_at timestamptz DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS hashtag_usage (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  hashtag text UNIQUE NOT NULL,
+  count int DEFAULT 0,
+  last_used_at timestamptz DEFAULT now()
+);
+"""
+
+_CREATE = re.compile(r"CREATE TABLE (?:IF NOT EXISTS )?(?:public\.)?(\w+)\s*\((.*?)\n\);", re.S | re.I)
+_ADD_COLUMN = re.compile(
+    r"ALTER TABLE (?:IF EXISTS )?(?:public\.)?(\w+)\s+ADD COLUMN (?:IF NOT EXISTS )?(\w+)\s+([^;,\n]+)", re.I
+)
+_RENAME_COLUMN = re.compile(r"ALTER TABLE (?:public\.)?(\w+)\s+RENAME COLUMN (\w+) TO (\w+)", re.I)
+_REFERENCES = re.compile(r"REFERENCES (?:public\.)?(\w+(?:\.\w+)?)\s*\((\w+)\)(?:\s+ON DELETE (CASCADE|SET NULL))?", re.I)
+_UNIQUE_INDEX = re.compile(r"CREATE UNIQUE INDEX (?:IF NOT EXISTS )?\w+\s+ON (?:public\.)?(\w+)\s*\(([^)]*)\)", re.I)
+_DEFAULT = re.compile(r"DEFAULT\s+('(?:[^']|'')*'(?:::[\w\[\]]+)?|[\w.]+\(\)|[\w.\-]+)", re.I)
+
+
+def _split_definitions(body: str) -> list[str]:
+    """Split a CREATE TABLE body on top-level commas."""
+    parts, depth, current = [], 0, []
+    for char in body:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return [re.sub(r"--[^\n]*", "", part).strip() for part in parts if part.strip()]
+
+
+def _column(table: Table, definition: str) -> None:
+    name, _, rest = definition.partition(" ")
+    type_ = re.match(r"[\w]+(?:\s*\([\d,\s]+\))?(?:\[\])?", rest.strip()).group(0)
+    default = _DEFAULT.search(rest)
+    table.columns[name] = Column(name, type_.lower(), default.group(1) if default else None)
+    reference = _REFERENCES.search(rest)
+    if reference and "." not in reference.group(1):
+        on_delete = (reference.group(3) or "NO ACTION").upper()
+        table.foreign_keys.append(ForeignKey(table.name, name, reference.group(1), reference.group(2), on_delete))
+    if re.search(r"\bUNIQUE\b", rest, re.I) or re.search(r"\bPRIMARY KEY\b", rest, re.I):
+        table.uniques.append((name,))
+
+
+def _create_tables(schema: Schema, sql: str) -> None:
+    for match in _CREATE.finditer(sql):
+        name = match.group(1)
+        if name in schema.tables:
+            continue
+        table = schema.tables[name] = Table(name)
+        for definition in _split_definitions(match.group(2)):
+            unique = re.match(r"UNIQUE\s*\(([^)]*)\)", definition, re.I)
+            if unique:
+                table.uniques.append(tuple(c.strip() for c in unique.group(1).split(",")))
+            elif not re.match(r"(CHECK|CONSTRAINT|PRIMARY KEY|FOREIGN KEY)\b", definition, re.I):
+                _column(table, definition)
+
+
+def _alter_tables(schema: Schema, sql: str) -> None:
+    for match in _ADD_COLUMN.finditer(sql):
+        table = schema.tables.get(match.group(1))
+        if table is not None and match.group(2) not in table.columns:
+            _column(table, f"{match.group(2)} {match.group(3)}")
+    for match in _RENAME_COLUMN.finditer(sql):
+        table = schema.tables.get(match.group(1))
+        if table is not None and match.group(2) in table.columns:
+            column = table.columns.pop(match.group(2))
+            column.name = match.group(3)
+            table.columns[column.name] = column
+    for match in _UNIQUE_INDEX.finditer(sql):
+        table = schema.tables.get(match.group(1))
+        if table is not None:
+            table.uniques.append(tuple(c.strip() for c in match.group(2).split(",")))
+
+
+def is_demo_data(path: Path) -> bool:
+    return "demo_data" in path.name or path.name.startswith("9999")
+
+
+def load_schema(migrations_dir: Path = MIGRATIONS_DIR) -> Schema:
+    schema = Schema()
+    sources = [
+        path.read_text(encoding="utf-8")
+        for path in sorted(migrations_dir.glob("*.sql"))
+        if not is_demo_data(path)
+    ]
+    for sql in [*sources, EXTRA_TABLES]:
+        _create_tables(schema, sql)
+    for sql in sources:
+        _alter_tables(schema, sql)
+    return schema
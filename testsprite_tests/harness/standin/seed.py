@@ -0,0 +1,46 @@
+"""Initial contents of the stand-in: users first, then ``demo_data_complete.sql``.
+
+The demo script only decorates profiles that already exist ("Mevcut
+kullanıcıları kullanır"), so accounts are created before it runs: the
+harness login user from ``tmp/config.json`` — first, so it owns the posts,
+events and listings the script gives to ``profile_ids[1]`` — and the demo
+accounts from ``20251123192941_021_demo_data_without_follows.sql``.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from ..config import HarnessConfig
+from .database import Database
+from .gotrue import GoTrue
+from .plpgsql import run_script
+from .schema import MIGRATIONS_DIR
+
+DEMO_DATA_PATH = MIGRATIONS_DIR / "demo_data_complete.sql"
+
+# (email, password, username, full_name, role), as in migration 021.
+DEMO_USERS = (
+    ("ahmet@airsoft.com", "demo123", "ahmet_sniper", "Ahmet Yılmaz", "user"),
+    ("ayse@airsoft.com", "demo123", "ayse_tactical", "Ayşe Demir", "user"),
+    ("mehmet@airsoft.com", "demo123", "mehmet_assault", "Mehmet Kaya", "user"),
+    ("zeynep@airsoft.com", "demo123", "zeynep_support", "Zeynep Arslan", "user"),
+    ("admin@airsoft.com", "admin123", "admin", "Admin", "admin"),
+)
+
+
+def accounts(config: HarnessConfig) -> list[tuple[str, str, str, str, str]]:
+    """The harness login user, then the demo accounts, as ``DEMO_USERS`` tuples."""
+    login = []
+    if config.login_user:
+        login.append((config.login_user, config.login_password, config.login_user.split("@")[0], "", "user"))
+    return login + [account for account in DEMO_USERS if account[0] != config.login_user.lower()]
+
+
+def populate(db: Database, auth: GoTrue, config: HarnessConfig, demo_data: Path = DEMO_DATA_PATH) -> None:
+    for email, password, username, full_name, role in accounts(config):
+        user = auth.sign_up(email, password, {"username": username, "full_name": full_name})
+        if role != "user":
+            profile = next(p for p in db.rows("profiles") if p["id"] == user.id)
+            db.update("profiles", [profile], {"role": role})
+    run_script(demo_data.read_text(encoding="utf-8"), db)
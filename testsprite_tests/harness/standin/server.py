@@ -0,0 +1,218 @@
+"""The stand-in itself: routing, the TCP listener and the Playwright route hook.
+
+:class:`StandIn` answers ``/rest/v1``, ``/auth/v1`` and ``/storage/v1``.  It
+can listen on a port like ``supabase start`` does (point the Expo app at it
+with ``EXPO_PUBLIC_SUPABASE_URL``), or be installed on browser contexts with
+:meth:`StandIn.attach`, which fulfils every request to the app's configured
+Supabase origin in-process — no rebuild of the app and no socket at all.
+
+Realtime is only acknowledged: over ``context.route_web_socket`` channel
+joins and heartbeats get ``ok`` replies, so ``notifications.tsx`` subscribes
+cleanly, but no change events are ever pushed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from ..config import HarnessConfig, load_config
+from .database import Database
+from .gotrue import AuthError, GoTrue
+from .postgrest import FUNCTIONS, PostgREST
+from .protocol import BadRequest, Request, Response, read_request
+from .schema import load_schema
+from .seed import populate
+from .storage import Storage
+
+DEFAULT_PORT = 54321
+
+
+@dataclass
+class StandIn:
+    config: HarnessConfig = field(default_factory=load_config)
+    seed: int = 0
+    host: str = "127.0.0.1"
+    port: int = DEFAULT_PORT
+    requests: int = 0
+    busy_seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.db = Database(load_schema(), seed=self.seed)
+        self.auth = GoTrue(self.db)
+        self.rest = PostgREST(self.db, dict(FUNCTIONS))
+        self.storage = Storage(self.db)
+        populate(self.db, self.auth, self.config)
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # -- dispatch -------------------------------------------------------------
+
+    def dispatch(self, request: Request) -> Response:
+        started = time.perf_counter()
+        try:
+            return self._dispatch(request)
+        except AuthError as exc:
+            return Response(exc.status, exc.as_json())
+        except BadRequest as exc:
+            return Response(400, {"code": "PGRST102", "message": str(exc), "details": None, "hint": None})
+        except Exception as exc:  # a stand-in bug must not hang the app under test
+            traceback.print_exc()
+            return Response(500, {"code": "XX000", "message": f"stand-in error: {exc}", "details": None, "hint": None})
+        finally:
+            self.requests += 1
+            self.busy_seconds += time.perf_counter() - started
+
+    def _dispatch(self, request: Request) -> Response:
+        if request.method == "OPTIONS":
+            return Response(204)
+        service, _, rest = request.path.strip("/").partition("/")
+        version, _, resource = rest.partition("/")
+        if version != "v1":
+            return Response(404, {"message": f"no route for {request.path}"})
+        user = self.auth.authenticate(request.headers.get("authorization"))
+        if service == "rest":
+            return self.rest.handle(request, resource, user)
+        if service == "storage":
+            return self.storage.handle(request, resource, user)
+        if service == "auth":
+            return self._auth(request, resource, user)
+        return Response(404, {"message": f"no route for {request.path}"})
+
+    def _auth(self, request: Request, resource: str, user) -> Response:
+        body = request.json() or {}
+        if resource == "token":
+            grant = request.param("grant_type")
+            if grant == "password":
+                return Response(200, self.auth.password_grant(body.get("email", ""), body.get("password", "")))
+            if grant == "refresh_token":
+                return Response(200, self.auth.refresh_grant(body.get("refresh_token", "")))
+            raise AuthError(400, "unsupported_grant_type", f"unsupported grant_type {grant!r}")
+        if resource == "signup":
+            created = self.auth.sign_up(body.get("email", ""), body.get("password", ""), body.get("data"))
+            return Response(200, self.auth.session(created))
+        if resource == "user":
+            if user is None:
+                raise AuthError(401, "no_authorization", "This endpoint requires a Bearer token")
+            if request.method == "PUT":
+                self.auth.update_user(user, body)
+            return Response(200, user.as_json())
+        if resource == "logout":
+            if user is not None:
+                self.auth.sign_out(user)
+            return Response(204)
+        if resource == "settings":
+            return Response(200, {"external": {"email": True}, "disable_signup": False, "mailer_autoconfirm": True})
+        if resource == "health":
+            return Response(200, {"name": "GoTrue", "description": "harness stand-in"})
+        if resource in ("recover", "otp", "resend", "magiclink"):
+            return Response(200, {})  # accepted; no mail is sent
+        raise AuthError(404, "not_found", f"auth endpoint {resource!r} is not emulated")
+
+    def password_grant(self, config: HarnessConfig) -> dict[str, Any]:
+        """Drop-in for :func:`..session._password_grant` that never leaves the process."""
+        return self.auth.password_grant(config.login_user, config.login_password)
+
+    # -- TCP listener ---------------------------------------------------------
+
+    async def start(self) -> "StandIn":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StandIn":
+        return await self.start()
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except BadRequest as exc:
+                    writer.write(Response(400, {"message": str(exc)}).encode())
+                    break
+                if request is None:
+                    break
+                response = self.dispatch(request)
+                writer.write(response.encode(head_only=request.method == "HEAD"))
+                await writer.drain()
+                if request.headers.get("connection", "").lower() == "close":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # -- Playwright -----------------------------------------------------------
+
+    async def attach(self, context) -> None:
+        """Context hook: serve the app's Supabase origin from this stand-in."""
+        origin = self.config.supabase_url.rstrip("/")
+        await context.route(f"{origin}/**", self._fulfil)
+        route_web_socket = getattr(context, "route_web_socket", None)
+        if route_web_socket is not None:
+            websocket_origin = origin.replace("http", "ws", 1)
+            await route_web_socket(f"{websocket_origin}/realtime/**", _acknowledge_realtime)
+
+    async def _fulfil(self, route) -> None:
+        request = route.request
+        url = urlsplit(request.url)
+        response = self.dispatch(
+            Request(
+                request.method,
+                url.path,
+                parse_qsl(url.query, keep_blank_values=True),
+                {k.lower(): v for k, v in (await request.all_headers()).items()},
+                request.post_data_buffer or b"",
+            )
+        )
+        payload = response.payload()
+        await route.fulfill(
+            status=response.status,
+            headers=response.all_headers(payload),
+            body=b"" if request.method == "HEAD" else payload,
+        )
+
+
+def _acknowledge_realtime(ws) -> None:
+    """Answer Phoenix joins and heartbeats so realtime channels report SUBSCRIBED."""
+
+    def on_message(message: str | bytes) -> None:
+        try:
+            frame = json.loads(message)
+        except ValueError:
+            return
+        response: dict[str, Any] = {}
+        if frame.get("event") == "phx_join":
+            bindings = frame.get("payload", {}).get("config", {}).get("postgres_changes", [])
+            response = {"postgres_changes": [{**b, "id": i + 1} for i, b in enumerate(bindings)]}
+        if frame.get("event") in ("phx_join", "heartbeat", "phx_leave", "access_token"):
+            ws.send(
+                json.dumps(
+                    {
+                        "topic": frame.get("topic"),
+                        "event": "phx_reply",
+                        "payload": {"status": "ok", "response": response},
+                        "ref": frame.get("ref"),
+                    }
+                )
+            )
+
+    ws.on_message(on_message)
@@ -0,0 +1,97 @@
+"""``/storage/v1`` — object upload, public download and removal, held in memory.
+
+``lib/media-upload.ts`` uploads to the ``media`` bucket, builds the public
+URL client-side (``/object/public/media/<path>``) and deletes through
+``remove([path])``; those three calls are what is implemented.  Buckets
+are created on first upload.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import re
+from dataclasses import dataclass, field
+
+from .database import Database, timestamp
+from .gotrue import User
+from .protocol import Request, Response
+
+
+@dataclass
+class StoredObject:
+    id: str
+    data: bytes
+    content_type: str
+    created_at: str
+    owner: str | None
+
+
+def _multipart_file(body: bytes, content_type: str) -> tuple[bytes, str]:
+    """The file part of a ``multipart/form-data`` upload (storage-js sends Blobs that way)."""
+    boundary = re.search(r"boundary=\"?([^\";]+)", content_type)
+    if boundary is None:
+        return body, "application/octet-stream"
+    for part in body.split(b"--" + boundary.group(1).encode()):
+        head, _, data = part.partition(b"\r\n\r\n")
+        if b"filename=" in head or b'name=""' in head:
+            type_match = re.search(rb"Content-Type:\s*([^\r\n]+)", head, re.I)
+            part_type = type_match.group(1).decode() if type_match else "application/octet-stream"
+            return data.removesuffix(b"\r\n"), part_type
+    return body, "application/octet-stream"
+
+
+@dataclass
+class Storage:
+    db: Database
+    buckets: dict[str, dict[str, StoredObject]] = field(default_factory=dict)
+
+    def handle(self, request: Request, path: str, user: User | None) -> Response:
+        public = path.startswith("object/public/")
+        if public or (path.startswith("object/") and request.method in ("GET", "HEAD")):
+            bucket, _, name = path.removeprefix("object/public/" if public else "object/").partition("/")
+            return self._download(bucket, name)
+        if not path.startswith("object/"):
+            return Response(404, {"statusCode": "404", "error": "not_found", "message": "Not found"})
+        bucket, _, name = path.removeprefix("object/").partition("/")
+        if request.method in ("POST", "PUT") and name:
+            upsert = request.method == "PUT" or request.headers.get("x-upsert") == "true"
+            return self._upload(request, bucket, name, user, upsert)
+        if request.method == "DELETE":
+            prefixes = (request.json() or {}).get("prefixes", [name] if name else [])
+            return self._remove(bucket, prefixes)
+        return Response(405, {"statusCode": "405", "error": "method_not_allowed", "message": request.method})
+
+    def _upload(self, request: Request, bucket: str, name: str, user: User | None, upsert: bool) -> Response:
+        objects = self.buckets.setdefault(bucket, {})
+        if name in objects and not upsert:
+            return Response(
+                400, {"statusCode": "409", "error": "Duplicate", "message": "The resource already exists"}
+            )
+        content_type = request.headers.get("content-type", "")
+        if content_type.startswith("multipart/form-data"):
+            data, content_type = _multipart_file(request.body, content_type)
+        else:
+            data = request.body
+        content_type = content_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+        stored = StoredObject(self.db.uuid(), data, content_type, timestamp(self.db.now()), user.id if user else None)
+        objects[name] = stored
+        return Response(200, {"Id": stored.id, "Key": f"{bucket}/{name}"})
+
+    def _download(self, bucket: str, name: str) -> Response:
+        stored = self.buckets.get(bucket, {}).get(name)
+        if stored is None:
+            return Response(400, {"statusCode": "404", "error": "not_found", "message": "Object not found"})
+        return Response(200, stored.data, {"Cache-Control": "max-age=3600"}, stored.content_type)
+
+    def _remove(self, bucket: str, prefixes: list[str]) -> Response:
+        objects = self.buckets.get(bucket, {})
+        removed = []
+        for name in prefixes:
+            stored = objects.pop(name, None)
+            if stored is not None:
+                removed.append(
+                    {"name": name, "bucket_id": bucket, "id": stored.id, "owner": stored.owner,
+                     "created_at": stored.created_at, "metadata": {"mimetype": stored.content_type,
+                                                                   "size": len(stored.data)}}
+                )
+        return Response(200, removed)
@@ -0,0 +1,135 @@
+"""Shared step library for the consolidated per-plan tests.
+
+The generated TC files each spell out the same Playwright boilerplate
+(launch, ``new_context``, ``goto``, iframe waits, ``finally`` clean-up) and
+the same login form interaction.  The tests written by
+:mod:`.consolidate` keep only their steps, as :class:`Step` records, and
+:func:`run_steps` executes them here.  Every action is still preceded by
+``page.wait_for_timeout(3000)`` so the event-driven waits from
+:mod:`.waits` apply exactly as they do to the original files.
+"""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+from playwright.async_api import expect
+
+from .config import load_config
+
+STEP_PAUSE_MS = 3000
+# The origin the TC files were recorded against; ``goto`` steps are moved onto ``base_url``.
+RECORDED_URL = "http://localhost:8081"
+
+LOGIN = "login"
+GOTO = "goto"
+FILL = "fill"
+CLICK = "click"
+SCROLL = "scroll"
+PAUSE = "pause"
+EXPECT = "expect"
+KINDS = (LOGIN, GOTO, FILL, CLICK, SCROLL, PAUSE, EXPECT)
+
+
+class Step(NamedTuple):
+    """One action of a test.
+
+    ``target`` is a locator (``fill``/``click``/``expect``), a URL (``goto``)
+    or the e-mail (``login``); ``value`` is the text to type, the password,
+    the seconds to pause or, for ``expect``, the failure message.
+    """
+
+    kind: str
+    target: str = ""
+    value: str = ""
+    label: str = ""
+    timeout: int = 5000
+
+
+async def sign_in(page: Any, email: str, password: str) -> None:
+    """Sign in through the form, by placeholder rather than the recorded XPaths."""
+    await page.wait_for_timeout(STEP_PAUSE_MS)
+    await page.get_by_placeholder("E-posta").fill(email)
+    await page.get_by_placeholder("Şifre").fill(password)
+    await page.get_by_text("Giriş Yap", exact=True).last.click(timeout=5000)
+
+
+def rebase(url: str, base_url: str) -> str:
+    if url.startswith(RECORDED_URL):
+        return base_url.rstrip("/") + url[len(RECORDED_URL):]
+    return url
+
+
+async def run_step(context: Any, page: Any, step: Step, base_url: str = RECORDED_URL) -> None:
+    if step.kind == LOGIN:
+        await sign_in(page, step.target, step.value)
+    elif step.kind == GOTO:
+        await page.goto(rebase(step.target, base_url), timeout=10_000)
+    elif step.kind in (FILL, CLICK):
+        # Located before the pause, as in the TC files, so the harness waits for it (see harness.waits).
+        locator = context.pages[-1].locator(step.target).first
+        await page.wait_for_timeout(STEP_PAUSE_MS)
+        if step.kind == FILL:
+            await locator.fill(step.value)
+        else:
+            await locator.click(timeout=step.timeout)
+    elif step.kind == SCROLL:
+        await page.mouse.wheel(0, await page.evaluate("() => window.innerHeight"))
+    elif step.kind == PAUSE:
+        await page.wait_for_timeout(float(step.value) * 1000)
+    elif step.kind == EXPECT:
+        locator = context.pages[-1].locator(step.target).first
+        try:
+            await expect(locator).to_be_visible(timeout=step.timeout)
+        except AssertionError:
+            if not step.value:
+                raise
+            raise AssertionError(step.value) from None
+    else:
+        raise ValueError(f"unknown step kind {step.kind!r}; expected one of {', '.join(KINDS)}")
+
+
+async def run_steps(
+    async_api: Any, steps: tuple[Step, ...], login: bool = True, clock: Any = None, base_url: str | None = None
+) -> None:
+    """Open the app in a fresh context and run ``steps``.
+
+    ``async_api`` is whatever the test module resolved (the pool shim inside
+    the harness, which also decides whether the browser is headless).
+    ``login=False`` skips a leading ``login`` step: the harness clears it
+    when the context already starts from the saved session.  ``clock`` is
+    the :class:`.timing.StepClock` bound by the runner.  ``base_url``
+    defaults to :attr:`.config.HarnessConfig.base_url` (``localEndpoint``).
+    """
+    if not login and steps and steps[0].kind == LOGIN:
+        steps = steps[1:]
+    base_url = base_url or load_config().base_url
+    pw = browser = context = None
+    try:
+        pw = await async_api.async_playwright().start()
+        browser = await pw.chromium.launch()
+        context = await browser.new_context()
+        context.set_default_timeout(5000)
+        page = await context.new_page()
+        if clock is not None:
+            clock.begin("setup")
+        await page.goto(base_url, wait_until="commit", timeout=10_000)
+        try:
+            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+        except async_api.Error:
+            pass
+        for step in steps:
+            if clock is not None and step.label and step.label != clock.current:
+                clock.begin(step.label)
+            await run_step(context, page, step, base_url)
+    finally:
+        if clock is not None:
+            clock.begin("teardown")
+        if context:
+            await context.close()
+        if browser:
+            await browser.close()
+        if pw:
+            await pw.stop()
+        if clock is not None:
+            clock.stop()
@@ -0,0 +1,241 @@
+"""Append-only, indexed result history in SQLite.
+
+``tmp/test_results.json`` is one JSON array that embeds the full source of
+every test and is rewritten as a whole.  Here each result is one row written
+as soon as the test finishes, test sources are stored once per content hash,
+and ``(test_id, run_id)`` is indexed so questions like "failures of TC008 in
+the last 50 runs" never read the rest of the history.
+
+Usage (from the repository root)::
+
+    python -m testsprite_tests.harness.store import [tmp/test_results.json]
+    python -m testsprite_tests.harness.store failures TC008 [--runs 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from .config import RESULTS_PATH, TMP_DIR
+from .durations import normalize, record_duration
+
+STORE_PATH = TMP_DIR / "results.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS code (
+    hash TEXT PRIMARY KEY,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL,
+    error TEXT NOT NULL DEFAULT '',
+    code_hash TEXT REFERENCES code(hash),
+    recorded_at TEXT NOT NULL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS results_test_run ON results (test_id, run_id);
+CREATE INDEX IF NOT EXISTS results_name ON results (name, id);
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id);
+CREATE TABLE IF NOT EXISTS steps (
+    result_id INTEGER NOT NULL REFERENCES results(id),
+    seq INTEGER NOT NULL,
+    step TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (result_id, seq)
+);
+CREATE INDEX IF NOT EXISTS steps_step ON steps (step);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+class ResultStore:
+    def __init__(self, path: Path = STORE_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Shard workers write concurrently; WAL keeps their appends from blocking readers.
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def start_run(self, source: str = "harness", started_at: str | None = None) -> int:
+        cursor = self.db.execute(
+            "INSERT INTO runs (started_at, source) VALUES (?, ?)", (started_at or _now(), source)
+        )
+        return cursor.lastrowid
+
+    def store_code(self, body: str) -> str:
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        self.db.execute("INSERT OR IGNORE INTO code (hash, body) VALUES (?, ?)", (digest, body))
+        return digest
+
+    def append(
+        self,
+        run_id: int,
+        test_id: str,
+        name: str,
+        status: str,
+        duration: float | None,
+        error: str = "",
+        code: str | None = None,
+        recorded_at: str | None = None,
+        extra: dict[str, Any] | None = None,
+    ) -> int:
+        code_hash = self.store_code(code) if code is not None else None
+        cursor = self.db.execute(
+            "INSERT INTO results (run_id, test_id, name, status, duration, error, code_hash, recorded_at, extra)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                run_id,
+                test_id,
+                name,
+                status,
+                duration,
+                error,
+                code_hash,
+                recorded_at or _now(),
+                json.dumps(extra) if extra else None,
+            ),
+        )
+        return cursor.lastrowid
+
+    def append_steps(self, result_id: int, steps: list[tuple[str, float]]) -> None:
+        self.db.executemany(
+            "INSERT INTO steps (result_id, seq, step, seconds) VALUES (?, ?, ?, ?)",
+            [(result_id, seq, step, seconds) for seq, (step, seconds) in enumerate(steps)],
+        )
+
+    def step_history(self, runs: int = 50) -> dict[str, list[float]]:
+        """Durations of every step label within the last ``runs`` runs."""
+        rows = self.db.execute(
+            """
+            SELECT steps.step, steps.seconds FROM steps JOIN results ON results.id = steps.result_id
+            WHERE results.run_id >= (SELECT coalesce(min(id), 0) FROM
+                                     (SELECT id FROM runs ORDER BY id DESC LIMIT ?))
+            """,
+            (runs,),
+        )
+        history: dict[str, list[float]] = {}
+        for row in rows:
+            history.setdefault(row["step"], []).append(row["seconds"])
+        return history
+
+    def failures(self, test_id: str, runs: int = 50) -> list[sqlite3.Row]:
+        """Non-passing results of ``test_id`` within the last ``runs`` runs, newest first."""
+        return self.db.execute(
+            """
+            SELECT results.*, runs.started_at FROM results JOIN runs ON runs.id = results.run_id
+            WHERE results.test_id = ?
+              AND results.run_id >= (SELECT coalesce(min(id), 0) FROM
+                                     (SELECT id FROM runs ORDER BY id DESC LIMIT ?))
+              AND results.status != 'PASSED'
+            ORDER BY results.run_id DESC, results.id DESC
+            """,
+            (test_id, runs),
+        ).fetchall()
+
+    def code(self, code_hash: str) -> str | None:
+        row = self.db.execute("SELECT body FROM code WHERE hash = ?", (code_hash,)).fetchone()
+        return row["body"] if row else None
+
+    def latest_durations(self) -> dict[str, float]:
+        """Most recent duration of every test that actually ran, keyed by normalized name."""
+        rows = self.db.execute(
+            """
+            SELECT name, duration FROM results
+            WHERE id IN (SELECT max(id) FROM results
+                         WHERE duration IS NOT NULL AND status != 'BLOCKED' GROUP BY name)
+            """
+        )
+        return {normalize(row["name"]): row["duration"] for row in rows}
+
+    def import_results_json(self, path: Path = RESULTS_PATH) -> int:
+        """Import a TestSprite ``test_results.json``; importing the same file twice is a no-op."""
+        raw = path.read_bytes()
+        source = f"import:{hashlib.sha256(raw).hexdigest()[:16]}"
+        if self.db.execute("SELECT 1 FROM runs WHERE source = ?", (source,)).fetchone():
+            return 0
+        records = json.loads(raw)
+        started_at = min((r["created"] for r in records if r.get("created")), default=None)
+        self.db.execute("BEGIN")
+        try:
+            run_id = self.start_run(source, started_at)
+            for record in records:
+                self.append(
+                    run_id,
+                    test_id=record["title"].split("-", 1)[0],
+                    name=record["title"],
+                    status=record.get("testStatus", ""),
+                    duration=record_duration(record),
+                    error=record.get("testError") or "",
+                    code=record.get("code"),
+                    recorded_at=record.get("modified"),
+                    extra={k: v for k, v in record.items() if k not in _IMPORTED_FIELDS},
+                )
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+        return len(records)
+
+
+_IMPORTED_FIELDS = {"title", "testStatus", "testError", "code", "modified"}
+
+
+def _format_failures(rows: list[sqlite3.Row]) -> Iterator[str]:
+    for row in rows:
+        error = row["error"].splitlines()[0] if row["error"] else ""
+        yield f"run {row['run_id']:>4}  {row['started_at']}  {row['status']:<7} {row['name']}: {error}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m testsprite_tests.harness.store")
+    parser.add_argument("--db", type=Path, default=STORE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="import a test_results.json file")
+    importer.add_argument("path", type=Path, nargs="?", default=RESULTS_PATH)
+    failures = commands.add_parser("failures", help="recent failures of one test id")
+    failures.add_argument("test_id")
+    failures.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    with ResultStore(args.db) as store:
+        if args.command == "import":
+            print(f"imported {store.import_results_json(args.path)} results from {args.path}")
+        else:
+            rows = store.failures(args.test_id, args.runs)
+            for line in _format_failures(rows):
+                print(line)
+            print(f"{len(rows)} failures of {args.test_id} in the last {args.runs} runs")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,222 @@
+"""Per-step wall time for the generated tests, and traces of the ones that fail.
+
+Each generated step is introduced by a ``# -> <what the step does>`` comment
+(``# --> Assertions to verify final state`` for the checks at the end).
+:class:`TimeSteps` is an AST transform that inserts a ``_step_clock.begin()``
+call before the first statement under each such comment, so every test that
+goes through the adapter is timed without editing its file.  The segments
+that are not steps get fixed labels: ``setup`` (Playwright start-up and the
+first ``goto``), ``asyncio.sleep(N)`` for every bare sleep — including the
+trailing ``await asyncio.sleep(5)`` — and ``teardown`` (the ``finally``).
+
+Timings are stored per result (see :meth:`.store.ResultStore.append_steps`)
+and :func:`format_step_table` summarises them by label across runs, so the
+p50/p95 of "Input email and password, then click login button" is computed
+over every test and run that logged in through the form.
+
+:class:`TraceOnFailure` records a Playwright trace for every context a test
+opens and keeps it only if the test fails (``retain-on-failure``): whether a
+test fails is only known after it has closed its own context.
+"""
+
+from __future__ import annotations
+
+import ast
+import bisect
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from playwright import async_api
+
+from .config import TMP_DIR
+
+CLOCK = "_step_clock"
+TRACE_DIR = TMP_DIR / "traces"
+SETUP = "setup"
+TEARDOWN = "teardown"
+# Rows printed by :func:`format_step_table`, slowest total first.
+TABLE_ROWS = 20
+
+_STEP_COMMENT = re.compile(r"^\s*#\s*--?>\s+(?P<label>.+?)\s*$")
+
+
+@dataclass
+class StepTiming:
+    step: str
+    seconds: float
+
+
+@dataclass
+class StepClock:
+    """Runtime side of :class:`TimeSteps`: wall time between consecutive ``begin`` calls."""
+
+    steps: list[StepTiming] = field(default_factory=list)
+    # Called with each new label, e.g. to name the waits of :mod:`.waits`.
+    on_step: list[Callable[[str], None]] = field(default_factory=list, repr=False)
+    _label: str = field(default="", repr=False)
+    _started: float = field(default=0.0, repr=False)
+
+    @property
+    def current(self) -> str:
+        return self._label
+
+    def begin(self, label: str) -> None:
+        self.stop()
+        self._label, self._started = label, time.perf_counter()
+        for callback in self.on_step:
+            callback(label)
+
+    def stop(self) -> None:
+        if self._label:
+            self.steps.append(StepTiming(self._label, time.perf_counter() - self._started))
+            self._label = ""
+
+
+def _begin(label: str) -> ast.stmt:
+    return ast.Expr(
+        ast.Call(
+            func=ast.Attribute(ast.Name(CLOCK, ast.Load()), "begin", ast.Load()),
+            args=[ast.Constant(label)],
+            keywords=[],
+        )
+    )
+
+
+def _sleep_label(node: ast.stmt) -> str | None:
+    """``"asyncio.sleep(5)"`` for a bare ``await asyncio.sleep(5)`` statement."""
+    if isinstance(node, ast.Expr) and isinstance(node.value, ast.Await):
+        call = node.value.value
+        if (
+            isinstance(call, ast.Call)
+            and isinstance(call.func, ast.Attribute)
+            and call.func.attr == "sleep"
+            and isinstance(call.func.value, ast.Name)
+            and call.func.value.id == "asyncio"
+        ):
+            return ast.unparse(call)
+    return None
+
+
+class TimeSteps:
+    """AST transform timing ``run_test`` step by step (see the module docstring).
+
+    Needs the source text because the step comments are not part of the tree.
+    A comment only labels the statement right after it in the original file,
+    so when an earlier transform dropped that statement (the login steps
+    :class:`.session.StripLoginPrelude` removes) its label is dropped too.
+    """
+
+    def __init__(self, source: str):
+        self.labels = {
+            number: match.group("label")
+            for number, line in enumerate(source.splitlines(), start=1)
+            if (match := _STEP_COMMENT.match(line))
+        }
+        self.statement_ends = sorted(
+            {node.end_lineno for node in ast.walk(ast.parse(source)) if isinstance(node, ast.stmt)}
+        )
+
+    @classmethod
+    def for_path(cls, path: Path) -> "TimeSteps":
+        return cls(path.read_text(encoding="utf-8"))
+
+    def __call__(self, tree: ast.Module) -> ast.Module:
+        run_test = next(
+            (n for n in tree.body if isinstance(n, ast.AsyncFunctionDef) and n.name == "run_test"), None
+        )
+        body = next((n for n in run_test.body if isinstance(n, ast.Try)), None) if run_test else None
+        if body is None:
+            return tree
+        body.body = self._instrument(body.body)
+        body.finalbody.insert(0, _begin(TEARDOWN))
+        body.finalbody.append(ast.parse(f"{CLOCK}.stop()").body[0])
+        return tree
+
+    def _instrument(self, statements: list[ast.stmt]) -> list[ast.stmt]:
+        label = SETUP
+        out = [_begin(label)]
+        after_sleep = False
+        for node in statements:
+            comments = self.comments_before(getattr(node, "lineno", None))
+            sleep = _sleep_label(node)
+            if comments:
+                label = comments[-1]
+            if sleep:
+                out.append(_begin(sleep))
+            elif comments or after_sleep:
+                out.append(_begin(label))
+            out.append(node)
+            after_sleep = bool(sleep)
+        return out
+
+    def comments_before(self, lineno: int | None) -> list[str]:
+        if lineno is None:  # inserted by another transform
+            return []
+        index = bisect.bisect_left(self.statement_ends, lineno)
+        previous_end = self.statement_ends[index - 1] if index else 0
+        return [self.labels[n] for n in range(previous_end + 1, lineno) if n in self.labels]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def format_step_table(history: dict[str, list[float]], current: dict[str, list[float]]) -> str:
+    """p50/p95 per step label over ``history``, next to this run's total per label."""
+    rows = sorted(history.items(), key=lambda item: -sum(item[1]))
+    width = min(max((len(label) for label, _ in rows), default=4), 60)
+    lines = [f"{'step':<{width}}  {'n':>5}  {'p50':>7}  {'p95':>7}  {'this run':>8}"]
+    for label, values in rows[:TABLE_ROWS]:
+        name = label if len(label) <= width else label[: width - 1] + "…"
+        this_run = f"{sum(current[label]):7.1f}s" if label in current else ""
+        lines.append(
+            f"{name:<{width}}  {len(values):5d}  {percentile(values, 50):6.2f}s  "
+            f"{percentile(values, 95):6.2f}s  {this_run:>8}"
+        )
+    if len(rows) > TABLE_ROWS:
+        lines.append(f"... {len(rows) - TABLE_ROWS} more steps")
+    return "\n".join(lines)
+
+
+@dataclass
+class TraceOnFailure:
+    """Context hook tracing every context of test ``name``; :meth:`finish` keeps or drops them."""
+
+    name: str
+    paths: list[Path] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        # A trace left by an earlier failure of this test is stale either way.
+        for stale in [*TRACE_DIR.glob(f"{self.name}.zip"), *TRACE_DIR.glob(f"{self.name}.*.zip")]:
+            stale.unlink()
+
+    async def __call__(self, context: async_api.BrowserContext) -> None:
+        path = TRACE_DIR / (f"{self.name}.zip" if not self.paths else f"{self.name}.{len(self.paths)}.zip")
+        self.paths.append(path)
+        await context.tracing.start(screenshots=True, snapshots=True, sources=False)
+        close = context.close
+
+        async def close_with_trace(**kwargs) -> None:
+            try:
+                TRACE_DIR.mkdir(parents=True, exist_ok=True)
+                await context.tracing.stop(path=path)
+            except async_api.Error:
+                pass  # already stopped, or the browser went away with the context
+            await close(**kwargs)
+
+        context.close = close_with_trace
+
+    def finish(self, ok: bool) -> list[Path]:
+        """Delete the traces of a passing test; return those kept."""
+        kept = [path for path in self.paths if path.exists()]
+        if ok:
+            for path in kept:
+                path.unlink()
+            return []
+        return kept
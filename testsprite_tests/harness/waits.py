@@ -0,0 +1,131 @@
+"""Event-driven replacement for the fixed ``wait_for_timeout(3000)`` sleeps.
+
+Every generated step reads ``await page.wait_for_timeout(3000); await elem...``.
+:class:`StepWaits` waits for the things that sleep was standing in for
+instead: no Supabase request (REST, auth, storage) in flight, no Expo Router
+navigation in the last ``quiet_ms``, and the element the next action
+targets attached and visible.  Each wait is recorded so the runner can show
+how much of the fixed sleep budget a test really needed.
+
+Tests can call :meth:`StepWaits.before` directly; the runner also installs
+:meth:`StepWaits.attach` on every page so the existing ``wait_for_timeout``
+calls go through :meth:`StepWaits.settle` without editing the TC files.
+The generated steps build their locator first
+(``elem = frame.locator(...)``, then ``wait_for_timeout``, then
+``elem.click()``), so ``attach`` also remembers the last locator created
+on any page, and ``settle`` waits for it as the pending target.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from playwright import async_api
+
+SUPABASE_PATHS = ("/rest/v1/", "/auth/v1/", "/storage/v1/")
+
+
+@dataclass
+class WaitRecord:
+    step: str
+    waited: float
+    budget: float
+
+
+@dataclass
+class StepWaits:
+    supabase_origin: str = ""
+    quiet_ms: int = 150
+    timeout_ms: int = 10_000
+    records: list[WaitRecord] = field(default_factory=list)
+    step: str = ""
+    _in_flight: set[async_api.Request] = field(default_factory=set, repr=False)
+    _last_event: float = field(default=0.0, repr=False)
+    # The last locator a page created: the target of the next action.
+    _pending: async_api.Locator | None = field(default=None, repr=False)
+
+    def is_supabase(self, request: async_api.Request) -> bool:
+        if request.resource_type not in ("xhr", "fetch"):
+            return False
+        url = request.url
+        if self.supabase_origin and url.startswith(self.supabase_origin):
+            return True
+        return urlsplit(url).path.startswith(SUPABASE_PATHS)
+
+    def attach(self, page: async_api.Page) -> None:
+        """Track ``page``, its new locators, and route its ``wait_for_timeout`` through :meth:`settle`."""
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+        page.on("framenavigated", lambda frame: self._touch() if frame == page.main_frame else None)
+
+        async def wait_for_timeout(timeout: float) -> None:
+            await self.settle(page, budget=timeout / 1000)
+
+        locator = page.locator
+
+        def pending_locator(selector: str, **kwargs) -> async_api.Locator:
+            self._pending = locator(selector, **kwargs)
+            return self._pending
+
+        page.wait_for_timeout = wait_for_timeout
+        page.locator = pending_locator
+
+    def attach_context(self, context: async_api.BrowserContext) -> None:
+        context.on("page", self.attach)
+
+    def _touch(self) -> None:
+        self._last_event = time.perf_counter()
+
+    def _on_request(self, request: async_api.Request) -> None:
+        if self.is_supabase(request):
+            self._in_flight.add(request)
+            self._touch()
+
+    def _on_request_done(self, request: async_api.Request) -> None:
+        if request in self._in_flight:
+            self._in_flight.discard(request)
+            self._touch()
+
+    def _quiet(self) -> bool:
+        if self._in_flight:
+            return False
+        return (time.perf_counter() - self._last_event) * 1000 >= self.quiet_ms
+
+    async def settle(self, page: async_api.Page, budget: float = 0.0) -> float:
+        """Wait until Supabase traffic and navigation have been quiet for ``quiet_ms``, then for the pending locator."""
+        started = time.perf_counter()
+        deadline = started + self.timeout_ms / 1000
+        try:
+            await page.wait_for_load_state("domcontentloaded", timeout=self.timeout_ms)
+        except async_api.Error:
+            pass
+        while not self._quiet() and time.perf_counter() < deadline:
+            await asyncio.sleep(self.quiet_ms / 1000 / 3)
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            try:
+                remaining = max(deadline - time.perf_counter(), 0.1)
+                await pending.first.wait_for(state="visible", timeout=remaining * 1000)
+            except async_api.Error:
+                pass  # the action itself reports the missing element
+        waited = time.perf_counter() - started
+        self.records.append(WaitRecord(self.step or f"step {len(self.records) + 1}", waited, budget))
+        return waited
+
+    async def before(self, page: async_api.Page, locator: async_api.Locator | None = None) -> float:
+        """Settle with ``locator`` (default: the last one created) as the pending target."""
+        if locator is not None:
+            self._pending = locator
+        return await self.settle(page)
+
+    @property
+    def waited(self) -> float:
+        return sum(r.waited for r in self.records)
+
+    @property
+    def budget(self) -> float:
+        return sum(r.budget for r in self.records)